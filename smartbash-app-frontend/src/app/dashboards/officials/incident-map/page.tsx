@@ -1,6 +1,6 @@
 "use client";
 
-import { useState, useMemo, useEffect } from "react";
+import { useState, useMemo, useEffect, useCallback } from "react";
 import dynamic from "next/dynamic";
 import { ChevronLeft } from "lucide-react";
 
@@ -33,6 +33,7 @@ type ApiIncident = {
   lat: number | null;
   lon: number | null;
   location: string;
+  key?: string;
 };
 
 function MapLoadingSkeleton() {
@@ -77,6 +78,11 @@ export default function IncidentMap() {
   const [isPanelCollapsed, setIsPanelCollapsed] = useState(false);
   const [isMobile, setIsMobile] = useState(false);
   const [isMapLoading, setIsMapLoading] = useState(true);
+  const [viewport, setViewport] = useState<{ bbox: string; zoom: number } | null>(null);
+
+  const handleViewportChange = useCallback((bbox: string, zoom: number) => {
+    setViewport((prev) => (prev && prev.bbox === bbox && prev.zoom === zoom ? prev : { bbox, zoom }));
+  }, []);
 
   useEffect(() => {
     const checkMobile = () => setIsMobile(window.innerWidth < 640);
@@ -87,17 +93,37 @@ export default function IncidentMap() {
 
   useEffect(() => {
     let cancelled = false;
+    // Delta state for this viewport: clusters by key, plus the server's change cursor and ETag.
+    const byKey = new Map<string, Incident>();
+    let cursor = "";
+    let etag = "";
 
     const loadIncidents = async () => {
-      setIsMapLoading(true);
+      const params = new URLSearchParams();
+      if (viewport) {
+        params.set("bbox", viewport.bbox);
+        params.set("zoom", String(viewport.zoom));
+      }
+      if (cursor) params.set("since", cursor);
+      const query = params.toString() ? `?${params.toString()}` : "";
       try {
-        const res = await apiFetch("/auth/officials/incidents/map/", { method: "GET" });
+        const res = await apiFetch(`/auth/officials/incidents/map/${query}`, {
+          method: "GET",
+          headers: etag ? { "If-None-Match": etag } : undefined,
+        });
+        if (res.status === 304) return;
         const data = await res.json();
         if (!res.ok) throw new Error(data?.message || "Failed to load map incidents");
 
-        const normalized: Incident[] = ((data?.incidents || []) as ApiIncident[])
-          .filter((row) => row.lat !== null && row.lon !== null)
-          .map((row) => ({
+        if (!data?.delta) byKey.clear();
+        for (const key of (data?.removed || []) as string[]) byKey.delete(key);
+        for (const row of (data?.incidents || []) as ApiIncident[]) {
+          const key = row.key || `r${row.id}`;
+          if (row.lat === null || row.lon === null) {
+            byKey.delete(key);
+            continue;
+          }
+          byKey.set(key, {
             id: Number(row.id),
             type: normalizeType(row.type),
             urgency: normalizeUrgency(row.urgency),
@@ -105,8 +131,12 @@ export default function IncidentMap() {
             lat: Number(row.lat),
             lon: Number(row.lon),
             location: row.location || "",
-          }));
+          });
+        }
+        cursor = data?.cursor || "";
+        etag = res.headers.get("ETag") || "";
 
+        const normalized = Array.from(byKey.values());
         if (!cancelled) {
           setAllIncidents(normalized);
           setSelectedIncident((prev) => {
@@ -131,7 +161,7 @@ export default function IncidentMap() {
       cancelled = true;
       clearInterval(timer);
     };
-  }, []);
+  }, [viewport]);
 
   const filteredIncidents = useMemo(() => {
     return allIncidents.filter((i) => {
@@ -186,6 +216,7 @@ export default function IncidentMap() {
                   getIncidentColor={getIncidentColor}
                   selectedIncident={selectedIncident}
                   setSelectedIncident={setSelectedIncident}
+                  onViewportChange={handleViewportChange}
                 />
               )}
             </div>
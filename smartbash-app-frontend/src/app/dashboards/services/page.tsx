@@ -1,12 +1,12 @@
 "use client";
 
 
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import dynamic from "next/dynamic";
 import Link from "next/link";
 import { Incident } from "../../../components/core-ui/services-components/ServicesMap";
-import { apiFetch } from "@/lib/api";
-import { clearAuthTokens } from "@/lib/auth.client";
+import { API_BASE, apiFetch } from "@/lib/api";
+import { clearAuthTokens, getAccessToken } from "@/lib/auth.client";
 
 
 const ServicesMap = dynamic(
@@ -33,6 +33,8 @@ export default function ServicesMapPage() {
   const [teamName, setTeamName] = useState("Emergency Responder");
   const [profileLoaded, setProfileLoaded] = useState(false);
   const [currentDispatchId, setCurrentDispatchId] = useState<number | null>(null);
+  // Latest payload per dispatch id, from the feed and from pushed SSE events.
+  const dispatchesRef = useRef<Map<number, any>>(new Map());
 
 
   useEffect(() => {
@@ -131,15 +133,11 @@ export default function ServicesMapPage() {
 
 
   useEffect(() => {
-    const loadIncidents = async () => {
-      const res = await apiFetch("/auth/services/dispatches/", { method: "GET" });
-      const data = await res.json();
-      if (!res.ok) {
-        setAllIncidents([]);
-        setTargetIncident(null);
-        return;
-      }
-      const dispatches = data?.dispatches || [];
+    const showDispatches = async () => {
+      // Same order as the feed: newest first.
+      const dispatches = Array.from(dispatchesRef.current.values()).sort(
+        (a: any, b: any) => String(b.createdAt).localeCompare(String(a.createdAt)) || Number(b.id) - Number(a.id)
+      );
       const incidents: Incident[] = dispatches.map((d: any) => ({
         id: Number(d.reportId || d.id),
         lat: Number(d.lat ?? 10.3157),
@@ -163,10 +161,69 @@ export default function ServicesMapPage() {
       }
     };
 
+    const loadIncidents = async () => {
+      const res = await apiFetch("/auth/services/dispatches/", { method: "GET" });
+      const data = await res.json();
+      if (!res.ok) {
+        dispatchesRef.current = new Map();
+        setAllIncidents([]);
+        setTargetIncident(null);
+        return;
+      }
+      dispatchesRef.current = new Map((data?.dispatches || []).map((d: any) => [Number(d.id), d]));
+      await showDispatches();
+    };
+
+    // SSE events carry the full dispatch row: apply them in place, and coalesce a burst into one re-render.
+    let pushed: any[] = [];
+    let flushTimer: ReturnType<typeof setTimeout> | null = null;
+    const applyPushed = (dispatch: any) => {
+      pushed.push(dispatch);
+      if (flushTimer) return;
+      flushTimer = setTimeout(() => {
+        flushTimer = null;
+        for (const d of pushed) dispatchesRef.current.set(Number(d.id), d);
+        pushed = [];
+        showDispatches();
+      }, 250);
+    };
 
     loadIncidents();
-    const interval = setInterval(loadIncidents, 5000);
-    return () => clearInterval(interval);
+
+    // Dispatches are pushed over SSE; polling only remains as a slow safety net.
+    let source: EventSource | null = null;
+    let reconnectTimer: ReturnType<typeof setTimeout> | null = null;
+    let closed = false;
+    const openStream = () => {
+      const token = getAccessToken();
+      if (closed || typeof EventSource === "undefined" || !token) return;
+      source = new EventSource(
+        `${API_BASE}/auth/services/dispatches/stream/?token=${encodeURIComponent(token)}`
+      );
+      source.addEventListener("dispatch", (event) => {
+        try {
+          applyPushed(JSON.parse((event as MessageEvent).data));
+        } catch {
+          loadIncidents();
+        }
+      });
+      source.onerror = () => {
+        // A rejected (e.g. expired) token closes the stream for good; reopen with the current token.
+        if (source?.readyState === EventSource.CLOSED) {
+          reconnectTimer = setTimeout(openStream, 5000);
+        }
+      };
+    };
+    openStream();
+
+    const interval = setInterval(loadIncidents, source ? 60000 : 5000);
+    return () => {
+      closed = true;
+      clearInterval(interval);
+      if (reconnectTimer) clearTimeout(reconnectTimer);
+      if (flushTimer) clearTimeout(flushTimer);
+      source?.close();
+    };
   }, []);
 
 
@@ -62,9 +62,15 @@ export default function Topbar({ onSearch }: TopbarProps) {
       }
     };
 
+    let notificationsEtag = "";
     const loadNotifications = async () => {
       try {
-        const res = await apiFetch("/auth/officials/notifications/", { method: "GET" });
+        const res = await apiFetch("/auth/officials/notifications/", {
+          method: "GET",
+          headers: notificationsEtag ? { "If-None-Match": notificationsEtag } : undefined,
+        });
+        if (res.status === 304) return;
+        notificationsEtag = res.headers.get("ETag") || "";
         const data = await res.json();
         if (!res.ok) return;
         if (!cancelled) {
@@ -9,7 +9,7 @@ import { apiFetch } from "@/lib/api";
 type ReportItem = {
   id: number;
   category: string;
-  description: string;
+  description?: string;
   location: string;
   date: string;
   status: string;
@@ -45,7 +45,7 @@ export default function RecentReports({
     setIsLoading(true);
     setError("");
     try {
-      const res = await apiFetch("/auth/officials/reports/recent/", {
+      const res = await apiFetch("/auth/officials/reports/recent/?view=summary", {
         method: "GET",
       });
       const data = await res.json();
@@ -63,6 +63,21 @@ export default function RecentReports({
     loadReports();
   }, []);
 
+  // The list is a compact summary; description and images are fetched when a report is opened.
+  const openReport = async (report: ReportItem) => {
+    setSelectedReport(report);
+    try {
+      const res = await apiFetch(`/auth/officials/reports/detail/?id=${report.id}`, { method: "GET" });
+      const data = await res.json();
+      if (!res.ok) return;
+      setSelectedReport((current) =>
+        current && current.id === report.id ? { ...current, ...data.report, date: current.date } : current
+      );
+    } catch {
+      // Keep showing the summary row.
+    }
+  };
+
   const decoratedReports = useMemo(
     () =>
       reports.map((report) => {
@@ -103,7 +118,7 @@ export default function RecentReports({
       report.location.toLowerCase().includes(q) ||
       report.date.toLowerCase().includes(q) ||
       report.status.toLowerCase().includes(q) ||
-      report.description.toLowerCase().includes(q)
+      (report.residentName || "").toLowerCase().includes(q)
     );
   });
 
@@ -163,7 +178,7 @@ export default function RecentReports({
               <div className={`${report.statusColor} font-medium`}>{report.status}</div>
               <div>
                 <button
-                  onClick={() => setSelectedReport(report)}
+                  onClick={() => openReport(report)}
                   className="px-3 py-1 text-sm rounded-full border hover:bg-gray-100"
                 >
                   View Details
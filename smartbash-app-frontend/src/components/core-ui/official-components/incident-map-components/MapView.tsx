@@ -1,7 +1,7 @@
 "use client";
 
 import { useEffect, useState } from "react";
-import { MapContainer, TileLayer, Marker, useMap } from "react-leaflet";
+import { MapContainer, TileLayer, Marker, useMap, useMapEvents } from "react-leaflet";
 import L from "leaflet";
 import "leaflet/dist/leaflet.css";
 import { IncidentPopup } from "./IncidentPopup";
@@ -34,18 +34,35 @@ interface MapViewProps {
   getIncidentColor: (urgency: UrgencyLevel) => string;
   selectedIncident: Incident | null;
   setSelectedIncident: (incident: Incident | null) => void;
+  onViewportChange?: (bbox: string, zoom: number) => void;
 }
 
 /* ================= AUTO CENTER MAP TO SHOW ALL PINS ================= */
 function FitBounds({ incidents }: { incidents: Incident[] }) {
   const map = useMap();
+  const [fitted, setFitted] = useState(false);
 
   useEffect(() => {
-    if (incidents.length > 0) {
+    // Fit once; later refreshes are scoped to the viewport the official picked.
+    if (!fitted && incidents.length > 0) {
       const bounds = L.latLngBounds(incidents.map((i) => [i.lat, i.lon]));
       map.fitBounds(bounds, { padding: [50, 50] });
+      setFitted(true);
     }
-  }, [incidents, map]);
+  }, [incidents, map, fitted]);
+
+  return null;
+}
+
+/* ================= REPORT VIEWPORT CHANGES ================= */
+function ViewportWatcher({ onViewportChange }: { onViewportChange?: (bbox: string, zoom: number) => void }) {
+  const map = useMapEvents({
+    moveend: () => onViewportChange?.(map.getBounds().toBBoxString(), map.getZoom()),
+  });
+
+  useEffect(() => {
+    onViewportChange?.(map.getBounds().toBBoxString(), map.getZoom());
+  }, [map, onViewportChange]);
 
   return null;
 }
@@ -73,6 +90,7 @@ export function MapView({
   getIncidentColor,
   selectedIncident,
   setSelectedIncident,
+  onViewportChange,
 }: MapViewProps) {
   const [isBrowser, setIsBrowser] = useState(false);
 
@@ -185,6 +203,8 @@ export function MapView({
 
         <FitBounds incidents={incidents} />
 
+        <ViewportWatcher onViewportChange={onViewportChange} />
+
         {/* Zoom map when a marker is clicked */}
         <ZoomToIncident selectedIncident={selectedIncident} />
 
@@ -0,0 +1,211 @@
+import math
+import random
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.db import close_old_connections, transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from officials.models import BrgyOfficial
+from reports.clusters import attach_report_to_cluster, location_key
+from reports.counters import record_report_created
+from reports.geohash import encode_geohash
+from reports.models import IncidentCluster, IncidentReport
+from residents import gazetteer
+from residents.models import Barangay
+from services.models import Service
+
+from . import views
+from .models import ServiceDispatchNotification, SmsOutbox
+from .sms_outbox import drain
+
+# Seeded rows sit in the open Pacific under a made-up barangay, so neither nearest-service nor
+# barangay routing can reach a real service and dispatch_all only sees benchmark reports.
+BENCHMARK_LAT = 0.0
+BENCHMARK_LNG = -140.0
+_KM_PER_DEGREE = 111.32
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    # Nearest-rank percentile.
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+def latency_summary(samples: list[float]) -> dict:
+    return {
+        "p50Ms": round(percentile(samples, 0.50) * 1000, 2),
+        "p95Ms": round(percentile(samples, 0.95) * 1000, 2),
+        "p99Ms": round(percentile(samples, 0.99) * 1000, 2),
+    }
+
+
+class DispatchBenchmark:
+    # Seeds an isolated barangay (official, services, reports), drives the dispatch views the
+    # way the officials' app does, and removes everything it created in cleanup().
+
+    def __init__(self, services: int = 10, places: int = 20, spread_km: float = 3.0, seed: int | None = None):
+        self.tag = secrets.token_hex(3)
+        self.name = f"Benchmark {self.tag}"
+        self.service_count = services
+        self.places = max(places, 1)
+        self.spread_km = spread_km
+        self.random = random.Random(seed)
+        self.factory = APIRequestFactory()
+        self.barangay_id = None
+        self.user = None
+        self.official = None
+        self.service_ids: list[int] = []
+        self._report_index = 0
+
+    def _point(self) -> tuple[float, float]:
+        return (
+            BENCHMARK_LAT + self.random.uniform(-1, 1) * self.spread_km / _KM_PER_DEGREE,
+            BENCHMARK_LNG + self.random.uniform(-1, 1) * self.spread_km / _KM_PER_DEGREE,
+        )
+
+    def seed(self):
+        email = f"bench-{self.tag}-official@bench.invalid"
+        with transaction.atomic():
+            # A synthetic barangay of its own (the gazetteer never resolves it), removed by cleanup().
+            self.barangay_id = Barangay.objects.create(
+                barangay_key=gazetteer.match(self.name), barangay_name=self.name
+            ).pk
+            self.user = User.objects.create_user(username=email, email=email)
+            self.official = BrgyOfficial.objects.create(
+                official_name=self.name,
+                official_email_address=email,
+                official_password="",
+                official_barangay=self.name,
+                barangay_ref_id=self.barangay_id,
+                official_is_active=True,
+            )
+            for index in range(self.service_count):
+                capability = "Fire" if index % 2 == 0 else "Rescue"
+                lat, lng = self._point()
+                service = Service.objects.create(
+                    svc_name=f"{self.name} {capability} {index}",
+                    svc_email_address=f"bench-{self.tag}-service-{index}@bench.invalid",
+                    svc_contact_number=f"0917{self.random.randrange(10**7):07d}",
+                    svc_password="",
+                    svc_location=self.name,
+                    svc_description=capability,
+                    svc_is_active=True,
+                    svc_lat=lat,
+                    svc_lng=lng,
+                    barangay_ref_id=self.barangay_id,
+                )
+                self.service_ids.append(service.svc_id)
+
+    def add_reports(self, count: int) -> list[int]:
+        # Reports spread over a fixed set of places, so several share a cluster as in a real incident.
+        rows = []
+        for _ in range(count):
+            place = self._report_index % self.places
+            self._report_index += 1
+            lat, lng = self._point()
+            rows.append(IncidentReport(
+                resident_email=f"bench-{self.tag}-resident@bench.invalid",
+                resident_name=self.name,
+                barangay=self.name,
+                barangay_ref_id=self.barangay_id,
+                incident_type="Fire" if place % 2 == 0 else "Flood",
+                description="Dispatch benchmark",
+                location_text=f"{self.name} street {place}",
+                lat=lat,
+                lng=lng,
+                geohash=encode_geohash(lat, lng),
+            ))
+        with transaction.atomic():
+            rows = IncidentReport.objects.bulk_create(rows)
+            for report in rows:
+                attach_report_to_cluster(report)
+                record_report_created(report)
+        return [report.report_id for report in rows]
+
+    def _post(self, view, data: dict) -> tuple[int, float, dict]:
+        request = self.factory.post("/", data, format="json")
+        force_authenticate(request, user=self.user)
+        started = time.perf_counter()
+        response = view(request)
+        return response.status_code, time.perf_counter() - started, getattr(response, "data", None) or {}
+
+    def _dispatch_one(self, report_id: int) -> tuple[int, float, dict]:
+        # Runs on a pool thread, which owns its own DB connection.
+        try:
+            return self._post(views.officials_reports_dispatch, {"id": report_id})
+        finally:
+            close_old_connections()
+
+    def run_single(self, reports: int, concurrency: int = 1) -> dict:
+        # One officials_reports_dispatch call per report, concurrency calls at a time.
+        report_ids = self.add_reports(reports)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(concurrency, 1), thread_name_prefix="dispatch") as pool:
+            results = list(pool.map(self._dispatch_one, report_ids))
+        elapsed = time.perf_counter() - started
+        ok = [latency for status, latency, _ in results if status < 300]
+        return {
+            "mode": "single",
+            "calls": len(results),
+            "errors": len(results) - len(ok),
+            "dispatched": len(ok),
+            "seconds": round(elapsed, 3),
+            "perSecond": round(len(ok) / elapsed, 1) if elapsed else 0.0,
+            **latency_summary([latency for _, latency, _ in results]),
+        }
+
+    def run_all(self, reports: int, rounds: int = 5) -> dict:
+        # One officials_reports_dispatch_all call per round over that round's pending reports.
+        latencies = []
+        dispatched = errors = 0
+        for _ in range(rounds):
+            self.add_reports(reports)
+            status, latency, data = self._post(views.officials_reports_dispatch_all, {})
+            latencies.append(latency)
+            if status < 300:
+                dispatched += data.get("updated") or 0
+            else:
+                errors += 1
+        elapsed = sum(latencies)
+        return {
+            "mode": "all",
+            "calls": rounds,
+            "errors": errors,
+            "dispatched": dispatched,
+            "seconds": round(elapsed, 3),
+            "perSecond": round(dispatched / elapsed, 1) if elapsed else 0.0,
+            **latency_summary(latencies),
+        }
+
+    def drain_sms(self, workers: int) -> dict:
+        # Sends only this run's queued messages, through whatever provider the environment points at.
+        scope = {"notification__service_id__in": self.service_ids}
+        started = time.perf_counter()
+        totals = drain(workers=workers, once=True, scope=scope)
+        elapsed = time.perf_counter() - started
+        return {
+            **totals,
+            "pending": SmsOutbox.objects.filter(status__in=("Queued", "Sending"), **scope).count(),
+            "seconds": round(elapsed, 3),
+            "perSecond": round(totals["sent"] / elapsed, 1) if elapsed else 0.0,
+        }
+
+    def cleanup(self):
+        with transaction.atomic():
+            SmsOutbox.objects.filter(notification__service_id__in=self.service_ids).delete()
+            ServiceDispatchNotification.objects.filter(service_id__in=self.service_ids).delete()
+            if self.barangay_id:
+                IncidentReport.objects.filter(barangay_ref_id=self.barangay_id).delete()
+            IncidentCluster.objects.filter(cluster_key__startswith=location_key(self.name)).delete()
+            Service.objects.filter(svc_id__in=self.service_ids).delete()
+            if self.official:
+                self.official.delete()
+            if self.user:
+                self.user.delete()
+            if self.barangay_id:
+                Barangay.objects.filter(pk=self.barangay_id).delete()
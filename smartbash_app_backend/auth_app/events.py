@@ -0,0 +1,62 @@
+import asyncio
+import threading
+
+from django.db import transaction
+
+
+class EventBroker:
+    # In-process wake-up hints for open SSE streams. The database stays the source of
+    # truth: a woken stream re-reads its changes, and streams in other worker processes
+    # still catch up on their periodic fallback check.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: dict[str, set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+
+    def subscribe(self, *topics: str) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        with self._lock:
+            for topic in topics:
+                self._subscribers.setdefault(topic, set()).add((loop, queue))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        with self._lock:
+            for topic in list(self._subscribers):
+                subscribers = self._subscribers[topic]
+                for item in [item for item in subscribers if item[1] is queue]:
+                    subscribers.discard(item)
+                if not subscribers:
+                    del self._subscribers[topic]
+
+    def publish(self, *topics: str):
+        with self._lock:
+            targets = set()
+            for topic in topics:
+                targets.update(self._subscribers.get(topic, ()))
+        for loop, queue in targets:
+            try:
+                loop.call_soon_threadsafe(_wake, queue)
+            except RuntimeError:
+                # Loop already closed; the stream is gone.
+                pass
+
+
+def _wake(queue: asyncio.Queue):
+    if not queue.full():
+        queue.put_nowait(True)
+
+
+broker = EventBroker()
+
+
+def publish_on_commit(*topics: str):
+    transaction.on_commit(lambda: broker.publish(*topics))
+
+
+def service_topic(service_id) -> str:
+    return f"service:{service_id}"
+
+
+INCIDENTS_TOPIC = "incidents"
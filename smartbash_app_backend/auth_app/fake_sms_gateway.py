@@ -0,0 +1,159 @@
+import json
+import random
+import threading
+import time
+import urllib.parse
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Paths the stub answers on; any other POST is treated as the generic JSON API.
+SEMAPHORE_PATH = "/api/v4/messages"
+GENERIC_PATH = "/sms"
+
+
+class FakeSmsGateway:
+    # Local stand-in for Semaphore, Twilio and the generic JSON API so dispatch and the SMS
+    # worker can be exercised offline. Latency, random failures and a request rate limit are
+    # configurable; nothing is ever delivered.
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        error_rate: float = 0.0,
+        rate_limit: float = 0,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.stats = {"requests": 0, "messages": 0, "errors": 0, "rateLimited": 0}
+        self._lock = threading.Lock()
+        self._tokens = float(rate_limit)
+        self._refilled_at = time.monotonic()
+        self._server = ThreadingHTTPServer((host, port), _GatewayHandler)
+        self._server.daemon_threads = True
+        self._server.gateway = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self, provider: str) -> dict[str, str]:
+        # Settings that point one provider (and only that provider) at this stub.
+        provider = provider.upper()
+        if provider == "SEMAPHORE":
+            return {
+                "SMS_PROVIDERS": "SEMAPHORE",
+                "SEMAPHORE_API_KEY": "fake-gateway",
+                "SEMAPHORE_API_URL": f"{self.url}{SEMAPHORE_PATH}",
+            }
+        if provider == "TWILIO":
+            return {
+                "SMS_PROVIDERS": "TWILIO",
+                "TWILIO_ACCOUNT_SID": "ACfakegateway",
+                "TWILIO_AUTH_TOKEN": "fake-gateway",
+                "TWILIO_FROM_NUMBER": "+15005550006",
+                "TWILIO_API_URL": self.url,
+            }
+        return {"SMS_PROVIDERS": "JSON", "SMS_API_KEY": "fake-gateway", "SMS_API_URL": f"{self.url}{GENERIC_PATH}"}
+
+    def start(self) -> "FakeSmsGateway":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-sms-gateway", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def _admit(self) -> bool:
+        # Token bucket of rate_limit requests per second; 0 disables the limit.
+        if self.rate_limit <= 0:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(float(self.rate_limit), self._tokens + (now - self._refilled_at) * self.rate_limit)
+            self._refilled_at = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def _delay(self):
+        delay_ms = self.latency_ms + (random.uniform(0, self.jitter_ms) if self.jitter_ms else 0)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+
+class _GatewayHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so the SMS client's keep-alive connections are exercised as in production.
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        gateway: FakeSmsGateway = self.server.gateway
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        gateway._count("requests")
+        path = urllib.parse.urlsplit(self.path).path
+        if path.endswith("/Messages.json"):
+            kind = "twilio"
+        elif path == SEMAPHORE_PATH:
+            kind = "semaphore"
+        else:
+            kind = "generic"
+
+        if not gateway._admit():
+            gateway._count("rateLimited")
+            return self._reply(429, {"code": 20429, "message": "Too Many Requests"})
+        gateway._delay()
+        if gateway.error_rate and random.random() < gateway.error_rate:
+            gateway._count("errors")
+            return self._reply(503, {"message": "Service temporarily unavailable"})
+
+        if kind == "semaphore":
+            form = urllib.parse.parse_qs(body.decode("utf-8", errors="ignore"))
+            numbers = [number for number in (form.get("number") or [""])[0].split(",") if number]
+            if not (form.get("apikey") or [""])[0] or not numbers:
+                return self._reply(400, {"message": "apikey and number are required"})
+            gateway._count("messages", len(numbers))
+            text = (form.get("message") or [""])[0]
+            return self._reply(200, [
+                {"message_id": uuid.uuid4().int % 10**9, "recipient": number, "message": text, "status": "Pending"}
+                for number in numbers
+            ])
+        if kind == "twilio":
+            form = urllib.parse.parse_qs(body.decode("utf-8", errors="ignore"))
+            if not (form.get("To") or [""])[0]:
+                return self._reply(400, {"code": 21604, "message": "A 'To' phone number is required."})
+            gateway._count("messages")
+            return self._reply(201, {"sid": f"SM{uuid.uuid4().hex}", "to": form["To"][0], "status": "queued"})
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return self._reply(400, {"message": "Invalid JSON"})
+        if not isinstance(payload, dict) or not payload.get("to"):
+            return self._reply(400, {"message": "to is required"})
+        gateway._count("messages")
+        return self._reply(200, {"id": uuid.uuid4().hex, "status": "queued"})
+
+    def _reply(self, status: int, payload):
+        content = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
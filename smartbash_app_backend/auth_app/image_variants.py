@@ -0,0 +1,108 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+
+from .imaging import IMAGE_EXTENSIONS, VARIANT_SPECS, imaging_available, render_variants
+from .models import MediaVariant
+
+IMAGE_VARIANT_WORKERS = int(os.environ.get("IMAGE_VARIANT_WORKERS", "2"))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ProcessPoolExecutor:
+    # Resizing is CPU bound, so it runs in separate processes rather than request threads.
+    # "spawn" keeps workers away from the parent's database connections and threads.
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=IMAGE_VARIANT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def is_image_path(path: str | None) -> bool:
+    return bool(path) and os.path.splitext(path)[1].lower() in IMAGE_EXTENSIONS
+
+
+def variant_path(source_path: str, variant: str, extension: str) -> str:
+    root, _ = os.path.splitext(source_path)
+    return f"{root}.{variant}{extension}"
+
+
+def save_variants(source_path: str, rendered: dict):
+    for variant, (content, width, height, extension) in rendered.items():
+        path = variant_path(source_path, variant, extension)
+        if default_storage.exists(path):
+            default_storage.delete(path)
+        path = default_storage.save(path, ContentFile(content))
+        MediaVariant.objects.update_or_create(
+            source_path=source_path,
+            variant=variant,
+            defaults={"path": path, "width": width, "height": height},
+        )
+
+
+def _store_rendered(source_path: str, future):
+    # Runs on the executor's result thread, so it manages its own DB connection.
+    try:
+        save_variants(source_path, future.result())
+    except Exception:
+        pass
+    finally:
+        close_old_connections()
+
+
+def _submit(source_path: str):
+    # Deduplicated blobs are shared, so a re-upload of known content is already rendered.
+    if MediaVariant.objects.filter(source_path=source_path).count() >= len(VARIANT_SPECS):
+        return
+    try:
+        with default_storage.open(source_path, "rb") as handle:
+            data = handle.read()
+        future = get_executor().submit(render_variants, data)
+    except Exception:
+        return
+    future.add_done_callback(partial(_store_rendered, source_path))
+
+
+def schedule_variants(*source_paths: str | None):
+    if not imaging_available():
+        return
+    for source_path in source_paths:
+        if is_image_path(source_path):
+            transaction.on_commit(partial(_submit, source_path))
+
+
+def delete_variants(source_path: str | None):
+    if not source_path:
+        return
+    for row in MediaVariant.objects.filter(source_path=source_path):
+        try:
+            default_storage.delete(row.path)
+        except Exception:
+            pass
+        row.delete()
+
+
+def variant_paths(source_paths, *variants: str) -> dict[str, dict[str, str]]:
+    # One query for a whole page: {variant: {original path: variant path}} for those already rendered.
+    found = {variant: {} for variant in variants}
+    wanted = {path for path in source_paths if path}
+    if not wanted or not variants:
+        return found
+    rows = MediaVariant.objects.filter(source_path__in=wanted, variant__in=variants).values_list(
+        "variant", "source_path", "path"
+    )
+    for variant, source_path, path in rows:
+        found[variant][source_path] = path
+    return found
@@ -0,0 +1,50 @@
+import io
+
+# Pure Pillow code with no Django imports: it runs inside spawned pool workers.
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # Pillow is optional; without it the original uploads are served.
+    Image = None
+
+VARIANT_SPECS = {
+    "thumb": {"size": (128, 128), "crop": True, "quality": 72},
+    "card": {"size": (640, 640), "crop": False, "quality": 76},
+    "full": {"size": (1600, 1600), "crop": False, "quality": 82},
+}
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".gif")
+
+
+def imaging_available() -> bool:
+    return Image is not None
+
+
+def _output_format() -> tuple[str, str]:
+    if features.check("webp"):
+        return "WEBP", ".webp"
+    return "JPEG", ".jpg"
+
+
+def render_variants(data: bytes, specs: dict = VARIANT_SPECS) -> dict[str, tuple[bytes, int, int, str]]:
+    # Returns {variant: (encoded bytes, width, height, extension)}.
+    image_format, extension = _output_format()
+    rendered = {}
+    with Image.open(io.BytesIO(data)) as opened:
+        opened.seek(0)
+        source = ImageOps.exif_transpose(opened)
+        has_alpha = source.mode in ("RGBA", "LA") or (source.mode == "P" and "transparency" in source.info)
+        source = source.convert("RGBA" if has_alpha and image_format == "WEBP" else "RGB")
+        for name, spec in specs.items():
+            if spec["crop"]:
+                variant = ImageOps.fit(source, spec["size"], Image.LANCZOS)
+            else:
+                variant = source.copy()
+                variant.thumbnail(spec["size"], Image.LANCZOS)
+            buffer = io.BytesIO()
+            options = {"quality": spec["quality"]}
+            if image_format == "WEBP":
+                options["method"] = 4
+            else:
+                options.update(optimize=True, progressive=True)
+            variant.save(buffer, image_format, **options)
+            rendered[name] = (buffer.getvalue(), variant.width, variant.height, extension)
+    return rendered
@@ -0,0 +1,77 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from auth_app.dispatch_benchmark import DispatchBenchmark
+from auth_app.fake_sms_gateway import FakeSmsGateway
+from auth_app.sms_outbox import SMS_WORKERS
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed an isolated barangay with services and reports, drive the dispatch endpoints against a local "
+        "stub SMS gateway and report dispatch throughput and latency. Use a development database: seeded "
+        "rows are removed afterwards (unless --keep), but a running sms_worker could pick up queued messages."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--mode", choices=("single", "all", "both"), default="both",
+                            help="single: officials_reports_dispatch per report; all: officials_reports_dispatch_all per round.")
+        parser.add_argument("--reports", type=int, default=200, help="Reports per run (per round for --mode all).")
+        parser.add_argument("--rounds", type=int, default=5, help="dispatch_all calls for --mode all.")
+        parser.add_argument("--services", type=int, default=10)
+        parser.add_argument("--places", type=int, default=20, help="Distinct report locations (incident clusters).")
+        parser.add_argument("--concurrency", type=int, default=1, help="Parallel dispatch calls for --mode single.")
+        parser.add_argument("--provider", choices=("semaphore", "twilio", "generic"), default="semaphore")
+        parser.add_argument("--latency-ms", type=float, default=50, help="Stub gateway delay per request.")
+        parser.add_argument("--jitter-ms", type=float, default=0)
+        parser.add_argument("--error-rate", type=float, default=0.0)
+        parser.add_argument("--rate-limit", type=float, default=0, help="Stub gateway requests per second; 0 for none.")
+        parser.add_argument("--workers", type=int, default=SMS_WORKERS, help="SMS worker threads for the drain.")
+        parser.add_argument("--no-sms", action="store_true", help="Skip sending the queued messages to the stub.")
+        parser.add_argument("--keep", action="store_true", help="Leave the seeded rows in place.")
+        parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible locations.")
+
+    def handle(self, *args, **options):
+        if options["reports"] < 1 or options["rounds"] < 1 or options["services"] < 1:
+            raise CommandError("--reports, --rounds and --services must be at least 1.")
+        if not 0 <= options["error_rate"] <= 1:
+            raise CommandError("--error-rate must be between 0 and 1.")
+
+        gateway = FakeSmsGateway(
+            latency_ms=options["latency_ms"],
+            jitter_ms=options["jitter_ms"],
+            error_rate=options["error_rate"],
+            rate_limit=options["rate_limit"],
+        ).start()
+        # Only the stub is configured for this process, so no real provider can be reached.
+        os.environ.update(gateway.env("JSON" if options["provider"] == "generic" else options["provider"]))
+
+        benchmark = DispatchBenchmark(services=options["services"], places=options["places"], seed=options["seed"])
+        try:
+            benchmark.seed()
+            self.stdout.write(f"Seeded '{benchmark.name}' with {options['services']} services; stub gateway at {gateway.url}.")
+            runs = []
+            if options["mode"] in ("single", "both"):
+                runs.append(benchmark.run_single(options["reports"], concurrency=options["concurrency"]))
+            if options["mode"] in ("all", "both"):
+                runs.append(benchmark.run_all(options["reports"], rounds=options["rounds"]))
+            for run in runs:
+                self.stdout.write(
+                    f"dispatch ({run['mode']}): {run['dispatched']} reports in {run['calls']} calls, "
+                    f"{run['seconds']} s, {run['perSecond']} dispatches/s, "
+                    f"p50 {run['p50Ms']} ms, p95 {run['p95Ms']} ms, p99 {run['p99Ms']} ms, {run['errors']} errors"
+                )
+            if not options["no_sms"]:
+                sms = benchmark.drain_sms(options["workers"])
+                stats = gateway.stats
+                self.stdout.write(
+                    f"sms ({options['provider']}): {sms['sent']} sent, {sms['failed']} not sent, {sms['pending']} awaiting retry, "
+                    f"{sms['seconds']} s, {sms['perSecond']} messages/s; gateway saw {stats['requests']} requests "
+                    f"({stats['errors']} errors, {stats['rateLimited']} rate limited)"
+                )
+        finally:
+            if not options["keep"]:
+                benchmark.cleanup()
+            gateway.stop()
+        self.stdout.write(self.style.SUCCESS("Benchmark complete."))
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from auth_app.fake_sms_gateway import FakeSmsGateway
+
+
+class Command(BaseCommand):
+    help = "Run a local stub SMS gateway that accepts Semaphore, Twilio and generic JSON API requests."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8025)
+        parser.add_argument("--latency-ms", type=float, default=0, help="Delay added to every request.")
+        parser.add_argument("--jitter-ms", type=float, default=0, help="Random extra delay, up to this much.")
+        parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 503.")
+        parser.add_argument("--rate-limit", type=float, default=0, help="Requests per second before HTTP 429; 0 for none.")
+
+    def handle(self, *args, **options):
+        if not 0 <= options["error_rate"] <= 1:
+            raise CommandError("--error-rate must be between 0 and 1.")
+        gateway = FakeSmsGateway(
+            host=options["host"],
+            port=options["port"],
+            latency_ms=options["latency_ms"],
+            jitter_ms=options["jitter_ms"],
+            error_rate=options["error_rate"],
+            rate_limit=options["rate_limit"],
+        )
+        self.stdout.write(f"Fake SMS gateway listening on {gateway.url}. Point a provider at it with:")
+        for provider in ("SEMAPHORE", "TWILIO", "JSON"):
+            settings = " ".join(f"{key}={value}" for key, value in gateway.env(provider).items())
+            self.stdout.write(f"  {provider}: {settings}")
+        try:
+            gateway.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            gateway.stop()
+        stats = gateway.stats
+        self.stdout.write(self.style.SUCCESS(
+            f"Handled {stats['requests']} requests ({stats['messages']} messages, "
+            f"{stats['errors']} errors, {stats['rateLimited']} rate limited)."
+        ))
@@ -0,0 +1,150 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from auth_app.image_variants import delete_variants
+from auth_app.media_store import BLOB_ROOT, blob_digest
+from auth_app.models import MediaBlob, MediaVariant, ProofOfAuthority, UserProfileAvatar
+from reports.models import IncidentReport, IncidentReportArchive, NewsFeedPost
+
+
+def _referenced_digests() -> Counter:
+    counts = Counter()
+
+    def add(path):
+        digest = blob_digest(path)
+        if digest:
+            counts[digest] += 1
+
+    for path in UserProfileAvatar.objects.values_list("image_path", flat=True).iterator():
+        add(path)
+    for path in ProofOfAuthority.objects.values_list("file_path", flat=True).iterator():
+        add(path)
+    for model in (IncidentReport, IncidentReportArchive):
+        for images in model.objects.exclude(images=[]).values_list("images", flat=True).iterator():
+            for path in images or []:
+                if isinstance(path, str):
+                    add(path)
+    for path in NewsFeedPost.objects.exclude(image__isnull=True).values_list("image", flat=True).iterator():
+        add(path)
+    return counts
+
+
+def _count_references(path: str) -> int:
+    # Fresh count for one blob, made while its row is locked; same rules as _referenced_digests.
+    count = UserProfileAvatar.objects.filter(image_path=path).count()
+    count += ProofOfAuthority.objects.filter(file_path=path).count()
+    count += NewsFeedPost.objects.filter(image=path).count()
+    for model in (IncidentReport, IncidentReportArchive):
+        for images in model.objects.filter(images__contains=[path]).values_list("images", flat=True):
+            count += sum(1 for image in images if image == path)
+    return count
+
+
+def _lock_unchanged(blob: MediaBlob) -> MediaBlob | None:
+    # The row as the scan saw it, locked; None once an acquire/release has touched it since, in which
+    # case this run leaves it alone (the counts it took are stale).
+    return MediaBlob.objects.select_for_update().filter(
+        pk=blob.digest,
+        ref_count=blob.ref_count,
+        updated_at=blob.updated_at,
+    ).first()
+
+
+def _blob_files():
+    # Files under the two shard levels, including ones whose upload transaction rolled back.
+    try:
+        first_level, _ = default_storage.listdir(BLOB_ROOT)
+    except (FileNotFoundError, NotImplementedError):
+        return
+    for first in first_level:
+        second_level, _ = default_storage.listdir(f"{BLOB_ROOT}/{first}")
+        for second in second_level:
+            _, files = default_storage.listdir(f"{BLOB_ROOT}/{first}/{second}")
+            for name in files:
+                yield f"{BLOB_ROOT}/{first}/{second}/{name}"
+
+
+class Command(BaseCommand):
+    help = "Recount media blob references and delete blobs nothing points at any more."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-hours",
+            type=int,
+            default=24,
+            help="Keep unreferenced blobs this long, so uploads still in flight are not collected.",
+        )
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        cutoff = timezone.now() - timedelta(hours=options["grace_hours"])
+        referenced = _referenced_digests()
+
+        # Repair drifted counters first; the tables are the source of truth. The scan is only a hint:
+        # each fix and each delete re-reads the row under lock and recounts that one blob.
+        drifted = []
+        candidates = []
+        for blob in MediaBlob.objects.only("digest", "path", "ref_count", "size", "updated_at").iterator():
+            actual = referenced.get(blob.digest, 0)
+            if blob.ref_count != actual:
+                drifted.append(blob)
+            if actual == 0 and blob.updated_at < cutoff:
+                candidates.append(blob)
+
+        repaired = 0
+        if not dry_run:
+            for blob in drifted:
+                with transaction.atomic():
+                    locked = _lock_unchanged(blob)
+                    if not locked:
+                        continue
+                    actual = _count_references(locked.path)
+                    if actual != locked.ref_count:
+                        # .update() leaves updated_at alone, so the delete pass below still sees the row as scanned.
+                        MediaBlob.objects.filter(pk=locked.pk).update(ref_count=actual)
+                        blob.ref_count = actual
+                        repaired += 1
+
+        collected = 0
+        freed = 0
+        for blob in candidates:
+            if dry_run:
+                collected += 1
+                freed += blob.size
+                continue
+            with transaction.atomic():
+                locked = _lock_unchanged(blob)
+                if not locked or locked.ref_count or _count_references(locked.path):
+                    continue
+                delete_variants(locked.path)
+                if default_storage.exists(locked.path):
+                    default_storage.delete(locked.path)
+                locked.delete()
+            collected += 1
+            freed += blob.size
+
+        known = set(MediaBlob.objects.values_list("path", flat=True))
+        known.update(MediaVariant.objects.filter(source_path__startswith=BLOB_ROOT).values_list("path", flat=True))
+        orphans = 0
+        for path in _blob_files():
+            if path in known:
+                continue
+            if default_storage.get_modified_time(path) >= cutoff:
+                continue
+            orphans += 1
+            if not dry_run:
+                default_storage.delete(path)
+
+        verb = "Would collect" if dry_run else "Collected"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {collected} blobs ({freed} bytes) and {orphans} orphan files; "
+                f"{len(drifted) if dry_run else repaired} reference counts repaired."
+            )
+        )
@@ -0,0 +1,78 @@
+from concurrent.futures import as_completed
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+
+from auth_app.image_variants import get_executor, is_image_path, save_variants
+from auth_app.imaging import VARIANT_SPECS, imaging_available, render_variants
+from auth_app.models import MediaVariant, ProofOfAuthority, UserProfileAvatar
+from reports.images import is_storage_key
+from reports.models import IncidentReport, IncidentReportArchive, NewsFeedPost
+
+
+def _source_paths():
+    yield from UserProfileAvatar.objects.values_list("image_path", flat=True).iterator()
+    yield from ProofOfAuthority.objects.values_list("file_path", flat=True).iterator()
+    for model in (IncidentReport, IncidentReportArchive):
+        for images in model.objects.exclude(images=[]).values_list("images", flat=True).iterator():
+            yield from (image for image in images or [] if is_storage_key(image))
+    yield from NewsFeedPost.objects.exclude(image__isnull=True).values_list("image", flat=True).iterator()
+
+
+class Command(BaseCommand):
+    help = "Render thumb/card/full variants for uploaded images that do not have them yet."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument("--force", action="store_true", help="Re-render images that already have variants.")
+
+    def handle(self, *args, **options):
+        if not imaging_available():
+            raise CommandError("Pillow is not installed.")
+
+        complete = set()
+        if not options["force"]:
+            counts = {}
+            for source_path in MediaVariant.objects.values_list("source_path", flat=True).iterator():
+                counts[source_path] = counts.get(source_path, 0) + 1
+            complete = {path for path, count in counts.items() if count >= len(VARIANT_SPECS)}
+
+        seen = set()
+        batch = []
+        rendered = failed = 0
+        for source_path in _source_paths():
+            if not is_storage_key(source_path) or not is_image_path(source_path):
+                continue
+            if source_path in seen or source_path in complete:
+                continue
+            seen.add(source_path)
+            batch.append(source_path)
+            if len(batch) >= options["batch_size"]:
+                done, errors = self._render(batch)
+                rendered, failed = rendered + done, failed + errors
+                batch = []
+        if batch:
+            done, errors = self._render(batch)
+            rendered, failed = rendered + done, failed + errors
+
+        self.stdout.write(self.style.SUCCESS(f"Rendered variants for {rendered} images ({failed} failed)."))
+
+    def _render(self, source_paths):
+        executor = get_executor()
+        futures = {}
+        failed = 0
+        for source_path in source_paths:
+            try:
+                with default_storage.open(source_path, "rb") as handle:
+                    futures[executor.submit(render_variants, handle.read())] = source_path
+            except OSError:
+                failed += 1
+        done = 0
+        for future in as_completed(futures):
+            try:
+                save_variants(futures[future], future.result())
+                done += 1
+            except Exception as exc:
+                failed += 1
+                self.stderr.write(f"{futures[future]}: {exc}")
+        return done, failed
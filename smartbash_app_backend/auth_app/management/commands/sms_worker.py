@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from auth_app.sms_outbox import SMS_WORKERS, drain
+
+
+class Command(BaseCommand):
+    help = "Send queued dispatch SMS from the outbox, retrying failures with backoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=SMS_WORKERS, help="Concurrent sends (threads).")
+        parser.add_argument("--batch-size", type=int, help="Rows claimed per round; defaults to twice --workers.")
+        parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds to wait when nothing is due.")
+        parser.add_argument("--once", action="store_true", help="Exit when no message is due instead of polling.")
+
+    def handle(self, *args, **options):
+        if options["workers"] < 1:
+            raise CommandError("--workers must be at least 1.")
+        log = self.stdout.write if options["verbosity"] > 1 else None
+        try:
+            totals = drain(
+                workers=options["workers"],
+                batch_size=options["batch_size"],
+                poll_interval=options["poll_interval"],
+                once=options["once"],
+                log=log,
+            )
+        except KeyboardInterrupt:
+            return
+        self.stdout.write(self.style.SUCCESS(f"Sent {totals['sent']} messages ({totals['failed']} not sent)."))
@@ -0,0 +1,80 @@
+import hashlib
+import os
+import re
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import MediaBlob
+
+BLOB_ROOT = "uploads/blobs"
+_BLOB_PATH = re.compile(rf"^{re.escape(BLOB_ROOT)}/[0-9a-f]{{2}}/[0-9a-f]{{2}}/(?P<digest>[0-9a-f]{{64}})(\.[a-z0-9]+)?$")
+_SAFE_EXTENSION = re.compile(r"^\.[a-z0-9]{1,8}$")
+
+
+def blob_path(digest: str, extension: str = "") -> str:
+    # Two levels of 256 shards: uploads/blobs/ab/cd/abcd...<ext>
+    extension = extension.lower() if _SAFE_EXTENSION.match(extension or "") else ""
+    return f"{BLOB_ROOT}/{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+
+
+def blob_digest(path: str | None) -> str | None:
+    found = _BLOB_PATH.match(path or "")
+    return found.group("digest") if found else None
+
+
+def _store(digest: str, size: int, extension: str, content) -> str:
+    with transaction.atomic():
+        blob, created = MediaBlob.objects.select_for_update().get_or_create(
+            digest=digest,
+            defaults={"path": blob_path(digest, extension), "size": size, "ref_count": 0},
+        )
+        if created or not default_storage.exists(blob.path):
+            # Same content always maps to the same name; a file left by a rolled back upload is replaced.
+            if default_storage.exists(blob.path):
+                default_storage.delete(blob.path)
+            saved = default_storage.save(blob.path, content)
+            if saved != blob.path:
+                blob.path = saved
+                blob.save(update_fields=["path"])
+        MediaBlob.objects.filter(pk=digest).update(ref_count=F("ref_count") + 1, updated_at=timezone.now())
+    return blob.path
+
+
+def store_bytes(content: bytes, extension: str = "") -> str:
+    digest = hashlib.sha256(content).hexdigest()
+    return _store(digest, len(content), extension, ContentFile(content))
+
+
+def store_upload(upload, extension: str | None = None) -> str:
+    if extension is None:
+        extension = os.path.splitext(getattr(upload, "name", "") or "")[1]
+    hasher = hashlib.sha256()
+    size = 0
+    for chunk in upload.chunks():
+        hasher.update(chunk)
+        size += len(chunk)
+    upload.seek(0)
+    return _store(hasher.hexdigest(), size, extension, upload)
+
+
+def acquire(path: str | None):
+    # A new row points at an existing blob (e.g. a re-submitted storage key).
+    digest = blob_digest(path)
+    if digest:
+        MediaBlob.objects.filter(pk=digest).update(ref_count=F("ref_count") + 1, updated_at=timezone.now())
+
+
+def release(path: str | None) -> bool:
+    # Returns False for legacy (non content-addressed) paths, which the caller still owns.
+    digest = blob_digest(path)
+    if not digest:
+        return False
+    MediaBlob.objects.filter(pk=digest, ref_count__gt=0).update(
+        ref_count=F("ref_count") - 1,
+        updated_at=timezone.now(),
+    )
+    return True
@@ -0,0 +1,28 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth_app", "0009_servicedispatchnotification_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MediaVariant",
+            fields=[
+                ("variant_id", models.AutoField(primary_key=True, serialize=False)),
+                ("source_path", models.CharField(db_index=True, max_length=500)),
+                ("variant", models.CharField(max_length=20)),
+                ("path", models.CharField(max_length=500)),
+                ("width", models.IntegerField()),
+                ("height", models.IntegerField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "media_variants",
+                "managed": True,
+                "unique_together": {("source_path", "variant")},
+            },
+        ),
+    ]
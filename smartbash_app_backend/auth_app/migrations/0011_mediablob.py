@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth_app", "0010_mediavariant"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MediaBlob",
+            fields=[
+                ("digest", models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ("path", models.CharField(max_length=500)),
+                ("size", models.BigIntegerField(default=0)),
+                ("ref_count", models.IntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "media_blobs",
+                "managed": True,
+                "indexes": [models.Index(fields=["ref_count", "updated_at"], name="media_blob_gc_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth_app", "0011_mediablob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SmsOutbox",
+            fields=[
+                ("outbox_id", models.AutoField(primary_key=True, serialize=False)),
+                ("phone", models.CharField(max_length=32)),
+                ("message", models.TextField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("Queued", "Queued"), ("Sending", "Sending"), ("Sent", "Sent"), ("Failed", "Failed")],
+                        default="Queued",
+                        max_length=20,
+                    ),
+                ),
+                ("attempts", models.IntegerField(default=0)),
+                ("next_attempt_at", models.DateTimeField()),
+                ("last_error", models.CharField(blank=True, max_length=500, null=True)),
+                ("sent_at", models.DateTimeField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "notification",
+                    models.ForeignKey(
+                        blank=True,
+                        db_column="dispatch_id",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sms_messages",
+                        to="auth_app.servicedispatchnotification",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "sms_outbox",
+                "managed": True,
+                "indexes": [models.Index(fields=["status", "next_attempt_at"], name="sms_outbox_due_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth_app", "0012_smsoutbox"),
+        ("services", "0006_service_coordinates"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="servicedispatchnotification",
+            name="cluster_id",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="servicedispatchnotification",
+            name="report_count",
+            field=models.IntegerField(default=1),
+        ),
+        migrations.AddIndex(
+            model_name="servicedispatchnotification",
+            index=models.Index(fields=["service", "cluster_id", "-created_at"], name="dispatch_suppression_idx"),
+        ),
+    ]
@@ -0,0 +1,47 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth_app", "0013_servicedispatchnotification_suppression"),
+        ("reports", "0012_incidentreport_client_key"),
+        ("services", "0006_service_coordinates"),
+    ]
+
+    operations = [
+        # The report_id column stays as it is (no data is copied); the database only gains the
+        # index and loses NOT NULL, while the model state turns the integer into a foreign key.
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.AlterField(
+                    model_name="servicedispatchnotification",
+                    name="report_id",
+                    field=models.IntegerField(db_index=True, null=True),
+                ),
+            ],
+            state_operations=[
+                migrations.RemoveField(
+                    model_name="servicedispatchnotification",
+                    name="report_id",
+                ),
+                migrations.AddField(
+                    model_name="servicedispatchnotification",
+                    name="report",
+                    field=models.ForeignKey(
+                        db_column="report_id",
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="dispatch_notifications",
+                        to="reports.incidentreport",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="servicedispatchnotification",
+            index=models.Index(fields=["service", "-created_at", "-dispatch_id"], name="dispatch_feed_idx"),
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+def fill_report_ids(apps, schema_editor):
+    ServiceDispatchNotification = apps.get_model("auth_app", "ServiceDispatchNotification")
+    rows = ServiceDispatchNotification.objects.filter(report_id__isnull=False).only("dispatch_id", "report_id")
+    batch = []
+    for row in rows.iterator(chunk_size=1000):
+        row.report_ids = [row.report_id]
+        batch.append(row)
+        if len(batch) >= 1000:
+            ServiceDispatchNotification.objects.bulk_update(batch, ["report_ids"])
+            batch = []
+    if batch:
+        ServiceDispatchNotification.objects.bulk_update(batch, ["report_ids"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth_app", "0014_servicedispatchnotification_report_fk"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="servicedispatchnotification",
+            name="report_ids",
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.RunPython(fill_report_ids, migrations.RunPython.noop),
+    ]
@@ -52,7 +52,22 @@ class ServiceDispatchNotification(models.Model):
         related_name="dispatch_notifications",
         db_column="svc_id",
     )
-    report_id = models.IntegerField()
+    # No database constraint: the report may have moved to incident_reports_archive since.
+    report = models.ForeignKey(
+        "reports.IncidentReport",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="dispatch_notifications",
+        db_column="report_id",
+        null=True,
+    )
+    # Incident cluster the alert covers. Repeat dispatches to the same service for the same cluster
+    # within the suppression window are merged into this row instead of sending another SMS.
+    cluster_id = models.IntegerField(blank=True, null=True)
+    report_count = models.IntegerField(default=1)
+    # Every report the alert covers: the dispatched ones plus those merged in later. Completing the
+    # alert closes all of them.
+    report_ids = models.JSONField(default=list, blank=True)
     incident_type = models.CharField(max_length=20)
     barangay = models.CharField(max_length=255, blank=True, null=True)
     location_text = models.CharField(max_length=500, blank=True, null=True)
@@ -60,10 +75,52 @@ class ServiceDispatchNotification(models.Model):
     sms_sent = models.BooleanField(default=False)
     sms_error = models.CharField(max_length=500, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         managed = True
         db_table = "service_dispatch_notifications"
+        indexes = [
+            models.Index(fields=["service", "cluster_id", "-created_at"], name="dispatch_suppression_idx"),
+            models.Index(fields=["service", "-created_at", "-dispatch_id"], name="dispatch_feed_idx"),
+        ]
+
+
+class SmsOutbox(models.Model):
+    # Written in the dispatch transaction and drained by the sms_worker command.
+    STATUS_CHOICES = (
+        ("Queued", "Queued"),
+        ("Sending", "Sending"),
+        ("Sent", "Sent"),
+        ("Failed", "Failed"),
+    )
+
+    outbox_id = models.AutoField(primary_key=True)
+    notification = models.ForeignKey(
+        ServiceDispatchNotification,
+        on_delete=models.CASCADE,
+        related_name="sms_messages",
+        db_column="dispatch_id",
+        blank=True,
+        null=True,
+    )
+    phone = models.CharField(max_length=32)
+    message = models.TextField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="Queued")
+    attempts = models.IntegerField(default=0)
+    # When a Queued row is due, or when a Sending row's claim expires and it may be taken again.
+    next_attempt_at = models.DateTimeField()
+    last_error = models.CharField(max_length=500, blank=True, null=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        managed = True
+        db_table = "sms_outbox"
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="sms_outbox_due_idx"),
+        ]
 
 
 class UserProfileAvatar(models.Model):
@@ -78,3 +135,34 @@ class UserProfileAvatar(models.Model):
         managed = True
         db_table = "user_profile_avatars"
         unique_together = ("role", "email")
+
+
+class MediaVariant(models.Model):
+    variant_id = models.AutoField(primary_key=True)
+    source_path = models.CharField(max_length=500, db_index=True)
+    variant = models.CharField(max_length=20)
+    path = models.CharField(max_length=500)
+    width = models.IntegerField()
+    height = models.IntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        managed = True
+        db_table = "media_variants"
+        unique_together = ("source_path", "variant")
+
+
+class MediaBlob(models.Model):
+    digest = models.CharField(max_length=64, primary_key=True)
+    path = models.CharField(max_length=500)
+    size = models.BigIntegerField(default=0)
+    ref_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        managed = True
+        db_table = "media_blobs"
+        indexes = [
+            models.Index(fields=["ref_count", "updated_at"], name="media_blob_gc_idx"),
+        ]
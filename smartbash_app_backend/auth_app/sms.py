@@ -0,0 +1,553 @@
+import base64
+import http.client
+import json
+import os
+import re
+import threading
+import time
+import urllib.parse
+from abc import ABC, abstractmethod
+from collections import deque
+from pathlib import Path
+
+# Message text for these errors will not change on a retry.
+PERMANENT_ERRORS = ("SMS provider not configured", "Service contact number missing")
+
+# Default failover order; SMS_PROVIDERS overrides it, SMS_PROVIDER only picks which one goes first.
+SMS_PROVIDER_ORDER = ("SEMAPHORE", "TWILIO", "JSON")
+SMS_TIMEOUT_SECONDS = float(os.environ.get("SMS_TIMEOUT_SECONDS", "5"))
+# A provider's circuit opens after this many failures in a row, or when at least half the
+# window (of the last SMS_BREAKER_WINDOW calls) is in and the failure rate reaches the threshold.
+SMS_BREAKER_FAILURES = int(os.environ.get("SMS_BREAKER_FAILURES", "3"))
+SMS_BREAKER_WINDOW = int(os.environ.get("SMS_BREAKER_WINDOW", "20"))
+SMS_BREAKER_ERROR_RATE = float(os.environ.get("SMS_BREAKER_ERROR_RATE", "0.5"))
+# Calls slower than this count as failures for the breaker even when the message went out.
+SMS_BREAKER_SLOW_SECONDS = float(os.environ.get("SMS_BREAKER_SLOW_SECONDS", "3"))
+# An open circuit fails fast for this long, then lets a single probe call through.
+SMS_BREAKER_COOLDOWN_SECONDS = float(os.environ.get("SMS_BREAKER_COOLDOWN_SECONDS", "30"))
+
+
+def normalize_phone_number(raw_phone: str | None) -> str:
+    phone = re.sub(r"[^0-9+]", "", (raw_phone or "").strip())
+    if not phone:
+        return ""
+    # PH local -> E.164
+    if phone.startswith("09") and len(phone) == 11:
+        return f"+63{phone[1:]}"
+    if phone.startswith("9") and len(phone) == 10:
+        return f"+63{phone}"
+    if phone.startswith("63") and len(phone) == 12:
+        return f"+{phone}"
+    if phone.startswith("+"):
+        return phone
+    return phone
+
+
+def normalize_phone_for_semaphore(raw_phone: str | None) -> str:
+    phone = normalize_phone_number(raw_phone)
+    digits = re.sub(r"[^0-9]", "", phone)
+    if not digits:
+        return ""
+    # Semaphore accepts local PH mobile format. Convert to 09XXXXXXXXX.
+    if digits.startswith("63") and len(digits) == 12:
+        return f"0{digits[2:]}"
+    if digits.startswith("9") and len(digits) == 10:
+        return f"0{digits}"
+    if digits.startswith("09") and len(digits) == 11:
+        return digits
+    return phone
+
+
+_ENV_PATH = Path(__file__).resolve().parents[1] / ".env"
+_env_cache: tuple[float, dict[str, str]] | None = None
+_env_lock = threading.Lock()
+
+
+def _env_file_values() -> dict[str, str]:
+    # Parsed once per change of the file instead of re-read for every lookup.
+    global _env_cache
+    try:
+        mtime = _ENV_PATH.stat().st_mtime
+    except OSError:
+        return {}
+    with _env_lock:
+        if _env_cache and _env_cache[0] == mtime:
+            return _env_cache[1]
+        values = {}
+        try:
+            for line in _ENV_PATH.read_text(encoding="utf-8").splitlines():
+                raw = line.strip()
+                if not raw or raw.startswith("#") or "=" not in raw:
+                    continue
+                k, v = raw.split("=", 1)
+                values.setdefault(k.strip(), v.strip().strip('"').strip("'"))
+        except Exception:
+            values = {}
+        _env_cache = (mtime, values)
+        return values
+
+
+def read_env_file_value(key: str) -> str:
+    return _env_file_values().get(key, "")
+
+
+def get_env_value(*keys: str) -> str:
+    for key in keys:
+        value = (os.environ.get(key) or "").strip()
+        if value:
+            return value
+    for key in keys:
+        value = read_env_file_value(key).strip()
+        if value:
+            return value
+    return ""
+
+
+class SmsHttpClient:
+    # Keep-alive connections reused across messages: one per host and thread, so the TLS
+    # handshake is paid once per worker rather than once per text.
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connections(self) -> dict:
+        if not hasattr(self._local, "connections"):
+            self._local.connections = {}
+        return self._local.connections
+
+    def _drop(self, key):
+        connection = self._connections().pop(key, None)
+        if connection:
+            connection.close()
+
+    def post(self, url: str, body: bytes, headers: dict) -> tuple[int, str]:
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        path = parts.path or "/"
+        if parts.query:
+            path += f"?{parts.query}"
+        connections = self._connections()
+        for attempt in range(2):
+            reused = key in connections
+            if not reused:
+                connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+                connections[key] = connection_class(parts.netloc, timeout=self.timeout)
+            connection = connections[key]
+            try:
+                connection.request("POST", path, body=body, headers=headers)
+                response = connection.getresponse()
+                text = response.read().decode("utf-8", errors="ignore")
+            except (http.client.RemoteDisconnected, http.client.CannotSendRequest, ConnectionResetError, BrokenPipeError):
+                self._drop(key)
+                # An idle keep-alive connection closed by the server; retry once on a fresh one.
+                if reused and attempt == 0:
+                    continue
+                raise
+            except Exception:
+                self._drop(key)
+                raise
+            if response.will_close:
+                self._drop(key)
+            return response.status, text
+        raise http.client.HTTPException("unreachable")
+
+
+class CircuitBreaker:
+    # Per-provider health: closed (normal), open (fail fast until the cooldown ends) and
+    # half_open (one probe call decides whether to close again or reopen).
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: deque[tuple[bool, float]] = deque(maxlen=SMS_BREAKER_WINDOW)
+        self._failures_in_row = 0
+        self._state = "closed"
+        self._opened_at = 0.0
+        self._probing = False
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == "closed":
+                return True
+            if self._state == "open":
+                if time.monotonic() - self._opened_at < SMS_BREAKER_COOLDOWN_SECONDS:
+                    return False
+                self._state = "half_open"
+                self._probing = False
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record(self, ok: bool, seconds: float):
+        healthy = ok and seconds < SMS_BREAKER_SLOW_SECONDS
+        with self._lock:
+            self._calls.append((healthy, seconds))
+            if self._state == "half_open":
+                self._probing = False
+                if healthy:
+                    self._state = "closed"
+                    self._failures_in_row = 0
+                    self._calls.clear()
+                else:
+                    self._open()
+                return
+            self._failures_in_row = 0 if healthy else self._failures_in_row + 1
+            if self._state == "closed" and self._tripped():
+                self._open()
+
+    def _tripped(self) -> bool:
+        if self._failures_in_row >= SMS_BREAKER_FAILURES:
+            return True
+        if len(self._calls) * 2 < self._calls.maxlen:
+            return False
+        failures = sum(1 for healthy, _ in self._calls if not healthy)
+        return failures / len(self._calls) >= SMS_BREAKER_ERROR_RATE
+
+    def _open(self):
+        self._state = "open"
+        self._opened_at = time.monotonic()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            latencies = sorted(seconds for _, seconds in self._calls)
+            failures = sum(1 for healthy, _ in self._calls if not healthy)
+            return {
+                "provider": self.name,
+                "state": self._state,
+                "calls": len(latencies),
+                "errorRate": round(failures / len(latencies), 3) if latencies else 0.0,
+                "avgMs": round(sum(latencies) / len(latencies) * 1000, 1) if latencies else None,
+                "p95Ms": round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 1) if latencies else None,
+            }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker_for(kind: str) -> CircuitBreaker:
+    # Health outlives provider objects, which are rebuilt whenever the configuration changes.
+    with _breakers_lock:
+        if kind not in _breakers:
+            _breakers[kind] = CircuitBreaker(kind)
+        return _breakers[kind]
+
+
+class SmsProvider(ABC):
+    kind = "JSON"
+    name = "SMS"
+
+    def __init__(self, client: SmsHttpClient):
+        self.client = client
+        self.breaker = breaker_for(self.kind)
+
+    def config_error(self) -> str | None:
+        return None
+
+    def normalize(self, raw_phone: str | None) -> str:
+        return normalize_phone_number(raw_phone)
+
+    def send_many(self, messages: list[tuple[str | None, str]]) -> list[tuple[bool, str | None]]:
+        # [(phone, text)] -> [(sent, error)] in the same order. Recipients sharing a text go out together.
+        error = self.config_error()
+        if error:
+            return [(False, error)] * len(messages)
+        results: list[tuple[bool, str | None] | None] = [None] * len(messages)
+        by_text: dict[str, list[tuple[int, str]]] = {}
+        for index, (raw_phone, text) in enumerate(messages):
+            phone = self.normalize(raw_phone)
+            if not phone:
+                results[index] = (False, "Service contact number missing")
+                continue
+            by_text.setdefault(text, []).append((index, phone))
+        for text, recipients in by_text.items():
+            outcomes = self.send_bulk([phone for _, phone in recipients], text)
+            for (index, _), outcome in zip(recipients, outcomes):
+                results[index] = outcome
+        return results
+
+    def send_bulk(self, phones: list[str], text: str) -> list[tuple[bool, str | None]]:
+        return [self.send_one(phone, text) for phone in phones]
+
+    @abstractmethod
+    def send_one(self, phone: str, text: str) -> tuple[bool, str | None]:
+        ...
+
+    def _post(self, url: str, body: bytes, headers: dict) -> tuple[int | None, str]:
+        # Every provider call goes through the breaker: an open circuit costs no network round trip.
+        if not self.breaker.allow():
+            return None, f"{self.name} unavailable: circuit open"
+        started = time.monotonic()
+        try:
+            status, text = self.client.post(url, body, headers)
+        except (OSError, http.client.HTTPException) as exc:
+            self.breaker.record(False, time.monotonic() - started)
+            return None, f"{self.name} URL error: {exc}"
+        # Rejections of a single request (4xx) say nothing about the gateway's health.
+        self.breaker.record(status < 500 and status != 429, time.monotonic() - started)
+        return status, text
+
+
+class SemaphoreProvider(SmsProvider):
+    kind = "SEMAPHORE"
+    name = "Semaphore"
+    # Semaphore accepts up to 1000 comma-separated numbers per request.
+    BULK_LIMIT = 1000
+
+    def __init__(self, client: SmsHttpClient, api_key: str, api_url: str, sender_name: str):
+        super().__init__(client)
+        self.api_key = api_key
+        self.api_url = api_url
+        self.sender_name = sender_name
+
+    def config_error(self) -> str | None:
+        if not self.api_key:
+            return "SMS provider not configured: missing SEMAPHORE_API_KEY"
+        if not self.api_url:
+            return "SMS provider not configured: missing SEMAPHORE_API_URL"
+        return None
+
+    def normalize(self, raw_phone: str | None) -> str:
+        return normalize_phone_for_semaphore(raw_phone)
+
+    def send_one(self, phone: str, text: str) -> tuple[bool, str | None]:
+        return self._send_chunk([phone], text)[0]
+
+    def send_bulk(self, phones: list[str], text: str) -> list[tuple[bool, str | None]]:
+        results = []
+        for start in range(0, len(phones), self.BULK_LIMIT):
+            results.extend(self._send_chunk(phones[start:start + self.BULK_LIMIT], text))
+        return results
+
+    def _send_chunk(self, phones: list[str], text: str) -> list[tuple[bool, str | None]]:
+        form_data = {"apikey": self.api_key, "number": ",".join(phones), "message": text}
+        if self.sender_name:
+            form_data["sendername"] = self.sender_name
+        status, body = self._submit(form_data)
+        # If configured sender name is not active yet, retry once without sendername.
+        if self.sender_name and status is not None and status >= 300 and "No active sender name found" in body:
+            form_data.pop("sendername")
+            status, body = self._submit(form_data)
+        if status is None:
+            return [(False, body)] * len(phones)
+        if not 200 <= status < 300:
+            return [(False, f"Semaphore HTTP {status}: {body[:200]}")] * len(phones)
+        return self._recipient_outcomes(phones, body)
+
+    def _submit(self, form_data: dict) -> tuple[int | None, str]:
+        return self._post(
+            self.api_url,
+            urllib.parse.urlencode(form_data).encode("utf-8"),
+            {"Content-Type": "application/x-www-form-urlencoded"},
+        )
+
+    @staticmethod
+    def _recipient_outcomes(phones: list[str], body: str) -> list[tuple[bool, str | None]]:
+        # The response lists one message per recipient; a recipient Semaphore marked Failed is reported per number.
+        try:
+            rows = json.loads(body)
+        except ValueError:
+            rows = None
+        if not isinstance(rows, list):
+            return [(True, None)] * len(phones)
+        failed = {}
+        for row in rows:
+            if not isinstance(row, dict):
+                continue
+            status = str(row.get("status") or "")
+            if status.lower() in ("failed", "refunded"):
+                failed[re.sub(r"[^0-9]", "", str(row.get("recipient") or ""))[-10:]] = f"Semaphore status {status}"
+        outcomes = []
+        for phone in phones:
+            error = failed.get(re.sub(r"[^0-9]", "", phone)[-10:])
+            outcomes.append((False, error) if error else (True, None))
+        return outcomes
+
+
+class TwilioProvider(SmsProvider):
+    kind = "TWILIO"
+    name = "Twilio"
+
+    def __init__(
+        self,
+        client: SmsHttpClient,
+        account_sid: str,
+        auth_token: str,
+        from_number: str,
+        messaging_service_sid: str,
+        api_url: str,
+    ):
+        super().__init__(client)
+        self.api_url = api_url.rstrip("/")
+        self.account_sid = account_sid
+        self.auth_token = auth_token
+        self.from_number = from_number
+        self.messaging_service_sid = messaging_service_sid
+
+    def config_error(self) -> str | None:
+        if not self.account_sid or not self.auth_token:
+            return "SMS provider not configured: missing TWILIO_ACCOUNT_SID/TWILIO_AUTH_TOKEN"
+        if not self.from_number and not self.messaging_service_sid:
+            return "SMS provider not configured: missing TWILIO_FROM_NUMBER or TWILIO_MESSAGING_SERVICE_SID"
+        return None
+
+    def send_one(self, phone: str, text: str) -> tuple[bool, str | None]:
+        # Twilio has no multi-recipient send; the shared connection still saves a handshake per message.
+        form_data = {"To": phone, "Body": text}
+        if self.messaging_service_sid:
+            form_data["MessagingServiceSid"] = self.messaging_service_sid
+        else:
+            form_data["From"] = self.from_number
+        auth_token = base64.b64encode(f"{self.account_sid}:{self.auth_token}".encode("utf-8")).decode("ascii")
+        status, body = self._post(
+            f"{self.api_url}/2010-04-01/Accounts/{self.account_sid}/Messages.json",
+            urllib.parse.urlencode(form_data).encode("utf-8"),
+            {"Content-Type": "application/x-www-form-urlencoded", "Authorization": f"Basic {auth_token}"},
+        )
+        if status is None:
+            return False, body
+        if 200 <= status < 300:
+            return True, None
+        return False, f"Twilio HTTP {status}: {body[:200]}"
+
+
+class JsonApiProvider(SmsProvider):
+    kind = "JSON"
+    name = "SMS"
+
+    def __init__(self, client: SmsHttpClient, api_url: str, api_key: str):
+        super().__init__(client)
+        self.api_url = api_url
+        self.api_key = api_key
+
+    def config_error(self) -> str | None:
+        if not self.api_url or not self.api_key:
+            return "SMS provider not configured"
+        return None
+
+    def send_one(self, phone: str, text: str) -> tuple[bool, str | None]:
+        status, body = self._post(
+            self.api_url,
+            json.dumps({"to": phone, "message": text}).encode("utf-8"),
+            {"Content-Type": "application/json", "Authorization": f"Bearer {self.api_key}"},
+        )
+        if status is None:
+            return False, body
+        if 200 <= status < 300:
+            return True, None
+        return False, f"SMS HTTP {status}"
+
+
+class ProviderChain:
+    # Tries providers in order; a message one provider could not send moves on to the next.
+
+    def __init__(self, providers: list[SmsProvider]):
+        self.providers = providers
+
+    def send_many(self, messages: list[tuple[str | None, str]]) -> list[tuple[bool, str | None]]:
+        results: list[tuple[bool, str | None]] = [(False, "SMS provider not configured")] * len(messages)
+        errors: dict[int, list[str]] = {}
+        pending = list(range(len(messages)))
+        for provider in self.providers:
+            if not pending:
+                break
+            outcomes = provider.send_many([messages[index] for index in pending])
+            retry = []
+            for index, (sent, error) in zip(pending, outcomes):
+                if sent:
+                    results[index] = (True, None)
+                    continue
+                errors.setdefault(index, []).append(error or f"{provider.name} send failed")
+                results[index] = (False, "; ".join(errors[index]))
+                if not is_permanent_error(error):
+                    retry.append(index)
+            pending = retry
+        return results
+
+    def health(self) -> list[dict]:
+        return [provider.breaker.snapshot() for provider in self.providers]
+
+
+_chains: dict[tuple, ProviderChain] = {}
+_chains_lock = threading.Lock()
+
+
+def _chain_order() -> list[str]:
+    aliases = {"GENERIC": "JSON"}
+    configured = [
+        aliases.get(kind.strip().upper(), kind.strip().upper())
+        for kind in get_env_value("SMS_PROVIDERS").split(",")
+        if kind.strip()
+    ]
+    if configured:
+        return [kind for kind in dict.fromkeys(configured) if kind in SMS_PROVIDER_ORDER]
+    primary = (get_env_value("SMS_PROVIDER") or "SEMAPHORE").strip().upper()
+    primary = aliases.get(primary, primary if primary in SMS_PROVIDER_ORDER else "JSON")
+    return [primary] + [kind for kind in SMS_PROVIDER_ORDER if kind != primary]
+
+
+def _provider_config(kind: str, primary: bool) -> tuple:
+    if kind == "SEMAPHORE":
+        # The generic SMS_API_* settings only stand in for Semaphore's own when it is the first
+        # choice; as a fallback they belong to the generic provider.
+        key_names = ("SEMAPHORE_API_KEY", "SMS_API_KEY") if primary else ("SEMAPHORE_API_KEY",)
+        url_names = ("SEMAPHORE_API_URL", "SMS_API_URL") if primary else ("SEMAPHORE_API_URL",)
+        return (
+            kind,
+            get_env_value(*key_names),
+            get_env_value(*url_names) or "https://api.semaphore.co/api/v4/messages",
+            get_env_value("SEMAPHORE_SENDER_NAME"),
+        )
+    if kind == "TWILIO":
+        return (
+            kind,
+            get_env_value("TWILIO_ACCOUNT_SID"),
+            get_env_value("TWILIO_AUTH_TOKEN"),
+            get_env_value("TWILIO_FROM_NUMBER"),
+            get_env_value("TWILIO_MESSAGING_SERVICE_SID"),
+            get_env_value("TWILIO_API_URL") or "https://api.twilio.com",
+        )
+    return ("JSON", get_env_value("SMS_API_URL"), get_env_value("SMS_API_KEY"))
+
+
+def _build_provider(config: tuple) -> SmsProvider:
+    kind, *settings = config
+    client = SmsHttpClient(timeout=SMS_TIMEOUT_SECONDS)
+    if kind == "SEMAPHORE":
+        return SemaphoreProvider(client, *settings)
+    if kind == "TWILIO":
+        return TwilioProvider(client, *settings)
+    return JsonApiProvider(client, *settings)
+
+
+def get_provider() -> ProviderChain:
+    # One long-lived chain (and connection pools) per configuration; a changed setting gets a new one.
+    # Providers without credentials are left out; with none configured the first one reports why.
+    configs = tuple(_provider_config(kind, position == 0) for position, kind in enumerate(_chain_order()))
+    with _chains_lock:
+        chain = _chains.get(configs)
+        if chain is None:
+            providers = [_build_provider(config) for config in configs]
+            ready = [provider for provider in providers if provider.config_error() is None]
+            chain = ProviderChain(ready or providers[:1])
+            _chains.clear()
+            _chains[configs] = chain
+        return chain
+
+
+def provider_health() -> list[dict]:
+    return get_provider().health()
+
+
+def send_messages(messages: list[tuple[str | None, str]]) -> list[tuple[bool, str | None]]:
+    return get_provider().send_many(messages)
+
+
+def send_sms(raw_phone: str | None, message_text: str) -> tuple[bool, str | None]:
+    return send_messages([(raw_phone, message_text)])[0]
+
+
+def is_permanent_error(error: str | None) -> bool:
+    return bool(error) and error.startswith(PERMANENT_ERRORS)
@@ -0,0 +1,153 @@
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .events import publish_on_commit, service_topic
+from .models import ServiceDispatchNotification, SmsOutbox
+from .sms import is_permanent_error, provider_health, send_messages
+
+SMS_WORKERS = int(os.environ.get("SMS_WORKERS", "4"))
+SMS_MAX_ATTEMPTS = int(os.environ.get("SMS_MAX_ATTEMPTS", "5"))
+SMS_RETRY_BASE_SECONDS = float(os.environ.get("SMS_RETRY_BASE_SECONDS", "15"))
+SMS_RETRY_MAX_SECONDS = float(os.environ.get("SMS_RETRY_MAX_SECONDS", "900"))
+# A claimed row whose worker died is picked up again after this long.
+SMS_CLAIM_SECONDS = int(os.environ.get("SMS_CLAIM_SECONDS", "120"))
+
+
+def _outbox_row(notification: ServiceDispatchNotification | None, phone: str | None, message: str) -> SmsOutbox:
+    return SmsOutbox(
+        notification=notification,
+        phone=(phone or "").strip()[:32],
+        message=message,
+        next_attempt_at=timezone.now(),
+    )
+
+
+def enqueue_sms(notification: ServiceDispatchNotification | None, phone: str | None, message: str) -> SmsOutbox:
+    # Call inside the dispatch transaction: the message exists exactly when the notification does.
+    row = _outbox_row(notification, phone, message)
+    row.save()
+    return row
+
+
+def enqueue_many(items) -> int:
+    # items: (notification, phone, message); one INSERT for a whole dispatch.
+    rows = SmsOutbox.objects.bulk_create([_outbox_row(*item) for item in items])
+    return len(rows)
+
+
+def retry_delay(attempts: int) -> float:
+    # Exponential backoff with jitter so a provider outage is not hammered in lockstep.
+    delay = min(SMS_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0)), SMS_RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def claim_batch(limit: int, scope: dict | None = None) -> list[SmsOutbox]:
+    # SKIP LOCKED lets any number of workers (threads or processes) claim disjoint rows.
+    # scope narrows the claim with extra filters (the dispatch benchmark drains only its own rows).
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            SmsOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status__in=("Queued", "Sending"), next_attempt_at__lte=now, **(scope or {}))
+            .order_by("next_attempt_at")[:limit]
+        )
+        if rows:
+            SmsOutbox.objects.filter(pk__in=[row.pk for row in rows]).update(
+                status="Sending",
+                next_attempt_at=now + timedelta(seconds=SMS_CLAIM_SECONDS),
+                updated_at=now,
+            )
+    return rows
+
+
+def record_result(row: SmsOutbox, sent: bool, error: str | None):
+    now = timezone.now()
+    row.attempts += 1
+    row.last_error = (error or "")[:500] or None
+    if sent:
+        row.status = "Sent"
+        row.sent_at = now
+    elif row.attempts >= SMS_MAX_ATTEMPTS or is_permanent_error(error):
+        row.status = "Failed"
+    else:
+        row.status = "Queued"
+        row.next_attempt_at = now + timedelta(seconds=retry_delay(row.attempts))
+
+    with transaction.atomic():
+        row.save(update_fields=["status", "attempts", "last_error", "sent_at", "next_attempt_at", "updated_at"])
+        if row.notification_id:
+            # Retries in flight still surface the latest error on the service dashboard.
+            ServiceDispatchNotification.objects.filter(pk=row.notification_id).update(
+                sms_sent=sent,
+                sms_error=None if sent else row.last_error,
+                updated_at=now,
+            )
+            service_id = (
+                ServiceDispatchNotification.objects.filter(pk=row.notification_id)
+                .values_list("service_id", flat=True)
+                .first()
+            )
+            if service_id:
+                publish_on_commit(service_topic(service_id))
+
+
+def deliver(rows: list[SmsOutbox]) -> list[bool]:
+    # Runs on a pool thread, which owns its own DB connection. Rows sharing a text go to the
+    # provider together so it can send them as one bulk request.
+    try:
+        try:
+            outcomes = send_messages([(row.phone, row.message) for row in rows])
+        except Exception as exc:
+            outcomes = [(False, f"SMS send error: {exc}")] * len(rows)
+        for row, (sent, error) in zip(rows, outcomes):
+            record_result(row, sent, error)
+        return [sent for sent, _ in outcomes]
+    finally:
+        close_old_connections()
+
+
+def _describe_health(health: dict) -> str:
+    latency = f", p95 {health['p95Ms']} ms" if health["p95Ms"] is not None else ""
+    return f"{health['provider']} {health['state']} ({health['errorRate']:.0%} errors over {health['calls']} calls{latency})"
+
+
+def _group_by_message(rows: list[SmsOutbox]) -> list[list[SmsOutbox]]:
+    groups: dict[str, list[SmsOutbox]] = {}
+    for row in rows:
+        groups.setdefault(row.message, []).append(row)
+    return list(groups.values())
+
+
+def drain(
+    workers: int = SMS_WORKERS,
+    batch_size: int | None = None,
+    poll_interval: float = 2.0,
+    once: bool = False,
+    log=None,
+    scope: dict | None = None,
+):
+    # Claims up to batch_size due rows at a time and sends them on a thread pool; SMS sending is I/O bound.
+    batch_size = batch_size or workers * 2
+    totals = {"sent": 0, "failed": 0}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sms") as pool:
+        while True:
+            rows = claim_batch(batch_size, scope)
+            if not rows:
+                if once:
+                    break
+                close_old_connections()
+                time.sleep(poll_interval)
+                continue
+            for outcomes in pool.map(deliver, _group_by_message(rows)):
+                for sent in outcomes:
+                    totals["sent" if sent else "failed"] += 1
+            if log:
+                log(f"Processed {len(rows)} messages ({totals['sent']} sent, {totals['failed']} not sent so far).")
+                log("Providers: " + ", ".join(_describe_health(health) for health in provider_health()))
+    return totals
@@ -20,6 +20,8 @@ from .views import (
     officials_dashboard,
     officials_reports_recent,
     officials_reports_all,
+    officials_reports_export,
+    officials_report_detail,
     officials_incidents_map,
     officials_reports_dispatch,
     officials_reports_dispatch_all,
@@ -30,12 +32,16 @@ from .views import (
     officials_password_update,
     services_dispatch_notifications,
     services_dispatch_complete,
+    services_dispatch_stream,
+    officials_stream,
     services_profile,
     services_profile_update,
     services_profile_avatar_update,
     services_password_update,
+    residents_incidents_batch,
     residents_incidents_create,
     residents_incidents_my,
+    residents_incident_detail,
     residents_newsfeed_create,
     residents_newsfeed_list,
     residents_newsfeed_interest,
@@ -73,22 +79,28 @@ urlpatterns = [
     path("officials/dashboard/", officials_dashboard, name="officials_dashboard"),
     path("officials/reports/recent/", officials_reports_recent, name="officials_reports_recent"),
     path("officials/reports/all/", officials_reports_all, name="officials_reports_all"),
+    path("officials/reports/export/", officials_reports_export, name="officials_reports_export"),
+    path("officials/reports/detail/", officials_report_detail, name="officials_report_detail"),
     path("officials/incidents/map/", officials_incidents_map, name="officials_incidents_map"),
     path("officials/reports/dispatch/", officials_reports_dispatch, name="officials_reports_dispatch"),
     path("officials/reports/dispatch-all/", officials_reports_dispatch_all, name="officials_reports_dispatch_all"),
     path("officials/notifications/", officials_notifications, name="officials_notifications"),
+    path("officials/stream/", officials_stream, name="officials_stream"),
     path("officials/profile/", officials_profile, name="officials_profile"),
     path("officials/profile/update/", officials_profile_update, name="officials_profile_update"),
     path("officials/profile/avatar/", officials_profile_avatar_update, name="officials_profile_avatar_update"),
     path("officials/profile/password/", officials_password_update, name="officials_password_update"),
     path("services/dispatches/", services_dispatch_notifications, name="services_dispatch_notifications"),
     path("services/dispatches/complete/", services_dispatch_complete, name="services_dispatch_complete"),
+    path("services/dispatches/stream/", services_dispatch_stream, name="services_dispatch_stream"),
     path("services/profile/", services_profile, name="services_profile"),
     path("services/profile/update/", services_profile_update, name="services_profile_update"),
     path("services/profile/avatar/", services_profile_avatar_update, name="services_profile_avatar_update"),
     path("services/profile/password/", services_password_update, name="services_password_update"),
     path("residents/incidents/create/", residents_incidents_create, name="residents_incidents_create"),
+    path("residents/incidents/batch/", residents_incidents_batch, name="residents_incidents_batch"),
     path("residents/incidents/my/", residents_incidents_my, name="residents_incidents_my"),
+    path("residents/incidents/detail/", residents_incident_detail, name="residents_incident_detail"),
     path("residents/newsfeed/create/", residents_newsfeed_create, name="residents_newsfeed_create"),
     path("residents/newsfeed/list/", residents_newsfeed_list, name="residents_newsfeed_list"),
     path("residents/newsfeed/interest/", residents_newsfeed_interest, name="residents_newsfeed_interest"),
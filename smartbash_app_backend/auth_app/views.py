@@ -5,23 +5,62 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework.exceptions import AuthenticationFailed
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
 from residents.models import Resident, Admin, Role
+from residents import gazetteer
 from django.db.utils import ProgrammingError
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.db.models import Count
+from django.db.models import Max
 from django.db.models import Q
 from django.core.files.storage import default_storage
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from .models import AdminNotification, ProofOfAuthority, ServiceDispatchNotification, UserProfileAvatar
-from reports.models import IncidentReport, NewsFeedPost
+from .image_variants import delete_variants, schedule_variants, variant_paths
+from . import media_store
+from .sms import normalize_phone_number
+from .sms_outbox import enqueue_many
+from .events import INCIDENTS_TOPIC, broker, publish_on_commit, service_topic
+from services.routing import routing_table
+from reports.models import BarangayIncidentCounter, IncidentCluster, IncidentReport, IncidentReportArchive, NewsFeedPost
+from reports.clusters import attach_report_to_cluster, close_reports_in_clusters, reopen_reports_in_clusters
+from reports.dedup import (
+    DUPLICATE_WINDOW_MINUTES,
+    find_duplicate_parent,
+    nearest_report,
+    record_duplicate,
+    same_barangay,
+    with_duplicates,
+)
+from reports.counters import counter_summary, record_report_created, record_status_changes, summarize_reports
+from reports.images import is_data_url, is_storage_key, release_incident_images, save_data_url, store_incident_images
+from reports.export import (
+    EXPORT_FORMATS,
+    export_chunks,
+    export_filename,
+    filter_export_range,
+    gzip_chunks,
+    parse_export_range,
+)
+from reports.geohash import (
+    encode_geohash,
+    geohash_cells_for_bbox,
+    geohash_precision_for_zoom,
+    parse_bbox,
+)
 import os
 import json
-import urllib.request
-import urllib.error
-import urllib.parse
-import re
+import asyncio
+import time
 import base64
-from pathlib import Path
+import hashlib
+import heapq
+from datetime import datetime, timedelta, timezone as dt_timezone
 
 
 @api_view(['POST'])
@@ -66,6 +105,7 @@ def signup(request):
                     res_password=user.password,
                     res_role=role_obj,
                     res_location=data.get('location', ''),
+                    barangay_ref_id=gazetteer.resolve(data.get('location')),
                     res_is_active=False,
                     res_is_deleted=False,
                 )
@@ -85,6 +125,7 @@ def signup(request):
                     svc_contact_number=data.get('contact') or data.get('contactNo'),
                     svc_password=user.password,
                     svc_location=data.get('location') or '',
+                    barangay_ref_id=gazetteer.resolve(data.get('location')),
                     svc_description=normalized_service_type,
                     svc_is_active=False,
                     svc_is_deleted=False,
@@ -111,13 +152,15 @@ def signup(request):
             elif role == "BrgyOfficials":
                 from officials.models import BrgyOfficial
                 official_name = data.get('name') or data.get('barangayName') or f"{data.get('firstName','')} {data.get('lastName','')}".strip() or email
+                official_barangay = data.get('barangayName') or data.get('location') or ''
                 official = BrgyOfficial.objects.create(
                     official_name=official_name,
                     official_email_address=email,
                     official_contact_number=data.get('contact') or data.get('contactNo'),
                     official_password=user.password,
                     official_position=data.get('position') or '',
-                    official_barangay=data.get('barangayName') or data.get('location') or '',
+                    official_barangay=official_barangay,
+                    barangay_ref_id=gazetteer.resolve(official_barangay),
                     official_is_active=False,
                     official_is_deleted=False,
                 )
@@ -144,8 +187,8 @@ def signup(request):
 
             # Save proof file to uploads/ if provided (file not linked to models due to schema)
             if proof_file:
-                upload_dir = "uploads/proofs"
-                filename = default_storage.save(os.path.join(upload_dir, proof_file.name), proof_file)
+                filename = media_store.store_upload(proof_file)
+                schedule_variants(filename)
                 try:
                     ProofOfAuthority.objects.create(
                         file_path=filename,
@@ -308,29 +351,43 @@ def _get_service_for_request(request):
         return None
 
 
-def _service_notification_payload(item: ServiceDispatchNotification) -> dict:
-    lat = None
-    lng = None
-    description = ""
+SERVICE_NOTIFICATION_COLUMNS = (
+    "dispatch_id", "service_id", "report", "report_count", "report_ids", "incident_type", "barangay", "location_text",
+    "status", "sms_sent", "sms_error", "created_at", "updated_at",
+    "report__lat", "report__lng", "report__description", "report__location_text",
+)
+SERVICE_REPORT_COLUMNS = ("report_id", "lat", "lng", "description", "location_text")
+
+
+def _service_notification_rows(queryset) -> list[tuple[ServiceDispatchNotification, object]]:
+    # (notification, report) pairs: live reports come in the same query via the join, archived ones in
+    # one more batched lookup; either way only the columns the payload shows are read.
+    rows = list(queryset.select_related("report").only(*SERVICE_NOTIFICATION_COLUMNS))
+    missing = {item.report_id for item in rows if item.report is None and item.report_id}
+    archived = {}
+    if missing:
+        archived = {
+            report.report_id: report
+            for report in IncidentReportArchive.objects.filter(report_id__in=missing).only(*SERVICE_REPORT_COLUMNS)
+        }
+    return [(item, item.report or archived.get(item.report_id)) for item in rows]
+
+
+def _service_notification_payload(item: ServiceDispatchNotification, report=None) -> dict:
     location = item.location_text or ""
-    try:
-        report = IncidentReport.objects.filter(report_id=item.report_id).first()
-        if report:
-            lat = report.lat
-            lng = report.lng
-            description = report.description or ""
-            location = report.location_text or location
-    except Exception:
-        pass
+    if report is not None:
+        location = report.location_text or location
     return {
         "id": item.dispatch_id,
         "reportId": item.report_id,
+        "reportCount": item.report_count,
+        "reportIds": _dispatch_report_ids(item),
         "incidentType": item.incident_type,
         "barangay": item.barangay or "",
         "location": location,
-        "description": description,
-        "lat": lat,
-        "lng": lng,
+        "description": (report.description or "") if report is not None else "",
+        "lat": report.lat if report is not None else None,
+        "lng": report.lng if report is not None else None,
         "status": item.status,
         "smsSent": item.sms_sent,
         "smsError": item.sms_error or "",
@@ -376,7 +433,18 @@ def _avatar_key(role: str, email: str | None) -> tuple[str, str]:
     return role.strip(), (email or "").strip().lower()
 
 
-def _get_avatar_url(request, role: str, email: str | None) -> str | None:
+def _media_url(request, value: str | None, variants: dict[str, str] | None = None) -> str | None:
+    # Storage keys resolve to the rendered variant when there is one, else the original upload;
+    # data URLs and external URLs are returned untouched.
+    if not value:
+        return None
+    if not is_storage_key(value):
+        return value
+    path = (variants or {}).get(value, value)
+    return _absolute_url(request, default_storage.url(path))
+
+
+def _get_avatar_url(request, role: str, email: str | None, variant: str = "thumb") -> str | None:
     role_key, email_key = _avatar_key(role, email)
     if not role_key or not email_key:
         return None
@@ -384,7 +452,8 @@ def _get_avatar_url(request, role: str, email: str | None) -> str | None:
         avatar = UserProfileAvatar.objects.filter(role=role_key, email=email_key).first()
         if not avatar:
             return None
-        return _absolute_url(request, default_storage.url(avatar.image_path))
+        variants = variant_paths([avatar.image_path], variant)[variant]
+        return _media_url(request, avatar.image_path, variants)
     except Exception:
         return None
 
@@ -399,9 +468,8 @@ def _save_avatar_file(role: str, email: str, image_file) -> tuple[bool, str | No
     ext = os.path.splitext(image_file.name or "")[1].lower()
     if ext not in [".jpg", ".jpeg", ".png", ".webp"]:
         ext = ".jpg"
-    safe_email = re.sub(r"[^a-z0-9]+", "_", email_key)
-    filename = f"{role_key.lower()}_{safe_email}_{int(timezone.now().timestamp())}{ext}"
-    file_path = default_storage.save(os.path.join("uploads", "avatars", filename), image_file)
+    file_path = media_store.store_upload(image_file, ext)
+    schedule_variants(file_path)
 
     avatar, created = UserProfileAvatar.objects.get_or_create(
         role=role_key,
@@ -412,9 +480,11 @@ def _save_avatar_file(role: str, email: str, image_file) -> tuple[bool, str | No
         old_path = avatar.image_path
         avatar.image_path = file_path
         avatar.save(update_fields=["image_path", "updated_at"])
-        if old_path and old_path != file_path:
+        # Blobs are shared and left to gc_media_blobs; only legacy per-upload files are deleted here.
+        if old_path and not media_store.release(old_path) and old_path != file_path:
             try:
                 default_storage.delete(old_path)
+                delete_variants(old_path)
             except Exception:
                 pass
     return True, file_path, None
@@ -434,270 +504,21 @@ def _resident_full_name(resident: Resident) -> str:
     ).strip()
 
 
-def _normalize_barangay(value: str | None) -> str:
-    text = " ".join((value or "").lower().split())
-    text = re.sub(r"\bbarangay\b", "", text)
-    text = re.sub(r"\bbrgy\.?\b", "", text)
-    text = " ".join(text.split())
-    return text
-
-
-def _normalize_location_key(value: str | None) -> str:
-    text = (value or "").strip().lower()
-    # Normalize punctuation/spacing so same place text groups together reliably.
-    text = re.sub(r"[^a-z0-9]+", " ", text)
-    return " ".join(text.split())
-
-
-def _canonical_barangay(value: str | None) -> str:
-    normalized = _normalize_barangay(value)
-    if "pahina" in normalized and "san nicolas" in normalized:
-        return "pahina san nicolas"
-    if "duljo" in normalized and "fatima" in normalized:
-        return "duljo fatima"
-    if "cogon" in normalized and "pardo" in normalized:
-        return "cogon pardo"
-    if "bulacao" in normalized and "pardo" in normalized:
-        return "bulacao pardo"
-    return normalized
-
-
-def _barangay_key(value: str | None) -> str:
-    normalized = _normalize_barangay(value)
-    normalized = normalized.replace("barangay ", "", 1)
-    normalized = normalized.replace("brgy. ", "", 1).replace("brgy ", "", 1)
-    return " ".join(normalized.split())
-
-
-def _matches_official_barangay(official_barangay: str | None, resident_location: str | None) -> bool:
-    official_key = _barangay_key(official_barangay)
-    if not official_key:
+def _official_covers_resident(official, resident: Resident) -> bool:
+    if official.barangay_ref_id and resident.barangay_ref_id:
+        return official.barangay_ref_id == resident.barangay_ref_id
+    if not gazetteer.match(official.official_barangay):
         return True
-
-    resident_key = _barangay_key(resident_location)
-    if not resident_key:
-        return False
-
-    official_canonical = _canonical_barangay(official_key)
-    resident_canonical = _canonical_barangay(resident_key)
-
-    if official_key in resident_key or resident_key in official_key:
-        return True
-
-    if official_canonical == resident_canonical:
-        return True
-
-    if official_canonical and official_canonical in resident_canonical:
-        return True
-
-    if resident_canonical and resident_canonical in official_canonical:
-        return True
-
-    return False
-
-
-def _normalize_phone_number(raw_phone: str | None) -> str:
-    phone = re.sub(r"[^0-9+]", "", (raw_phone or "").strip())
-    if not phone:
-        return ""
-    # PH local -> E.164
-    if phone.startswith("09") and len(phone) == 11:
-        return f"+63{phone[1:]}"
-    if phone.startswith("9") and len(phone) == 10:
-        return f"+63{phone}"
-    if phone.startswith("63") and len(phone) == 12:
-        return f"+{phone}"
-    if phone.startswith("+"):
-        return phone
-    return phone
-
-
-def _normalize_phone_for_semaphore(raw_phone: str | None) -> str:
-    phone = _normalize_phone_number(raw_phone)
-    digits = re.sub(r"[^0-9]", "", phone)
-    if not digits:
-        return ""
-    # Semaphore accepts local PH mobile format. Convert to 09XXXXXXXXX.
-    if digits.startswith("63") and len(digits) == 12:
-        return f"0{digits[2:]}"
-    if digits.startswith("9") and len(digits) == 10:
-        return f"0{digits}"
-    if digits.startswith("09") and len(digits) == 11:
-        return digits
-    return phone
-
-
-def _read_env_file_value(key: str) -> str:
-    try:
-        env_path = Path(__file__).resolve().parents[1] / ".env"
-        if not env_path.exists():
-            return ""
-        for line in env_path.read_text(encoding="utf-8").splitlines():
-            raw = line.strip()
-            if not raw or raw.startswith("#") or "=" not in raw:
-                continue
-            k, v = raw.split("=", 1)
-            if k.strip() != key:
-                continue
-            value = v.strip().strip('"').strip("'")
-            return value
-    except Exception:
-        return ""
-    return ""
-
-
-def _get_env_value(*keys: str) -> str:
-    for key in keys:
-        value = (os.environ.get(key) or "").strip()
-        if value:
-            return value
-    for key in keys:
-        value = _read_env_file_value(key).strip()
-        if value:
-            return value
-    return ""
-
-
-def _send_dispatch_sms(service, message_text: str) -> tuple[bool, str | None]:
-    provider = (_get_env_value("SMS_PROVIDER") or "SEMAPHORE").strip().upper()
-
-    if provider == "SEMAPHORE":
-        semaphore_api_key = _get_env_value("SEMAPHORE_API_KEY", "SMS_API_KEY")
-        semaphore_api_url = _get_env_value("SEMAPHORE_API_URL", "SMS_API_URL") or "https://api.semaphore.co/api/v4/messages"
-        semaphore_sender_name = _get_env_value("SEMAPHORE_SENDER_NAME")
-        phone = _normalize_phone_for_semaphore(service.svc_contact_number)
-
-        if not semaphore_api_key:
-            return False, "SMS provider not configured: missing SEMAPHORE_API_KEY"
-        if not semaphore_api_url:
-            return False, "SMS provider not configured: missing SEMAPHORE_API_URL"
-        if not phone:
-            return False, "Service contact number missing"
-
-        def _post_semaphore(form_data: dict) -> tuple[bool, str | None]:
-            payload = urllib.parse.urlencode(form_data).encode("utf-8")
-            request = urllib.request.Request(
-                semaphore_api_url,
-                data=payload,
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-                method="POST",
-            )
-            try:
-                with urllib.request.urlopen(request, timeout=12) as response:
-                    body = response.read().decode("utf-8", errors="ignore")
-                    if 200 <= response.status < 300:
-                        return True, None
-                    return False, f"Semaphore HTTP {response.status}: {body[:200]}"
-            except urllib.error.HTTPError as exc:
-                try:
-                    err_body = exc.read().decode("utf-8", errors="ignore")
-                except Exception:
-                    err_body = ""
-                return False, f"Semaphore HTTP {exc.code}: {err_body[:200]}"
-            except urllib.error.URLError as exc:
-                return False, f"Semaphore URL error: {str(exc)}"
-
-        form_data = {
-            "apikey": semaphore_api_key,
-            "number": phone,
-            "message": message_text,
-        }
-        if semaphore_sender_name:
-            form_data["sendername"] = semaphore_sender_name
-
-        ok, err = _post_semaphore(form_data)
-        if ok:
-            return True, None
-        # If configured sender name is not active yet, retry once without sendername.
-        if semaphore_sender_name and err and "No active sender name found" in err:
-            fallback_data = {
-                "apikey": semaphore_api_key,
-                "number": phone,
-                "message": message_text,
-            }
-            ok2, err2 = _post_semaphore(fallback_data)
-            if ok2:
-                return True, None
-            return False, err2
-        return False, err
-
-    if provider == "TWILIO":
-        twilio_sid = _get_env_value("TWILIO_ACCOUNT_SID")
-        twilio_token = _get_env_value("TWILIO_AUTH_TOKEN")
-        twilio_from = _get_env_value("TWILIO_FROM_NUMBER")
-        twilio_messaging_service_sid = _get_env_value("TWILIO_MESSAGING_SERVICE_SID")
-        phone = _normalize_phone_number(service.svc_contact_number)
-
-        if not twilio_sid or not twilio_token:
-            return False, "SMS provider not configured: missing TWILIO_ACCOUNT_SID/TWILIO_AUTH_TOKEN"
-        if not twilio_from and not twilio_messaging_service_sid:
-            return False, "SMS provider not configured: missing TWILIO_FROM_NUMBER or TWILIO_MESSAGING_SERVICE_SID"
-        if not phone:
-            return False, "Service contact number missing"
-
-        twilio_url = f"https://api.twilio.com/2010-04-01/Accounts/{twilio_sid}/Messages.json"
-        form_data = {
-            "To": phone,
-            "Body": message_text,
-        }
-        if twilio_messaging_service_sid:
-            form_data["MessagingServiceSid"] = twilio_messaging_service_sid
-        else:
-            form_data["From"] = twilio_from
-
-        payload = urllib.parse.urlencode(form_data).encode("utf-8")
-        auth_token = base64.b64encode(f"{twilio_sid}:{twilio_token}".encode("utf-8")).decode("ascii")
-        request = urllib.request.Request(
-            twilio_url,
-            data=payload,
-            headers={
-                "Content-Type": "application/x-www-form-urlencoded",
-                "Authorization": f"Basic {auth_token}",
-            },
-            method="POST",
-        )
-        try:
-            with urllib.request.urlopen(request, timeout=12) as response:
-                body = response.read().decode("utf-8", errors="ignore")
-                if 200 <= response.status < 300:
-                    return True, None
-                return False, f"Twilio HTTP {response.status}: {body[:200]}"
-        except urllib.error.HTTPError as exc:
-            try:
-                err_body = exc.read().decode("utf-8", errors="ignore")
-            except Exception:
-                err_body = ""
-            return False, f"Twilio HTTP {exc.code}: {err_body[:200]}"
-        except urllib.error.URLError as exc:
-            return False, f"Twilio URL error: {str(exc)}"
-
-    sms_api_url = _get_env_value("SMS_API_URL")
-    sms_api_key = _get_env_value("SMS_API_KEY")
-    phone = _normalize_phone_number(service.svc_contact_number)
-    if not sms_api_url or not sms_api_key:
-        return False, "SMS provider not configured"
-    if not phone:
-        return False, "Service contact number missing"
-    payload = json.dumps({"to": phone, "message": message_text}).encode("utf-8")
-    request = urllib.request.Request(
-        sms_api_url,
-        data=payload,
-        headers={
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {sms_api_key}",
-        },
-        method="POST",
-    )
-    try:
-        with urllib.request.urlopen(request, timeout=10) as response:
-            if 200 <= response.status < 300:
-                return True, None
-            return False, f"SMS HTTP {response.status}"
-    except urllib.error.URLError as exc:
-        return False, str(exc)
+    return gazetteer.same_barangay(official.official_barangay, resident.res_location)
 
 
 def _matching_report_count(report: IncidentReport) -> int:
+    if report.cluster_id:
+        cluster_count = IncidentCluster.objects.filter(pk=report.cluster_id).values_list(
+            "report_count", flat=True
+        ).first()
+        if cluster_count:
+            return cluster_count
     location_text = (report.location_text or "").strip()
     if location_text:
         return IncidentReport.objects.filter(
@@ -713,53 +534,28 @@ def _matching_report_count(report: IncidentReport) -> int:
     return 1
 
 
-def _notify_services_for_report(report: IncidentReport, report_count: int | None = None) -> dict:
-    from services.models import Service
-
-    incident_type = (report.incident_type or "").strip()
-    services = Service.objects.filter(svc_is_active=True, svc_is_deleted=False)
-    if incident_type == "Fire":
-        services = services.filter(
-            Q(svc_description__iexact="Fire")
-            | Q(svc_description__icontains="fire")
-            | Q(svc_description__icontains="bfp")
-            | Q(svc_name__icontains="fire")
-            | Q(svc_name__icontains="bfp")
-        )
-    else:
-        services = services.filter(
-            Q(svc_description__iexact="Rescue")
-            | Q(svc_description__icontains="rescue")
-            | Q(svc_description__icontains="flood")
-            | Q(svc_description__icontains="ambulance")
-            | Q(svc_description__icontains="evac")
-            | Q(svc_name__icontains="rescue")
-            | Q(svc_name__icontains="flood")
-            | Q(svc_name__icontains="ambulance")
-            | Q(svc_name__icontains="evac")
-        )
-
+def _services_for_report(report: IncidentReport) -> list:
+    # In-process routing table (services.routing), kept current on service saves: the nearest capable
+    # services when the report has coordinates, plus the barangay's own services that have no
+    # coordinates yet (the nearest search cannot see those, and they must not drop out of dispatch).
+    services = []
+    if report.lat is not None and report.lng is not None:
+        services = [service for _, service in routing_table.nearest(report.incident_type, report.lat, report.lng)]
+    if (report.barangay or "").strip():
+        chosen = {service.svc_id for service in services}
+        local = routing_table.services_for(report.incident_type, report.barangay_ref_id, report.barangay)
+        services += [
+            service
+            for service in local
+            if service.svc_id not in chosen and (not services or service.svc_lat is None or service.svc_lng is None)
+        ]
+    return services
+
+
+def _dispatch_message(report: IncidentReport, report_count: int) -> str:
+    # The same text for every service alerted about the report, so the SMS worker can send it to all
+    # of them in one bulk request.
     barangay = (report.barangay or "").strip()
-    # Strict dispatch rule: notify only services in the same barangay.
-    # No cross-barangay fallback.
-    if not barangay:
-        return {
-            "servicesMatched": 0,
-            "notificationsCreated": 0,
-            "smsSent": 0,
-            "smsFailed": 0,
-        }
-    target_barangay = _normalize_barangay(barangay)
-    localized_services = []
-    for service in services:
-        service_location = _normalize_barangay(service.svc_location)
-        if not service_location or not target_barangay:
-            continue
-        if target_barangay in service_location or service_location in target_barangay:
-            localized_services.append(service)
-    services = localized_services
-
-    reports_in_cluster = report_count or _matching_report_count(report)
     services_login_url = os.environ.get("SERVICES_PORTAL_LOGIN_URL", "").strip()
     location_link = ""
     if report.lat is not None and report.lng is not None:
@@ -767,8 +563,7 @@ def _notify_services_for_report(report: IncidentReport, report_count: int | None
 
     message = (
         f"Smartbash Dispatch Alert\n"
-        f"Service: {{service_name}}\n"
-        f"Incident: {incident_type} ({reports_in_cluster} reports)\n"
+        f"Incident: {(report.incident_type or '').strip()} ({report_count} reports)\n"
         f"Barangay: {barangay or 'N/A'}\n"
         f"Location: {(report.location_text or '')[:120]}"
     )
@@ -776,56 +571,199 @@ def _notify_services_for_report(report: IncidentReport, report_count: int | None
         message += f"\nLocation Link: {location_link}"
     if services_login_url:
         message += f"\nLogin: {services_login_url}"
+    return message
+
+
+# A service gets one alert per incident cluster in this window; later dispatches merge into it.
+DISPATCH_SUPPRESSION_MINUTES = int(os.environ.get("DISPATCH_SUPPRESSION_MINUTES", "30"))
+
+
+def _suppression_key(service_id: int, cluster_id: int | None, report_id: int) -> tuple:
+    # Reports without a cluster are keyed by themselves, so re-dispatching one is still idempotent.
+    return (service_id, "cluster", cluster_id) if cluster_id else (service_id, "report", report_id)
 
-    matched_services = len(services)
-    notifications_created = 0
-    sms_sent_count = 0
-    sms_failed_count = 0
+
+def _dispatch_report_ids(notification: ServiceDispatchNotification) -> list[int]:
+    # Rows written before report_ids existed cover just their own report.
+    return list(notification.report_ids or ([notification.report_id] if notification.report_id else []))
+
+
+def _open_dispatches(dispatches: list[tuple[IncidentReport, list, int, list[int]]]) -> dict[tuple, ServiceDispatchNotification]:
+    # Unfinished notifications inside the window for any (service, cluster) about to be alerted, locked
+    # so concurrent dispatches merge in turn; one query over dispatch_suppression_idx.
+    service_ids = {service.svc_id for _, services, _, _ in dispatches for service in services}
+    cluster_ids = {report.cluster_id for report, _, _, _ in dispatches if report.cluster_id}
+    report_ids = {report.report_id for report, _, _, _ in dispatches if not report.cluster_id}
+    if not service_ids or DISPATCH_SUPPRESSION_MINUTES <= 0:
+        return {}
+    rows = (
+        ServiceDispatchNotification.objects.select_for_update()
+        .filter(
+            Q(cluster_id__in=cluster_ids) | Q(cluster_id__isnull=True, report_id__in=report_ids),
+            service_id__in=service_ids,
+            created_at__gte=timezone.now() - timedelta(minutes=DISPATCH_SUPPRESSION_MINUTES),
+        )
+        .exclude(status="Completed")
+        .order_by("created_at")
+    )
+    return {_suppression_key(row.service_id, row.cluster_id, row.report_id): row for row in rows}
+
+
+def _queue_dispatches(dispatches: list[tuple[IncidentReport, list, int, list[int]]]) -> dict:
+    # dispatches: (report, services, reports at the location, ids of the reports the alert covers).
+    # Notifications and their outbox texts are written with two bulk inserts; the texts are sent by
+    # sms_worker, so the request never waits on the gateway. A service already alerted for the incident
+    # instead gets the new report ids added to that notification, and its count raised by as many.
+    notifications = []
+    texts = []
     errors: list[str] = []
-    for service in services:
-        sms_message = message.replace("{service_name}", service.svc_name or "Service Team")
-        sms_sent, sms_error = _send_dispatch_sms(service, sms_message)
-        ServiceDispatchNotification.objects.create(
-            service=service,
-            report_id=report.report_id,
-            incident_type=incident_type,
-            barangay=barangay,
-            location_text=report.location_text or "",
-            status="Dispatched",
-            sms_sent=sms_sent,
-            sms_error=sms_error,
+    merged: dict[int, ServiceDispatchNotification] = {}
+    grown: dict[int, ServiceDispatchNotification] = {}
+    now = timezone.now()
+    with transaction.atomic():
+        open_dispatches = _open_dispatches(dispatches)
+        for report, services, report_count, report_ids in dispatches:
+            incident_type = (report.incident_type or "").strip()
+            barangay = (report.barangay or "").strip()
+            message = None
+            for service in services:
+                existing = open_dispatches.get(_suppression_key(service.svc_id, report.cluster_id, report.report_id))
+                if existing:
+                    merged[existing.dispatch_id] = existing
+                    covered = _dispatch_report_ids(existing)
+                    added = [report_id for report_id in report_ids if report_id not in covered]
+                    if added:
+                        existing.report_ids = covered + added
+                        existing.report_count += len(added)
+                        existing.updated_at = now
+                        grown[existing.dispatch_id] = existing
+                    continue
+                phone = (service.svc_contact_number or "").strip()
+                sms_error = None if phone else "Service contact number missing"
+                notifications.append(ServiceDispatchNotification(
+                    service=service,
+                    report_id=report.report_id,
+                    cluster_id=report.cluster_id,
+                    report_count=report_count,
+                    report_ids=list(report_ids),
+                    incident_type=incident_type,
+                    barangay=barangay,
+                    location_text=report.location_text or "",
+                    status="Dispatched",
+                    sms_sent=False,
+                    sms_error=sms_error,
+                ))
+                if phone and message is None:
+                    message = _dispatch_message(report, report_count)
+                texts.append(message if phone else None)
+                if not phone:
+                    errors.append(f"{service.svc_name}: {sms_error}")
+
+        created = ServiceDispatchNotification.objects.bulk_create(notifications)
+        if grown:
+            ServiceDispatchNotification.objects.bulk_update(
+                list(grown.values()), ["report_ids", "report_count", "updated_at"]
+            )
+        queued = enqueue_many(
+            (notification, notification.service.svc_contact_number, text)
+            for notification, text in zip(created, texts)
+            if text
         )
-        notifications_created += 1
-        if sms_sent:
-            sms_sent_count += 1
-        else:
-            sms_failed_count += 1
-            if sms_error:
-                errors.append(f"{service.svc_name}: {sms_error}")
+        for service_id in {notification.service_id for notification in [*created, *grown.values()]}:
+            publish_on_commit(service_topic(service_id))
 
     return {
-        "servicesMatched": matched_services,
-        "notificationsCreated": notifications_created,
-        "smsSent": sms_sent_count,
-        "smsFailed": sms_failed_count,
+        "servicesMatched": len({notification.service_id for notification in [*created, *merged.values()]}),
+        "notificationsCreated": len(created),
+        "notificationsMerged": len(merged),
+        "smsQueued": queued,
+        "smsFailed": len(created) - queued,
         "errors": errors[:10],
     }
 
 
-def _incident_row_to_dict(row: IncidentReport) -> dict:
+def _notify_services_for_report(report: IncidentReport, report_count: int | None = None) -> dict:
+    services = _services_for_report(report)
+    return _queue_dispatches([
+        (report, services, report_count or _matching_report_count(report), [report.report_id])
+    ])
+
+
+def _incident_image_urls(request, images, variants: dict[str, str] | None = None) -> list[str]:
+    return [_media_url(request, image, variants) for image in images or [] if isinstance(image, str) and image]
+
+
+def _report_image_variants(rows, fields=None) -> dict[str, dict[str, str]]:
+    if fields is not None and "images" not in fields and "fullImages" not in fields:
+        return {}
+    keys = [image for row in rows for image in (row.images or []) if is_storage_key(image)]
+    return variant_paths(keys, "card", "full")
+
+
+# Response key -> (columns it reads, builder). Lets list endpoints load only what they return.
+INCIDENT_ROW_FIELDS = {
+    "id": (("report_id",), lambda row, request, variants: row.report_id),
+    "category": (("incident_type",), lambda row, request, variants: row.incident_type),
+    "description": (("description",), lambda row, request, variants: row.description or ""),
+    "location": (("location_text", "barangay"), lambda row, request, variants: row.location_text or row.barangay or ""),
+    "date": (("created_at",), lambda row, request, variants: row.created_at.isoformat() if row.created_at else ""),
+    "status": (("status",), lambda row, request, variants: row.status),
+    "images": (("images",), lambda row, request, variants: _incident_image_urls(request, row.images, variants.get("card"))),
+    "fullImages": (("images",), lambda row, request, variants: _incident_image_urls(request, row.images, variants.get("full"))),
+    "residentName": (("resident_name",), lambda row, request, variants: row.resident_name or ""),
+    "residentEmail": (("resident_email",), lambda row, request, variants: row.resident_email or ""),
+    "duplicateOf": (("duplicate_of_id",), lambda row, request, variants: row.duplicate_of_id),
+    "duplicates": (("duplicate_count",), lambda row, request, variants: row.duplicate_count),
+}
+INCIDENT_SUMMARY_FIELDS = ("id", "category", "location", "date", "status", "residentName", "duplicates")
+
+RESIDENT_INCIDENT_FIELDS = {
+    "id": (("report_id",), lambda row, request, variants: row.report_id),
+    "type": (("incident_type",), lambda row, request, variants: row.incident_type.lower()),
+    "status": (
+        ("status",),
+        lambda row, request, variants: "completed" if row.status == "Completed" else "inprogress" if row.status == "In Progress" else "waiting",
+    ),
+    "description": (("description",), lambda row, request, variants: row.description or ""),
+    "location": (("location_text",), lambda row, request, variants: row.location_text or ""),
+    "images": (("images",), lambda row, request, variants: _incident_image_urls(request, row.images, variants.get("card"))),
+    "fullImages": (("images",), lambda row, request, variants: _incident_image_urls(request, row.images, variants.get("full"))),
+    "createdAt": (("created_at",), lambda row, request, variants: int(row.created_at.timestamp() * 1000) if row.created_at else 0),
+}
+RESIDENT_INCIDENT_SUMMARY_FIELDS = ("id", "type", "status", "location", "createdAt")
+
+
+def _requested_fields(request, spec: dict, summary_fields) -> tuple[str, ...] | None:
+    # ?fields=id,status,... picks keys; ?view=summary is the compact preset; neither means every key.
+    raw = request.query_params.get("fields")
+    if raw:
+        picked = [key.strip() for key in raw.split(",") if key.strip() in spec]
+        return tuple(dict.fromkeys(["id", *picked]))
+    if request.query_params.get("view") == "summary":
+        return tuple(summary_fields)
+    return None
+
+
+def _project_rows(queryset, spec: dict, fields, extra_columns=()):
+    if fields is None:
+        return queryset
+    columns = {column for key in fields for column in spec[key][0]}
+    return queryset.only(*columns, *extra_columns)
+
+
+def _build_row(spec: dict, row, request, variants=None, fields=None) -> dict:
+    variants = variants or {}
     return {
-        "id": row.report_id,
-        "category": row.incident_type,
-        "description": row.description or "",
-        "location": row.location_text or row.barangay or "",
-        "date": row.created_at.isoformat() if row.created_at else "",
-        "status": row.status,
-        "images": row.images or [],
-        "residentName": row.resident_name or "",
-        "residentEmail": row.resident_email or "",
+        key: build(row, request, variants)
+        for key, (_, build) in spec.items()
+        if fields is None or key in fields
     }
 
 
+def _incident_row_to_dict(row: IncidentReport, request, variants: dict[str, dict[str, str]] | None = None, fields=None) -> dict:
+    return _build_row(INCIDENT_ROW_FIELDS, row, request, variants, fields)
+
+
 def _incident_urgency_from_count(report_count: int) -> str:
     if report_count <= 1:
         return "Low"
@@ -836,11 +774,114 @@ def _incident_urgency_from_count(report_count: int) -> str:
     return "Critical"
 
 
-def _official_incident_queryset(official):
-    qs = IncidentReport.objects.all().order_by("-created_at")
+# Re-read a little before the client's cursor so rows committed late by a slow transaction are not missed.
+CHANGE_CURSOR_OVERLAP = timedelta(seconds=2)
+
+
+def _parse_change_cursor(value: str | None):
+    if not value:
+        return None
+    parsed = parse_datetime(value.replace(" ", "+"))
+    if parsed and timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _change_state(request, rows, scope_params: tuple[str, ...] = ()) -> tuple[str, str]:
+    # One index-only aggregate instead of rebuilding the payload to learn nothing changed. The ETag is
+    # the data version (latest change and row count) plus only the params that select the rows, so a
+    # poll with a fresh ?since= cursor still gets a 304 while nothing has changed.
+    state = rows.order_by().aggregate(latest=Max("updated_at"), total=Count("report_id"))
+    cursor = state["latest"].isoformat() if state["latest"] else ""
+    scope = "&".join(f"{name}={request.query_params.get(name, '')}" for name in scope_params)
+    fingerprint = f"{cursor}|{state['total']}|{scope}"
+    return cursor, f'"{hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()}"'
+
+
+def _etag_matches(request, etag: str) -> bool:
+    header = request.headers.get("If-None-Match") or ""
+    return etag in [tag.strip() for tag in header.split(",")]
+
+
+def _not_modified(etag: str) -> Response:
+    response = Response(status=304)
+    response["ETag"] = etag
+    return response
+
+
+def _map_entry_key(key: int) -> str:
+    return f"c{key}" if key > 0 else f"r{-key}"
+
+
+REPORTS_PAGE_DEFAULT = 50
+REPORTS_PAGE_MAX = 200
+REPORTS_STREAM_CHUNK_SIZE = 200
+
+
+def _encode_report_cursor(row: IncidentReport) -> str:
+    raw = f"{row.created_at.isoformat()}|{row.report_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_report_cursor(value: str | None):
+    if not value:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(value.encode("ascii")).decode("utf-8")
+        created_at, report_id = raw.rsplit("|", 1)
+        return parse_datetime(created_at), int(report_id)
+    except (ValueError, UnicodeError):
+        return None
+
+
+def _stream_reports_json(request, rows, fields=None):
+    # Encode row by row so memory stays flat however many reports (and images) match.
+    # rows is any iterable, typically queryset.iterator() or a merge of several.
+    yield '{"reports": ['
+    first = True
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) < REPORTS_STREAM_CHUNK_SIZE:
+            continue
+        yield ("" if first else ",") + _encode_report_batch(request, batch, fields)
+        first = False
+        batch = []
+    if batch:
+        yield ("" if first else ",") + _encode_report_batch(request, batch, fields)
+    yield "]}"
+
+
+def _encode_report_batch(request, rows, fields=None) -> str:
+    variants = _report_image_variants(rows, fields)
+    return ",".join(json.dumps(_incident_row_to_dict(row, request, variants, fields)) for row in rows)
+
+
+def _include_archived(request) -> bool:
+    return (request.query_params.get("include_archived") or "").lower() in ("1", "true", "yes")
+
+
+def _primary_reports(request, queryset):
+    # Near-duplicates are folded into their parent's "duplicates" count unless ?include_duplicates=1.
+    if (request.query_params.get("include_duplicates") or "").lower() in ("1", "true", "yes"):
+        return queryset
+    return queryset.filter(duplicate_of_id__isnull=True)
+
+
+def _report_sort_key(row):
+    return row.created_at, row.report_id
+
+
+def _merge_newest_first(*iterables):
+    # Hot and archived rows are each already ordered newest first; interleave them lazily.
+    return heapq.merge(*iterables, key=_report_sort_key, reverse=True)
+
+
+def _legacy_official_incident_filter(official) -> Q | None:
+    # Resident linkage and text matching, for reports without a barangay link (see
+    # backfill_barangays). None means the official's barangay text narrows nothing.
     official_barangay_raw = (official.official_barangay or "").strip()
-    official_barangay = _normalize_barangay(official_barangay_raw)
-    official_core = official_barangay.replace("barangay ", "", 1).strip() if official_barangay else ""
+    official_core = gazetteer.display_name(official_barangay_raw) if official_barangay_raw else ""
 
     matching_terms = []
     if official_barangay_raw:
@@ -865,7 +906,7 @@ def _official_incident_queryset(official):
         )
 
     if not matching_terms and not resident_emails:
-        return qs
+        return None
 
     query = Q()
     if resident_emails:
@@ -873,10 +914,23 @@ def _official_incident_queryset(official):
     for term in matching_terms:
         query |= Q(barangay__icontains=term)
         query |= Q(location_text__icontains=term)
-
-    return qs.filter(
-        query
-    )
+    return query
+
+
+def _official_incident_queryset(official, model=IncidentReport):
+    # model=IncidentReportArchive applies the same scoping to archived reports.
+    qs = model.objects.all().order_by("-created_at")
+    legacy = _legacy_official_incident_filter(official)
+    if official.barangay_ref_id:
+        # Linked reports are scoped by the link alone; reports the backfill could not link
+        # (free text naming no gazetteer barangay) still go through the legacy matching.
+        query = Q(barangay_ref_id=official.barangay_ref_id)
+        if legacy is not None:
+            query |= Q(barangay_ref__isnull=True) & legacy
+        return qs.filter(query)
+    if legacy is None:
+        return qs
+    return qs.filter(legacy)
 
 
 @api_view(['GET'])
@@ -1090,8 +1144,15 @@ def officials_residents_pending(request):
     barangay = (official.official_barangay or "").strip()
     residents = []
     qs = Resident.objects.all()
-    if barangay:
-        qs = [res for res in qs if _matches_official_barangay(barangay, res.res_location)]
+    if official.barangay_ref_id:
+        # Unlinked residents are still matched on their location text.
+        qs = [
+            res
+            for res in qs.filter(Q(barangay_ref_id=official.barangay_ref_id) | Q(barangay_ref__isnull=True))
+            if _official_covers_resident(official, res)
+        ]
+    elif barangay:
+        qs = [res for res in qs if _official_covers_resident(official, res)]
 
     for res in qs:
         full_name = " ".join(
@@ -1139,7 +1200,7 @@ def officials_residents_approve(request):
         res = Resident.objects.get(res_id=res_id)
     except Resident.DoesNotExist:
         return Response({"message": "Resident not found"}, status=404)
-    if not _matches_official_barangay(official.official_barangay, res.res_location):
+    if not _official_covers_resident(official, res):
         return Response({"message": "Forbidden for this barangay"}, status=403)
 
     res.res_is_active = True
@@ -1165,7 +1226,7 @@ def officials_residents_remove(request):
         res = Resident.objects.get(res_id=res_id)
     except Resident.DoesNotExist:
         return Response({"message": "Resident not found"}, status=404)
-    if not _matches_official_barangay(official.official_barangay, res.res_location):
+    if not _official_covers_resident(official, res):
         return Response({"message": "Forbidden for this barangay"}, status=403)
 
     res.res_is_active = False
@@ -1209,6 +1270,21 @@ def _service_type_from_description(description: str | None, name: str | None = N
     return "Rescue"
 
 
+def _service_coordinates(data, lat=None, lng=None) -> tuple[float | None, float | None]:
+    # Optional "lat"/"lng" for nearest-service dispatch; absent keys keep the current values,
+    # explicit nulls (or out-of-range values) clear them.
+    if "lat" not in data and "lng" not in data:
+        return lat, lng
+    try:
+        lat = float(data.get("lat")) if data.get("lat") not in (None, "") else None
+        lng = float(data.get("lng")) if data.get("lng") not in (None, "") else None
+    except (TypeError, ValueError):
+        return None, None
+    if lat is None or lng is None or not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return None, None
+    return lat, lng
+
+
 @api_view(['GET'])
 def officials_services_list(request):
     official = _get_official_for_request(request)
@@ -1223,7 +1299,12 @@ def officials_services_list(request):
     qs = Service.objects.filter(svc_is_deleted=False)
     if official and not admin:
         barangay = (official.official_barangay or "").strip()
-        if barangay:
+        if official.barangay_ref_id:
+            query = Q(barangay_ref_id=official.barangay_ref_id)
+            if barangay:
+                query |= Q(barangay_ref__isnull=True, svc_location__icontains=barangay)
+            qs = qs.filter(query)
+        elif barangay:
             qs = qs.filter(svc_location__icontains=barangay)
 
     for svc in qs:
@@ -1235,6 +1316,8 @@ def officials_services_list(request):
                 "phone": svc.svc_contact_number or "",
                 "email": svc.svc_email_address,
                 "address": svc.svc_location or "",
+                "lat": svc.svc_lat,
+                "lng": svc.svc_lng,
                 "type": _service_type_from_description(svc.svc_description, svc.svc_name),
                 "status": _service_status_from_flags(svc.svc_is_active, svc.svc_is_deleted),
             }
@@ -1305,16 +1388,17 @@ def officials_services_create(request):
             return Response({"message": "Selected service is not from registered services"}, status=400)
         if official and not admin:
             svc.svc_location = (official.official_barangay or svc.svc_location or "").strip()
+        svc.barangay_ref_id = gazetteer.resolve(svc.svc_location)
         svc.svc_is_active = True
         svc.svc_is_deleted = False
-        svc.save(update_fields=["svc_location", "svc_is_active", "svc_is_deleted"])
+        svc.save(update_fields=["svc_location", "barangay_ref", "svc_is_active", "svc_is_deleted"])
         return Response({"message": "Registered service activated", "id": svc.svc_id}, status=200)
 
     if not title or not email:
         return Response({"message": "Title and email required"}, status=400)
 
     normalized_title = (title or "").strip().lower()
-    normalized_phone = _normalize_phone_number(phone)
+    normalized_phone = normalize_phone_number(phone)
     normalized_email = (email or "").strip().lower()
     normalized_address = (address or "").strip().lower()
     normalized_type = (service_type or "").strip().lower()
@@ -1325,7 +1409,7 @@ def officials_services_create(request):
     )
     matched_registered = None
     for candidate in registered_qs:
-        candidate_phone = _normalize_phone_number(candidate.svc_contact_number or "")
+        candidate_phone = normalize_phone_number(candidate.svc_contact_number or "")
         candidate_type = (
             _service_type_from_description(candidate.svc_description, candidate.svc_name) or ""
         ).strip().lower()
@@ -1353,6 +1437,8 @@ def officials_services_create(request):
         svc.svc_name = title
         svc.svc_contact_number = phone
         svc.svc_location = address
+        svc.barangay_ref_id = gazetteer.resolve(address)
+        svc.svc_lat, svc.svc_lng = _service_coordinates(request.data, svc.svc_lat, svc.svc_lng)
         svc.svc_description = service_type
         svc.svc_is_active = is_active
         svc.svc_is_deleted = is_deleted
@@ -1360,17 +1446,24 @@ def officials_services_create(request):
             "svc_name",
             "svc_contact_number",
             "svc_location",
+            "barangay_ref",
+            "svc_lat",
+            "svc_lng",
             "svc_description",
             "svc_is_active",
             "svc_is_deleted",
         ])
     else:
+        svc_lat, svc_lng = _service_coordinates(request.data)
         svc = Service.objects.create(
             svc_name=title,
             svc_email_address=email,
             svc_contact_number=phone,
             svc_password="",
             svc_location=address,
+            barangay_ref_id=gazetteer.resolve(address),
+            svc_lat=svc_lat,
+            svc_lng=svc_lng,
             svc_description=service_type,
             svc_is_active=is_active,
             svc_is_deleted=is_deleted,
@@ -1412,6 +1505,8 @@ def officials_services_update(request):
     if official and not admin:
         address = (official.official_barangay or address).strip()
     svc.svc_location = address
+    svc.barangay_ref_id = gazetteer.resolve(address)
+    svc.svc_lat, svc.svc_lng = _service_coordinates(request.data, svc.svc_lat, svc.svc_lng)
     svc.svc_description = service_type
     svc.svc_is_active = is_active
     svc.svc_is_deleted = is_deleted
@@ -1420,6 +1515,9 @@ def officials_services_update(request):
         "svc_contact_number",
         "svc_email_address",
         "svc_location",
+        "barangay_ref",
+        "svc_lat",
+        "svc_lng",
         "svc_description",
         "svc_is_active",
         "svc_is_deleted",
@@ -1453,20 +1551,38 @@ def officials_services_delete(request):
     return Response({"message": "Deleted"}, status=200)
 
 
-@api_view(['POST'])
-def residents_incidents_create(request):
-    resident = _get_resident_for_request(request)
-    if not resident or not resident.res_is_active or resident.res_is_deleted:
-        return Response({"message": "Unauthorized"}, status=401)
+INCIDENT_BATCH_MAX = int(os.environ.get("INCIDENT_BATCH_MAX", "50"))
+CLIENT_KEY_MAX_LENGTH = 64
 
-    incident_type = _normalize_incident_type(request.data.get("type"))
-    description = request.data.get("description") or ""
-    location_text = request.data.get("location") or ""
-    images = request.data.get("images") or []
-    if not isinstance(images, list):
-        images = []
-    lat = request.data.get("lat")
-    lng = request.data.get("lng")
+
+def _incident_client_key(value) -> str | None:
+    key = str(value or "").strip()
+    if not key or len(key) > CLIENT_KEY_MAX_LENGTH:
+        return None
+    return key
+
+
+def _parse_client_timestamp(value):
+    # Epoch milliseconds (the app's createdAt format) or ISO 8601; device clocks are never trusted past now.
+    if value in (None, ""):
+        return None
+    parsed = None
+    try:
+        parsed = datetime.fromtimestamp(float(value) / 1000, tz=dt_timezone.utc)
+    except (TypeError, ValueError, OverflowError, OSError):
+        parsed = parse_datetime(str(value))
+        if parsed and timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+    if not parsed:
+        return None
+    return min(parsed, timezone.now())
+
+
+def _build_incident_report(resident: Resident, data) -> IncidentReport:
+    # Unsaved row from a create payload; images are stored (and referenced) by the caller.
+    location_text = data.get("location") or ""
+    lat = data.get("lat")
+    lng = data.get("lng")
     try:
         lat = float(lat) if lat is not None else None
         lng = float(lng) if lng is not None else None
@@ -1475,58 +1591,302 @@ def residents_incidents_create(request):
     if lat is None or lng is None:
         lat, lng = _parse_lat_lng(location_text)
     barangay_value = (resident.res_location or "").strip() or location_text
-
-    report = IncidentReport.objects.create(
+    return IncidentReport(
         resident_email=resident.res_email_address,
         resident_name=_resident_full_name(resident) or resident.res_email_address,
         barangay=barangay_value,
-        incident_type=incident_type,
-        description=description,
+        barangay_ref_id=gazetteer.resolve(barangay_value),
+        incident_type=_normalize_incident_type(data.get("type")),
+        description=data.get("description") or "",
         location_text=location_text,
         lat=lat,
         lng=lng,
-        images=images,
+        geohash=encode_geohash(lat, lng),
         status="Pending",
     )
 
+
+def _link_duplicate(report: IncidentReport, parent: IncidentReport | None):
+    # A report a few metres and minutes from an open one of the same type joins it instead of
+    # becoming a separate incident; it takes the parent's status so it is not dispatched again.
+    if parent:
+        report.duplicate_of_id = parent.report_id
+        report.status = parent.status
+
+
+def _incidents_created(reports: list[IncidentReport]):
+    parents: dict[int, int] = {}
+    for report in reports:
+        if report.duplicate_of_id:
+            parents[report.duplicate_of_id] = parents.get(report.duplicate_of_id, 0) + 1
+        attach_report_to_cluster(report)
+        schedule_variants(*report.images)
+        record_report_created(report)
+    for parent_id, count in parents.items():
+        record_duplicate(parent_id, count)
+    publish_on_commit(INCIDENTS_TOPIC)
+
+
+def _submitted_report_payload(report: IncidentReport) -> dict:
+    return {
+        "id": report.report_id,
+        "status": report.status,
+        "created_at": report.created_at.isoformat(),
+        "duplicateOf": report.duplicate_of_id,
+    }
+
+
+def _existing_client_reports(resident: Resident, keys) -> dict[str, IncidentReport]:
+    rows = IncidentReport.objects.filter(
+        resident_email=resident.res_email_address,
+        client_key__in=list(keys),
+    ).only("report_id", "client_key", "status", "created_at", "duplicate_of_id")
+    return {row.client_key: row for row in rows}
+
+
+@api_view(['POST'])
+def residents_incidents_create(request):
+    resident = _get_resident_for_request(request)
+    if not resident or not resident.res_is_active or resident.res_is_deleted:
+        return Response({"message": "Unauthorized"}, status=401)
+
+    # Optional: lets the app retry a submission without filing it twice.
+    client_key = _incident_client_key(request.data.get("clientKey"))
+    if client_key:
+        existing = _existing_client_reports(resident, [client_key]).get(client_key)
+        if existing:
+            return Response({"message": "Report already submitted", "report": _submitted_report_payload(existing)}, status=200)
+
+    report = _build_incident_report(resident, request.data)
+    report.client_key = client_key
+    report.reported_at = _parse_client_timestamp(request.data.get("clientTimestamp"))
+    try:
+        # Decode data URLs to files now so rows (and every list response) only carry storage keys.
+        report.images = store_incident_images(request.data.get("images") or [], resident.res_email_address)
+    except ValueError as exc:
+        return Response({"message": str(exc)}, status=400)
+    try:
+        with transaction.atomic():
+            _link_duplicate(report, find_duplicate_parent(
+                report.incident_type,
+                report.lat,
+                report.lng,
+                report.barangay_ref_id,
+                report.barangay,
+                seen_at=report.reported_at,
+            ))
+            report.save()
+            _incidents_created([report])
+    except IntegrityError:
+        release_incident_images(report.images)
+        # The same clientKey committed concurrently (a retry racing the original request).
+        existing = _existing_client_reports(resident, [client_key]).get(client_key) if client_key else None
+        if not existing:
+            raise
+        return Response({"message": "Report already submitted", "report": _submitted_report_payload(existing)}, status=200)
+
     return Response(
         {
             "message": "Report submitted",
-            "report": {
-                "id": report.report_id,
-                "status": report.status,
-                "created_at": report.created_at.isoformat(),
-            },
+            "report": _submitted_report_payload(report),
         },
         status=201,
     )
 
 
+def _within_duplicate_window(first, second) -> bool:
+    if not first or not second:
+        return True
+    return abs((second - first).total_seconds()) <= DUPLICATE_WINDOW_MINUTES * 60
+
+
+def _store_batch_images(resident: Resident, items: list) -> dict[int, list[str] | str]:
+    # Runs once, outside the transaction the batch may be retried in: index -> stored image keys,
+    # or the message rejecting that item's images. Reports already filed get nothing stored.
+    keys = {
+        index: _incident_client_key(item.get("clientKey"))
+        for index, item in enumerate(items)
+        if isinstance(item, dict)
+    }
+    existing = _existing_client_reports(resident, {key for key in keys.values() if key})
+    stored: dict[int, list[str] | str] = {}
+    taken = set()
+    for index, key in keys.items():
+        if not key or key in existing or key in taken:
+            continue
+        try:
+            stored[index] = store_incident_images(items[index].get("images") or [], resident.res_email_address)
+        except ValueError as exc:
+            stored[index] = str(exc)
+            continue
+        taken.add(key)
+    return stored
+
+
+def _ingest_incident_batch(resident: Resident, items: list, stored_images: dict[int, list[str] | str]) -> list[dict]:
+    results: list[dict | None] = [None] * len(items)
+    keyed = []
+    for index, item in enumerate(items):
+        key = _incident_client_key(item.get("clientKey")) if isinstance(item, dict) else None
+        if not key:
+            results[index] = {"index": index, "result": "invalid", "message": "Missing or invalid clientKey"}
+            continue
+        keyed.append((index, key, item))
+
+    existing = _existing_client_reports(resident, {key for _, key, _ in keyed})
+    first_index: dict[str, int] = {}
+    new_reports: list[tuple[int, IncidentReport]] = []
+    batch_parents: dict[int, IncidentReport] = {}
+
+    with transaction.atomic():
+        for index, key, item in keyed:
+            if key in existing:
+                results[index] = {
+                    "index": index,
+                    "clientKey": key,
+                    "result": "existing",
+                    "report": _submitted_report_payload(existing[key]),
+                }
+                continue
+            if key in first_index:
+                # Same key twice in one upload: the later copy resolves to the first.
+                results[index] = {"index": index, "clientKey": key, "result": "existing", "sameAs": first_index[key]}
+                continue
+            images = stored_images.get(index, [])
+            if isinstance(images, str):
+                results[index] = {"index": index, "clientKey": key, "result": "invalid", "message": images}
+                continue
+            first_index[key] = index
+
+            report = _build_incident_report(resident, item)
+            report.client_key = key
+            report.reported_at = _parse_client_timestamp(item.get("clientTimestamp"))
+            report.images = images
+            parent = find_duplicate_parent(
+                report.incident_type,
+                report.lat,
+                report.lng,
+                report.barangay_ref_id,
+                report.barangay,
+                seen_at=report.reported_at,
+            )
+            if parent:
+                _link_duplicate(report, parent)
+            elif report.lat is not None and report.lng is not None:
+                # Reports queued on one phone during the same incident are near-duplicates of each other too.
+                earlier = nearest_report(report.lat, report.lng, [
+                    other for _, other in new_reports
+                    if other.incident_type == report.incident_type
+                    and same_barangay(report.barangay_ref_id, report.barangay, other)
+                    and not other.duplicate_of_id
+                    and id(other) not in batch_parents
+                    and _within_duplicate_window(other.reported_at, report.reported_at)
+                ])
+                if earlier:
+                    batch_parents[id(report)] = earlier
+            new_reports.append((index, report))
+
+        created = IncidentReport.objects.bulk_create([report for _, report in new_reports])
+        linked = []
+        for report in created:
+            parent = batch_parents.get(id(report))
+            if parent:
+                report.duplicate_of_id = parent.report_id
+                linked.append(report)
+        if linked:
+            IncidentReport.objects.bulk_update(linked, ["duplicate_of"])
+        if created:
+            _incidents_created(created)
+
+    for index, report in new_reports:
+        results[index] = {
+            "index": index,
+            "clientKey": report.client_key,
+            "result": "created",
+            "report": _submitted_report_payload(report),
+        }
+    for result in results:
+        if "sameAs" in result:
+            result["report"] = results[result.pop("sameAs")]["report"]
+    return results
+
+
+@api_view(['POST'])
+def residents_incidents_batch(request):
+    # Replays reports queued while offline: {"reports": [{"clientKey", "clientTimestamp", "type", ...}]}.
+    resident = _get_resident_for_request(request)
+    if not resident or not resident.res_is_active or resident.res_is_deleted:
+        return Response({"message": "Unauthorized"}, status=401)
+
+    items = request.data.get("reports")
+    if not isinstance(items, list) or not items:
+        return Response({"message": "Missing reports"}, status=400)
+    if len(items) > INCIDENT_BATCH_MAX:
+        return Response({"message": f"At most {INCIDENT_BATCH_MAX} reports per batch"}, status=400)
+
+    stored_images = _store_batch_images(resident, items)
+    results = None
+    try:
+        try:
+            results = _ingest_incident_batch(resident, items, stored_images)
+        except IntegrityError:
+            # A retry of this upload committed first; everything it inserted now reads back as existing.
+            results = _ingest_incident_batch(resident, items, stored_images)
+    finally:
+        # Images stay referenced only by the reports this request actually created.
+        for index, images in stored_images.items():
+            if isinstance(images, list) and (results is None or results[index]["result"] != "created"):
+                release_incident_images(images)
+
+    counts = {"created": 0, "existing": 0, "invalid": 0}
+    for result in results:
+        counts[result["result"]] += 1
+    return Response({"results": results, **counts}, status=200)
+
+
 @api_view(['GET'])
 def residents_incidents_my(request):
     resident = _get_resident_for_request(request)
     if not resident:
         return Response({"message": "Unauthorized"}, status=401)
 
-    rows = IncidentReport.objects.filter(
-        resident_email=resident.res_email_address
-    ).order_by("-created_at")
+    fields = _requested_fields(request, RESIDENT_INCIDENT_FIELDS, RESIDENT_INCIDENT_SUMMARY_FIELDS)
+    models_to_read = [IncidentReport, IncidentReportArchive] if _include_archived(request) else [IncidentReport]
+    rows = list(_merge_newest_first(*(
+        _project_rows(
+            model.objects.filter(resident_email=resident.res_email_address).order_by("-created_at", "-report_id"),
+            RESIDENT_INCIDENT_FIELDS,
+            fields,
+            extra_columns=("created_at",),
+        )
+        for model in models_to_read
+    )))
+    variants = _report_image_variants(rows, fields)
 
-    reports = [
-        {
-            "id": r.report_id,
-            "type": r.incident_type.lower(),
-            "status": "completed" if r.status == "Completed" else "inprogress" if r.status == "In Progress" else "waiting",
-            "description": r.description or "",
-            "location": r.location_text or "",
-            "images": r.images or [],
-            "createdAt": int(r.created_at.timestamp() * 1000) if r.created_at else 0,
-        }
-        for r in rows
-    ]
+    reports = [_build_row(RESIDENT_INCIDENT_FIELDS, r, request, variants, fields) for r in rows]
     return Response({"reports": reports}, status=200)
 
 
+@api_view(['GET'])
+def residents_incident_detail(request):
+    resident = _get_resident_for_request(request)
+    if not resident:
+        return Response({"message": "Unauthorized"}, status=401)
+
+    report_id = request.query_params.get("id")
+    if not str(report_id or "").isdigit():
+        return Response({"message": "Missing id"}, status=400)
+    report = None
+    for model in (IncidentReport, IncidentReportArchive):
+        report = model.objects.filter(resident_email=resident.res_email_address, report_id=report_id).first()
+        if report:
+            break
+    if not report:
+        return Response({"message": "Report not found"}, status=404)
+    variants = _report_image_variants([report])
+    return Response({"report": _build_row(RESIDENT_INCIDENT_FIELDS, report, request, variants)}, status=200)
+
+
 @api_view(['POST'])
 def residents_newsfeed_create(request):
     resident = _get_resident_for_request(request)
@@ -1538,11 +1898,15 @@ def residents_newsfeed_create(request):
     content = request.data.get("content") or ""
     location_text = request.data.get("location") or ""
     image = request.data.get("image")
+    if is_data_url(image):
+        image = save_data_url(image)
+        schedule_variants(image)
 
     post = NewsFeedPost.objects.create(
         author_email=resident.res_email_address,
         author_name=_resident_full_name(resident) or resident.res_email_address,
         barangay=resident.res_location or "",
+        barangay_ref_id=gazetteer.resolve(resident.res_location),
         post_type=post_type if post_type in ("EVENT", "HELP") else "EVENT",
         incident_type=incident_type,
         location_text=location_text,
@@ -1569,13 +1933,15 @@ def residents_newsfeed_list(request):
     avatar_by_email = {}
     if author_emails:
         try:
-            avatars = UserProfileAvatar.objects.filter(role="Resident", email__in=list(author_emails))
+            avatars = list(UserProfileAvatar.objects.filter(role="Resident", email__in=list(author_emails)))
+            thumbs = variant_paths([a.image_path for a in avatars], "thumb")["thumb"]
             avatar_by_email = {
-                a.email: _absolute_url(request, default_storage.url(a.image_path))
+                a.email: _media_url(request, a.image_path, thumbs)
                 for a in avatars
             }
         except Exception:
             avatar_by_email = {}
+    image_variants = variant_paths([p.image for p in rows if is_storage_key(p.image)], "card", "full")
     posts = [
         {
             "id": p.post_id,
@@ -1587,7 +1953,8 @@ def residents_newsfeed_list(request):
             "incidentType": p.incident_type,
             "location": p.location_text or "",
             "content": p.content or "",
-            "image": p.image,
+            "image": _media_url(request, p.image, image_variants["card"]),
+            "fullImage": _media_url(request, p.image, image_variants["full"]),
             "interested": email in (p.interested_by or []),
             "urgentCount": len(p.interested_by or []),
             "notUrgentCount": len(p.not_urgent_by or []),
@@ -1755,15 +2122,16 @@ def officials_dashboard(request):
     if not official or not official.official_is_active or official.official_is_deleted:
         return Response({"message": "Unauthorized"}, status=401)
 
-    rows = _official_incident_queryset(official)
-    summary = {
-        "totalReports": rows.count(),
-        "fireReports": rows.filter(incident_type="Fire").count(),
-        "floodReports": rows.filter(incident_type="Flood").count(),
-        "pendingReports": rows.filter(status="Pending").count(),
-        "inProgressReports": rows.filter(status="In Progress").count(),
-        "resolvedReports": rows.filter(status="Completed").count(),
-    }
+    # Counters cover live and archived reports, so the fallback sums both tables the same way.
+    scopes = [_official_incident_queryset(official), _official_incident_queryset(official, IncidentReportArchive)]
+    if official.barangay_ref_id:
+        counter = BarangayIncidentCounter.objects.filter(pk=official.barangay_ref_id).first()
+        if counter:
+            # The counter holds the linked reports; unlinked ones in the official's scope come on top.
+            unlinked = summarize_reports(*(scope.filter(barangay_ref__isnull=True) for scope in scopes))
+            return Response(counter_summary(counter, unlinked), status=200)
+
+    summary = summarize_reports(*scopes)
     return Response(summary, status=200)
 
 
@@ -1773,20 +2141,120 @@ def officials_reports_recent(request):
     if not official or not official.official_is_active or official.official_is_deleted:
         return Response({"message": "Unauthorized"}, status=401)
 
-    rows = _official_incident_queryset(official)[:12]
-    reports = [_incident_row_to_dict(row) for row in rows]
+    fields = _requested_fields(request, INCIDENT_ROW_FIELDS, INCIDENT_SUMMARY_FIELDS)
+    rows = list(_project_rows(
+        _primary_reports(request, _official_incident_queryset(official)), INCIDENT_ROW_FIELDS, fields
+    )[:12])
+    variants = _report_image_variants(rows, fields)
+    reports = [_incident_row_to_dict(row, request, variants, fields) for row in rows]
     return Response({"reports": reports}, status=200)
 
 
+@api_view(['GET'])
+def officials_report_detail(request):
+    official = _get_official_for_request(request)
+    if not official or not official.official_is_active or official.official_is_deleted:
+        return Response({"message": "Unauthorized"}, status=401)
+
+    report_id = request.query_params.get("id")
+    if not str(report_id or "").isdigit():
+        return Response({"message": "Missing id"}, status=400)
+    report = (
+        _official_incident_queryset(official).filter(report_id=report_id).first()
+        or _official_incident_queryset(official, IncidentReportArchive).filter(report_id=report_id).first()
+    )
+    if not report:
+        return Response({"message": "Report not found"}, status=404)
+    variants = _report_image_variants([report])
+    return Response({"report": _incident_row_to_dict(report, request, variants)}, status=200)
+
+
 @api_view(['GET'])
 def officials_reports_all(request):
     official = _get_official_for_request(request)
     if not official or not official.official_is_active or official.official_is_deleted:
         return Response({"message": "Unauthorized"}, status=401)
 
-    rows = _official_incident_queryset(official)
-    reports = [_incident_row_to_dict(row) for row in rows]
-    return Response({"reports": reports}, status=200)
+    fields = _requested_fields(request, INCIDENT_ROW_FIELDS, INCIDENT_SUMMARY_FIELDS)
+    models_to_read = [IncidentReport, IncidentReportArchive] if _include_archived(request) else [IncidentReport]
+    sources = [
+        _project_rows(
+            _primary_reports(request, _official_incident_queryset(official, model)).order_by("-created_at", "-report_id"),
+            INCIDENT_ROW_FIELDS,
+            fields,
+            extra_columns=("created_at",),
+        )
+        for model in models_to_read
+    ]
+    cursor_param = request.query_params.get("cursor")
+    limit_param = request.query_params.get("limit")
+    if cursor_param is None and limit_param is None:
+        rows = _merge_newest_first(*(qs.iterator(chunk_size=REPORTS_STREAM_CHUNK_SIZE) for qs in sources))
+        response = StreamingHttpResponse(_stream_reports_json(request, rows, fields), content_type="application/json")
+        response["Cache-Control"] = "no-cache"
+        return response
+
+    # Keyset pagination: seek past the last (created_at, report_id) instead of OFFSET.
+    try:
+        limit = min(max(int(limit_param or REPORTS_PAGE_DEFAULT), 1), REPORTS_PAGE_MAX)
+    except (TypeError, ValueError):
+        return Response({"message": "Invalid limit"}, status=400)
+    if cursor_param:
+        cursor = _decode_report_cursor(cursor_param)
+        if not cursor or not cursor[0]:
+            return Response({"message": "Invalid cursor"}, status=400)
+        created_at, report_id = cursor
+        seek = Q(created_at__lt=created_at) | Q(created_at=created_at, report_id__lt=report_id)
+        sources = [qs.filter(seek) for qs in sources]
+
+    page = list(_merge_newest_first(*(qs[: limit + 1] for qs in sources)))[: limit + 1]
+    next_cursor = _encode_report_cursor(page[limit - 1]) if len(page) > limit else None
+    page = page[:limit]
+    variants = _report_image_variants(page, fields)
+    reports = [_incident_row_to_dict(row, request, variants, fields) for row in page]
+    return Response({"reports": reports, "nextCursor": next_cursor}, status=200)
+
+
+@api_view(['GET'])
+def officials_reports_export(request):
+    official = _get_official_for_request(request)
+    if not official or not official.official_is_active or official.official_is_deleted:
+        return Response({"message": "Unauthorized"}, status=401)
+
+    # "format" is reserved by DRF for renderer selection, hence "fmt".
+    export_format = (request.query_params.get("fmt") or "csv").lower()
+    if export_format not in EXPORT_FORMATS:
+        return Response({"message": "fmt must be csv or ndjson"}, status=400)
+    try:
+        start_at, end_before = parse_export_range(
+            request.query_params.get("from"),
+            request.query_params.get("to"),
+        )
+    except ValueError as exc:
+        return Response({"message": str(exc)}, status=400)
+    compressed = request.query_params.get("gzip") in ("1", "true", "yes")
+
+    rows = filter_export_range(_official_incident_queryset(official), start_at, end_before)
+    archived = None
+    if _include_archived(request):
+        archived = filter_export_range(
+            _official_incident_queryset(official, IncidentReportArchive), start_at, end_before
+        )
+    chunks = export_chunks(rows, export_format, archived)
+    if compressed:
+        chunks = gzip_chunks(chunks)
+        content_type = "application/gzip"
+    elif export_format == "csv":
+        content_type = "text/csv; charset=utf-8"
+    else:
+        content_type = "application/x-ndjson"
+    response = StreamingHttpResponse(chunks, content_type=content_type)
+    response["Content-Disposition"] = (
+        f'attachment; filename="{export_filename(export_format, start_at, end_before, compressed)}"'
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
 
 
 @api_view(['GET'])
@@ -1795,19 +2263,57 @@ def officials_incidents_map(request):
     if not official or not official.official_is_active or official.official_is_deleted:
         return Response({"message": "Unauthorized"}, status=401)
 
-    rows = _official_incident_queryset(official).exclude(status="Completed")
+    scoped = _official_incident_queryset(official)
 
-    grouped: dict[tuple[str, str], dict] = {}
-    for row in rows:
-        location_value = (row.location_text or row.barangay or "").strip()
-        normalized_location = _normalize_location_key(location_value)
-        if not normalized_location:
-            if row.lat is not None and row.lng is not None:
-                normalized_location = f"{round(float(row.lat), 4)}:{round(float(row.lng), 4)}"
-            else:
-                normalized_location = f"report-{row.report_id}"
-        key = ((row.incident_type or "Fire"), normalized_location)
+    # Viewport mode: only read the geohash cells that intersect the visible map.
+    bbox = parse_bbox(request.query_params.get("bbox"))
+    precision = None
+    if bbox:
+        try:
+            zoom = int(request.query_params.get("zoom"))
+        except (TypeError, ValueError):
+            zoom = None
+        west, south, east, north = bbox
+        cells, precision = geohash_cells_for_bbox(
+            west, south, east, north, geohash_precision_for_zoom(zoom)
+        )
+        cell_query = Q()
+        for cell in cells:
+            cell_query |= Q(geohash__startswith=cell)
+        scoped = scoped.filter(cell_query).filter(
+            lat__gte=south,
+            lat__lte=north,
+            lng__gte=west,
+            lng__lte=east,
+        )
+
+    cursor, etag = _change_state(request, scoped, scope_params=("bbox", "zoom"))
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
 
+    rows = scoped.exclude(status="Completed").filter(duplicate_of__isnull=True).only(
+        "report_id", "incident_type", "location_text", "barangay", "lat", "lng", "geohash", "cluster_id"
+    )
+
+    # Delta mode: only rebuild the clusters touched by reports added, changed or resolved since the cursor.
+    since = _parse_change_cursor(request.query_params.get("since"))
+    changed_keys = None
+    if since:
+        changed_keys = {
+            cluster_id or -report_id
+            for cluster_id, report_id in scoped.filter(
+                updated_at__gt=since - CHANGE_CURSOR_OVERLAP
+            ).values_list("cluster_id", "report_id")
+        }
+        rows = rows.filter(
+            Q(cluster_id__in=[key for key in changed_keys if key > 0])
+            | Q(report_id__in=[-key for key in changed_keys if key < 0])
+        )
+
+    grouped: dict[int, dict] = {}
+    for row in rows:
+        # Legacy rows without a cluster yet are shown on their own until rebuild_incident_clusters runs.
+        key = row.cluster_id or -row.report_id
         entry = grouped.get(key)
         if not entry:
             grouped[key] = {
@@ -1816,8 +2322,10 @@ def officials_incidents_map(request):
                 "reports": 1,
                 "lat": float(row.lat) if row.lat is not None else None,
                 "lon": float(row.lng) if row.lng is not None else None,
-                "location": location_value,
+                "location": (row.location_text or row.barangay or "").strip(),
                 "reportIds": [row.report_id],
+                "cell": (row.geohash or "")[:precision],
+                "key": _map_entry_key(key),
             }
         else:
             entry["reports"] += 1
@@ -1827,12 +2335,38 @@ def officials_incidents_map(request):
             if entry["lon"] is None and row.lng is not None:
                 entry["lon"] = float(row.lng)
 
+    clusters = IncidentCluster.objects.in_bulk([key for key in grouped if key > 0])
     incidents = []
-    for entry in grouped.values():
+    for key, entry in grouped.items():
+        cluster = clusters.get(key)
+        if cluster:
+            entry["reports"] = max(cluster.open_count, entry["reports"])
+            if cluster.centroid_lat is not None and cluster.centroid_lng is not None:
+                entry["lat"] = cluster.centroid_lat
+                entry["lon"] = cluster.centroid_lng
         entry["urgency"] = _incident_urgency_from_count(entry["reports"])
         incidents.append(entry)
 
-    return Response({"incidents": incidents}, status=200)
+    payload = {"incidents": incidents, "cursor": cursor}
+    if precision:
+        payload["precision"] = precision
+    if changed_keys is not None:
+        payload["delta"] = True
+        payload["removed"] = [_map_entry_key(key) for key in changed_keys if key not in grouped]
+    response = Response(payload, status=200)
+    response["ETag"] = etag
+    return response
+
+
+def _start_reports(report_ids) -> int:
+    # Moves the reports and their near-duplicates to In Progress; returns how many rows changed.
+    opening = with_duplicates(IncidentReport.objects.select_for_update(), report_ids).exclude(status="In Progress")
+    changes = list(opening.values_list("cluster_id", "barangay_ref_id", "status"))
+    opening.update(status="In Progress", updated_at=timezone.now())
+    # Completed reports dispatched again count as open in their cluster once more.
+    reopen_reports_in_clusters([cluster_id for cluster_id, _, status in changes if status == "Completed"])
+    record_status_changes([(barangay_id, status, "In Progress") for _, barangay_id, status in changes])
+    return len(changes)
 
 
 @api_view(['POST'])
@@ -1849,11 +2383,16 @@ def officials_reports_dispatch(request):
     report = qs.filter(report_id=report_id).first()
     if not report:
         return Response({"message": "Report not found"}, status=404)
+    if report.duplicate_of_id:
+        # Services are alerted once per incident, through the report the others were linked to.
+        report = qs.filter(report_id=report.duplicate_of_id).first() or report
 
     report_count = _matching_report_count(report)
-    report.status = "In Progress"
-    report.save(update_fields=["status", "updated_at"])
-    notify_summary = _notify_services_for_report(report, report_count=report_count)
+    with transaction.atomic():
+        _start_reports([report.report_id])
+        report.status = "In Progress"
+        notify_summary = _notify_services_for_report(report, report_count=report_count)
+        publish_on_commit(INCIDENTS_TOPIC)
     return Response(
         {
             "message": "Dispatched",
@@ -1866,49 +2405,122 @@ def officials_reports_dispatch(request):
     )
 
 
+def _cluster_report_counts(reports: list[IncidentReport]) -> dict[int, int]:
+    cluster_ids = {report.cluster_id for report in reports if report.cluster_id}
+    return dict(IncidentCluster.objects.filter(pk__in=cluster_ids).values_list("cluster_id", "report_count"))
+
+
 @api_view(['POST'])
 def officials_reports_dispatch_all(request):
     official = _get_official_for_request(request)
     if not official or not official.official_is_active or official.official_is_deleted:
         return Response({"message": "Unauthorized"}, status=401)
 
-    qs = _official_incident_queryset(official).filter(status="Pending")
-    updated = 0
-    total_matched = 0
-    total_created = 0
-    total_sms_sent = 0
-    total_sms_failed = 0
-    for report in qs:
-        report_count = _matching_report_count(report)
-        report.status = "In Progress"
-        report.save(update_fields=["status", "updated_at"])
-        notify_summary = _notify_services_for_report(report, report_count=report_count)
-        total_matched += notify_summary["servicesMatched"]
-        total_created += notify_summary["notificationsCreated"]
-        total_sms_sent += notify_summary["smsSent"]
-        total_sms_failed += notify_summary["smsFailed"]
-        updated += 1
+    pending = list(
+        _official_incident_queryset(official)
+        .filter(status="Pending", duplicate_of__isnull=True)
+        .order_by("created_at", "report_id")
+        .only(
+            "report_id", "incident_type", "barangay", "barangay_ref_id", "location_text",
+            "lat", "lng", "cluster_id", "status",
+        )
+    )
+    if not pending:
+        return Response(
+            {
+                "message": "Dispatch complete",
+                "updated": 0,
+                "incidents": 0,
+                "servicesMatched": 0,
+                "notificationsCreated": 0,
+                "notificationsMerged": 0,
+                "smsQueued": 0,
+                "smsFailed": 0,
+            },
+            status=200,
+        )
+
+    # One dispatch per incident cluster: services get one alert per place, led by its first report and
+    # carrying every report in the group, so completing it closes them all. The reports themselves stay
+    # separate rows (no duplicate_of rewrite), so lists, the map and counters still show each of them.
+    groups: dict[int, list[IncidentReport]] = {}
+    for report in pending:
+        groups.setdefault(report.cluster_id or -report.report_id, []).append(report)
+    cluster_counts = _cluster_report_counts(pending)
+    services_by_target: dict[tuple, list] = {}
+    dispatches = []
+    with transaction.atomic():
+        updated = _start_reports([report.report_id for report in pending])
+        for reports in groups.values():
+            lead = reports[0]
+            lead.status = "In Progress"
+            # Services depend only on type and barangay; reports sharing both reuse one lookup.
+            target = (lead.incident_type, lead.barangay_ref_id or (lead.barangay or "").strip().lower())
+            if target not in services_by_target:
+                services_by_target[target] = _services_for_report(lead)
+            report_count = cluster_counts.get(lead.cluster_id) or _matching_report_count(lead)
+            report_ids = [report.report_id for report in reports]
+            dispatches.append((lead, services_by_target[target], report_count, report_ids))
+        notify_summary = _queue_dispatches(dispatches)
+        publish_on_commit(INCIDENTS_TOPIC)
+
     return Response(
         {
             "message": "Dispatch complete",
             "updated": updated,
-            "servicesMatched": total_matched,
-            "notificationsCreated": total_created,
-            "smsSent": total_sms_sent,
-            "smsFailed": total_sms_failed,
+            "incidents": len(groups),
+            "servicesMatched": notify_summary["servicesMatched"],
+            "notificationsCreated": notify_summary["notificationsCreated"],
+            "notificationsMerged": notify_summary["notificationsMerged"],
+            "smsQueued": notify_summary["smsQueued"],
+            "smsFailed": notify_summary["smsFailed"],
         },
         status=200,
     )
 
 
+SERVICE_FEED_PAGE_DEFAULT = 100
+SERVICE_FEED_PAGE_MAX = 200
+SERVICE_DISPATCH_STATUSES = {"dispatched": "Dispatched", "completed": "Completed"}
+
+
+def _encode_dispatch_cursor(row: ServiceDispatchNotification) -> str:
+    # Same layout as report cursors, so _decode_report_cursor reads it back.
+    raw = f"{row.created_at.isoformat()}|{row.dispatch_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
 @api_view(['GET'])
 def services_dispatch_notifications(request):
     service_user = _get_service_for_request(request)
     if not service_user or service_user.svc_is_deleted:
         return Response({"message": "Unauthorized"}, status=401)
 
-    rows = ServiceDispatchNotification.objects.filter(service=service_user).order_by("-created_at")[:100]
-    return Response({"dispatches": [_service_notification_payload(item) for item in rows]}, status=200)
+    rows = ServiceDispatchNotification.objects.filter(service=service_user)
+    status_param = (request.query_params.get("status") or "").strip()
+    if status_param:
+        status_value = SERVICE_DISPATCH_STATUSES.get(status_param.lower())
+        if not status_value:
+            return Response({"message": "Invalid status"}, status=400)
+        rows = rows.filter(status=status_value)
+
+    # Keyset pagination over dispatch_feed_idx: seek past the last (created_at, dispatch_id).
+    try:
+        limit = min(max(int(request.query_params.get("limit") or SERVICE_FEED_PAGE_DEFAULT), 1), SERVICE_FEED_PAGE_MAX)
+    except (TypeError, ValueError):
+        return Response({"message": "Invalid limit"}, status=400)
+    cursor_param = request.query_params.get("cursor")
+    if cursor_param:
+        cursor = _decode_report_cursor(cursor_param)
+        if not cursor or not cursor[0]:
+            return Response({"message": "Invalid cursor"}, status=400)
+        created_at, dispatch_id = cursor
+        rows = rows.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, dispatch_id__lt=dispatch_id))
+
+    page = _service_notification_rows(rows.order_by("-created_at", "-dispatch_id")[: limit + 1])
+    next_cursor = _encode_dispatch_cursor(page[limit - 1][0]) if len(page) > limit else None
+    dispatches = [_service_notification_payload(item, report) for item, report in page[:limit]]
+    return Response({"dispatches": dispatches, "nextCursor": next_cursor}, status=200)
 
 
 @api_view(['POST'])
@@ -1921,18 +2533,179 @@ def services_dispatch_complete(request):
     if not dispatch_id:
         return Response({"message": "Missing dispatchId"}, status=400)
 
-    row = ServiceDispatchNotification.objects.filter(
-        dispatch_id=dispatch_id,
-        service=service_user,
-    ).first()
-    if not row:
-        return Response({"message": "Dispatch not found"}, status=404)
+    with transaction.atomic():
+        # Locking the alert serialises concurrent completions: the second one waits, sees it
+        # already Completed and leaves the counters alone.
+        row = ServiceDispatchNotification.objects.select_for_update().filter(
+            dispatch_id=dispatch_id,
+            service=service_user,
+        ).first()
+        if not row:
+            return Response({"message": "Dispatch not found"}, status=404)
+        if row.status == "Completed":
+            return Response({"message": "Completed"}, status=200)
+
+        row.status = "Completed"
+        row.save(update_fields=["status", "updated_at"])
+
+        # Everything the alert covers, including reports merged into it after it went out.
+        open_reports = with_duplicates(IncidentReport.objects.select_for_update(), _dispatch_report_ids(row)).exclude(
+            status="Completed"
+        )
+        closing = list(open_reports.values_list("cluster_id", "barangay_ref_id", "status"))
+        open_reports.update(status="Completed", updated_at=timezone.now())
+        close_reports_in_clusters([cluster_id for cluster_id, _, _ in closing])
+        record_status_changes([(barangay_id, status, "Completed") for _, barangay_id, status in closing])
+        publish_on_commit(service_topic(service_user.svc_id), INCIDENTS_TOPIC)
+    return Response({"message": "Completed"}, status=200)
 
-    row.status = "Completed"
-    row.save(update_fields=["status"])
 
-    IncidentReport.objects.filter(report_id=row.report_id).update(status="Completed", updated_at=timezone.now())
-    return Response({"message": "Completed"}, status=200)
+# Streams end after a while so EventSource reconnects with a fresh token check and
+# workers are not pinned forever; Last-Event-ID resumes from the last change sent.
+STREAM_FALLBACK_SECONDS = 15
+STREAM_MAX_SECONDS = 300
+STREAM_BATCH_SIZE = 100
+
+
+def _authenticate_stream_request(request):
+    # EventSource cannot send an Authorization header, so also accept ?token=<access token>.
+    auth = JWTAuthentication()
+    try:
+        result = auth.authenticate(request)
+        if result:
+            return result[0]
+        raw_token = request.GET.get("token")
+        if raw_token:
+            return auth.get_user(auth.get_validated_token(raw_token))
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        return None
+    return None
+
+
+def _parse_stream_cursor(value: str | None):
+    # "<updated_at>|<pk>"; a bare timestamp from an older client resumes at the start of that instant.
+    if not value:
+        return None
+    moment, _, row_id = value.partition("|")
+    parsed = _parse_change_cursor(moment)
+    if not parsed:
+        return None
+    try:
+        return parsed, int(row_id or 0)
+    except ValueError:
+        return None
+
+
+def _encode_stream_cursor(cursor) -> str:
+    return f"{cursor[0].isoformat()}|{cursor[1]}"
+
+
+def _stream_start_cursor(request):
+    return (
+        _parse_stream_cursor(request.headers.get("Last-Event-ID"))
+        or _parse_stream_cursor(request.GET.get("since"))
+        or (timezone.now(), 0)
+    )
+
+
+def _after_stream_cursor(cursor, pk_name: str) -> Q:
+    # Keyset on (updated_at, pk): rows sharing one timestamp (bulk .update() stamps them all
+    # alike) are walked through in pk order instead of being skipped at a batch boundary.
+    updated_at, row_id = cursor
+    return Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, **{f"{pk_name}__gt": row_id})
+
+
+def _sse_message(event: str, data: dict, event_id: str | None = None) -> str:
+    lines = []
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def _event_stream(topics: tuple[str, ...], load_changes, cursor):
+    queue = broker.subscribe(*topics)
+    try:
+        yield "retry: 3000\n\n"
+        deadline = time.monotonic() + STREAM_MAX_SECONDS
+        while time.monotonic() < deadline:
+            events, cursor = await sync_to_async(load_changes)(cursor)
+            for event, data, event_cursor in events:
+                yield _sse_message(event, data, _encode_stream_cursor(event_cursor))
+            if len(events) >= STREAM_BATCH_SIZE:
+                continue
+            try:
+                await asyncio.wait_for(queue.get(), timeout=STREAM_FALLBACK_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+    finally:
+        broker.unsubscribe(queue)
+
+
+def _event_stream_response(stream) -> StreamingHttpResponse:
+    response = StreamingHttpResponse(stream, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+async def services_dispatch_stream(request):
+    request.user = await sync_to_async(_authenticate_stream_request)(request)
+    service_user = await sync_to_async(_get_service_for_request)(request)
+    if not service_user or service_user.svc_is_deleted:
+        return JsonResponse({"message": "Unauthorized"}, status=401)
+
+    def load_changes(cursor):
+        rows = _service_notification_rows(
+            ServiceDispatchNotification.objects.filter(
+                _after_stream_cursor(cursor, "dispatch_id"),
+                service=service_user,
+            ).order_by("updated_at", "dispatch_id")[:STREAM_BATCH_SIZE]
+        )
+        events = [
+            ("dispatch", _service_notification_payload(item, report), (item.updated_at, item.dispatch_id))
+            for item, report in rows
+        ]
+        return events, events[-1][2] if events else cursor
+
+    stream = _event_stream((service_topic(service_user.svc_id),), load_changes, _stream_start_cursor(request))
+    return _event_stream_response(stream)
+
+
+async def officials_stream(request):
+    request.user = await sync_to_async(_authenticate_stream_request)(request)
+    official = await sync_to_async(_get_official_for_request)(request)
+    if not official or not official.official_is_active or official.official_is_deleted:
+        return JsonResponse({"message": "Unauthorized"}, status=401)
+
+    def load_changes(cursor):
+        rows = list(
+            _official_incident_queryset(official)
+            .filter(_after_stream_cursor(cursor, "report_id"))
+            .only("report_id", "incident_type", "location_text", "barangay", "lat", "lng", "status", "cluster_id", "updated_at")
+            .order_by("updated_at", "report_id")[:STREAM_BATCH_SIZE]
+        )
+        events = [
+            (
+                "incident",
+                {
+                    "id": row.report_id,
+                    "type": row.incident_type,
+                    "status": row.status,
+                    "location": row.location_text or row.barangay or "",
+                    "lat": row.lat,
+                    "lng": row.lng,
+                    "key": _map_entry_key(row.cluster_id or -row.report_id),
+                },
+                (row.updated_at, row.report_id),
+            )
+            for row in rows
+        ]
+        return events, events[-1][2] if events else cursor
+
+    stream = _event_stream((INCIDENTS_TOPIC,), load_changes, _stream_start_cursor(request))
+    return _event_stream_response(stream)
 
 
 @api_view(['GET'])
@@ -1942,8 +2715,14 @@ def officials_notifications(request):
         return Response({"message": "Unauthorized"}, status=401)
 
     rows = _official_incident_queryset(official)
+    cursor, etag = _change_state(request, rows)
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+
+    since = _parse_change_cursor(request.query_params.get("since"))
+    changed = rows.filter(updated_at__gt=since - CHANGE_CURSOR_OVERLAP) if since else rows
     notifications = []
-    for row in rows[:20]:
+    for row in changed.only("report_id", "incident_type", "location_text", "barangay", "status", "created_at")[:20]:
         notifications.append(
             {
                 "id": row.report_id,
@@ -1955,7 +2734,12 @@ def officials_notifications(request):
         )
 
     unread_count = rows.filter(status="Pending").count()
-    return Response({"unreadCount": unread_count, "notifications": notifications}, status=200)
+    payload = {"unreadCount": unread_count, "notifications": notifications, "cursor": cursor}
+    if since:
+        payload["delta"] = True
+    response = Response(payload, status=200)
+    response["ETag"] = etag
+    return response
 
 
 @api_view(['POST'])
@@ -2070,8 +2854,9 @@ def officials_profile_update(request):
     official.official_name = (request.data.get("name") or official.official_name or "").strip()
     official.official_barangay = (request.data.get("barangay") or request.data.get("location") or official.official_barangay or "").strip()
     official.official_contact_number = (request.data.get("contact") or official.official_contact_number or "").strip()
+    official.barangay_ref_id = gazetteer.resolve(official.official_barangay)
     official.official_updated_on = timezone.now()
-    official.save(update_fields=["official_name", "official_barangay", "official_contact_number", "official_updated_on"])
+    official.save(update_fields=["official_name", "official_barangay", "barangay_ref", "official_contact_number", "official_updated_on"])
 
     return Response({"message": "Profile updated"}, status=200)
 
@@ -2154,6 +2939,7 @@ def residents_profile_update(request):
     resident.res_middlename = (request.data.get("middleName") or resident.res_middlename or "").strip()
     resident.res_lastname = (request.data.get("lastName") or resident.res_lastname or "").strip()
     resident.res_location = (request.data.get("location") or resident.res_location or "").strip()
+    resident.barangay_ref_id = gazetteer.resolve(resident.res_location)
 
     age_value = request.data.get("age")
     if age_value not in (None, ""):
@@ -2173,6 +2959,7 @@ def residents_profile_update(request):
         "res_middlename",
         "res_lastname",
         "res_location",
+        "barangay_ref",
         "res_age",
         "res_gender",
         "res_contact_number",
@@ -2237,6 +3024,8 @@ def services_profile(request):
             "profile": {
                 "teamName": service.svc_name or "",
                 "location": service.svc_location or "",
+                "lat": service.svc_lat,
+                "lng": service.svc_lng,
                 "email": service.svc_email_address or "",
                 "contact": service.svc_contact_number or "",
                 "avatarUrl": _get_avatar_url(request, "Services", service.svc_email_address),
@@ -2255,8 +3044,18 @@ def services_profile_update(request):
     service.svc_name = (request.data.get("teamName") or service.svc_name or "").strip()
     service.svc_location = (request.data.get("location") or service.svc_location or "").strip()
     service.svc_contact_number = (request.data.get("contact") or service.svc_contact_number or "").strip()
+    service.barangay_ref_id = gazetteer.resolve(service.svc_location)
+    service.svc_lat, service.svc_lng = _service_coordinates(request.data, service.svc_lat, service.svc_lng)
     service.svc_updated_on = timezone.now()
-    service.save(update_fields=["svc_name", "svc_location", "svc_contact_number", "svc_updated_on"])
+    service.save(update_fields=[
+        "svc_name",
+        "svc_location",
+        "barangay_ref",
+        "svc_lat",
+        "svc_lng",
+        "svc_contact_number",
+        "svc_updated_on",
+    ])
 
     return Response({"message": "Profile updated"}, status=200)
 
@@ -0,0 +1,38 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("officials", "0004_create_brgy_officials_if_missing"),
+        ("residents", "0004_barangay_resident_barangay_ref"),
+    ]
+
+    operations = [
+        # brgy_officials is unmanaged, so the column is added by hand and AddField only updates state.
+        migrations.RunSQL(
+            sql="""
+                ALTER TABLE brgy_officials
+                    ADD COLUMN IF NOT EXISTS barangay_id INTEGER NULL
+                    REFERENCES barangays (barangay_id) ON DELETE SET NULL DEFERRABLE INITIALLY DEFERRED;
+                CREATE INDEX IF NOT EXISTS brgy_officials_barangay_id_idx ON brgy_officials (barangay_id);
+            """,
+            reverse_sql="""
+                DROP INDEX IF EXISTS brgy_officials_barangay_id_idx;
+                ALTER TABLE brgy_officials DROP COLUMN IF EXISTS barangay_id;
+            """,
+        ),
+        migrations.AddField(
+            model_name="brgyofficial",
+            name="barangay_ref",
+            field=models.ForeignKey(
+                blank=True,
+                db_column="barangay_id",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="officials",
+                to="residents.barangay",
+            ),
+        ),
+    ]
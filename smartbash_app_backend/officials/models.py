@@ -1,4 +1,5 @@
 from django.db import models
+from residents.models import Barangay
 
 class BrgyOfficial(models.Model):
     official_id = models.AutoField(primary_key=True)
@@ -12,6 +13,14 @@ class BrgyOfficial(models.Model):
     official_added_on = models.DateTimeField(auto_now_add=True)
     official_updated_on = models.DateTimeField(blank=True, null=True)
     official_is_deleted = models.BooleanField(default=False)
+    barangay_ref = models.ForeignKey(
+        Barangay,
+        on_delete=models.SET_NULL,
+        related_name='officials',
+        db_column='barangay_id',
+        blank=True,
+        null=True,
+    )
 
     class Meta:
         managed = False
@@ -1,35 +1,31 @@
-import re
-
 from django.contrib.auth.models import User
 from django.db import transaction
+from django.db.models import Q
 from django.db.models.signals import post_save, pre_delete
 from django.dispatch import receiver
 
+from residents import gazetteer
 from residents.models import Resident
 from .models import BrgyOfficial
 
 
-def _normalize_barangay(value: str | None) -> str:
-    text = (value or "").strip().lower()
-    text = re.sub(r"\bbarangay\b", "", text)
-    text = re.sub(r"\bbrgy\.?\b", "", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
-
-
-def _cleanup_residents_for_barangay(barangay: str | None):
-    target = _normalize_barangay(barangay)
-    if not target:
-        return
-
+def _cleanup_residents_for_barangay(official: BrgyOfficial):
     residents = Resident.objects.filter(res_is_deleted=False)
-    matched = []
-    for resident in residents:
-        resident_loc = _normalize_barangay(resident.res_location)
-        if not resident_loc:
-            continue
-        if target in resident_loc or resident_loc in target:
-            matched.append(resident)
+    if official.barangay_ref_id:
+        # Residents the backfill could not link are still matched on their location text.
+        matched = [
+            resident
+            for resident in residents.filter(Q(barangay_ref_id=official.barangay_ref_id) | Q(barangay_ref__isnull=True))
+            if resident.barangay_ref_id or gazetteer.same_barangay(official.official_barangay, resident.res_location)
+        ]
+    else:
+        if not gazetteer.match(official.official_barangay):
+            return
+        matched = [
+            resident
+            for resident in residents
+            if gazetteer.same_barangay(official.official_barangay, resident.res_location)
+        ]
 
     if not matched:
         return
@@ -45,9 +41,9 @@ def _cleanup_residents_for_barangay(barangay: str | None):
 @receiver(post_save, sender=BrgyOfficial)
 def delete_barangay_residents_on_soft_delete(sender, instance: BrgyOfficial, **kwargs):
     if instance.official_is_deleted:
-        _cleanup_residents_for_barangay(instance.official_barangay)
+        _cleanup_residents_for_barangay(instance)
 
 
 @receiver(pre_delete, sender=BrgyOfficial)
 def delete_barangay_residents_on_hard_delete(sender, instance: BrgyOfficial, **kwargs):
-    _cleanup_residents_for_barangay(instance.official_barangay)
+    _cleanup_residents_for_barangay(instance)
@@ -0,0 +1,66 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import IncidentReport, IncidentReportArchive
+
+ARCHIVE_COLUMNS = (
+    "report_id",
+    "resident_email",
+    "resident_name",
+    "barangay",
+    "barangay_ref_id",
+    "incident_type",
+    "description",
+    "location_text",
+    "lat",
+    "lng",
+    "geohash",
+    "cluster_id",
+    "duplicate_of_id",
+    "duplicate_count",
+    "client_key",
+    "reported_at",
+    "images",
+    "status",
+    "created_at",
+    "updated_at",
+)
+
+
+def archivable_reports(days: int):
+    # Completed reports untouched for `days`; updated_at is when they were completed.
+    cutoff = timezone.now() - timedelta(days=days)
+    return IncidentReport.objects.filter(status="Completed", updated_at__lt=cutoff)
+
+
+def archive_batch(report_ids: list[int]) -> int:
+    with transaction.atomic():
+        rows = list(
+            IncidentReport.objects.select_for_update(skip_locked=True)
+            .filter(report_id__in=report_ids, status="Completed")
+            .values(*ARCHIVE_COLUMNS)
+        )
+        if not rows:
+            return 0
+        IncidentReportArchive.objects.bulk_create(
+            [IncidentReportArchive(**row) for row in rows],
+            ignore_conflicts=True,
+        )
+        IncidentReport.objects.filter(report_id__in=[row["report_id"] for row in rows]).delete()
+    return len(rows)
+
+
+def archive_reports(days: int, batch_size: int = 500, limit: int | None = None) -> int:
+    archived = 0
+    last_id = 0
+    candidates = archivable_reports(days).order_by("report_id").values_list("report_id", flat=True)
+    while limit is None or archived < limit:
+        size = batch_size if limit is None else min(batch_size, limit - archived)
+        report_ids = list(candidates.filter(report_id__gt=last_id)[:size])
+        if not report_ids:
+            break
+        last_id = report_ids[-1]
+        archived += archive_batch(report_ids)
+    return archived
@@ -0,0 +1,156 @@
+import re
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import IncidentCluster, IncidentReport
+
+
+def location_key(value: str | None) -> str:
+    text = (value or "").strip().lower()
+    # Normalize punctuation/spacing so same place text groups together reliably.
+    text = re.sub(r"[^a-z0-9]+", " ", text)
+    return " ".join(text.split())
+
+
+def cluster_key_for_report(report: IncidentReport) -> str:
+    key = location_key(report.location_text or report.barangay)
+    if key:
+        return key
+    if report.lat is not None and report.lng is not None:
+        return f"{round(float(report.lat), 4)}:{round(float(report.lng), 4)}"
+    return f"report-{report.report_id}"
+
+
+def attach_report_to_cluster(report: IncidentReport) -> IncidentCluster:
+    incident_type = report.incident_type or "Fire"
+    key = cluster_key_for_report(report)
+    seen_at = report.created_at
+    is_open = report.status != "Completed"
+    located = report.lat is not None and report.lng is not None
+
+    with transaction.atomic():
+        cluster, _ = IncidentCluster.objects.get_or_create(
+            incident_type=incident_type,
+            cluster_key=key,
+            defaults={"first_seen_at": seen_at, "last_seen_at": seen_at},
+        )
+        # Single UPDATE so concurrent submissions for the same place never lose a count.
+        changes = {
+            "report_count": F("report_count") + 1,
+            "last_seen_at": seen_at,
+            "updated_at": timezone.now(),
+        }
+        if is_open:
+            changes["open_count"] = F("open_count") + 1
+        if located:
+            lat = float(report.lat)
+            lng = float(report.lng)
+            changes.update(
+                located_count=F("located_count") + 1,
+                lat_sum=F("lat_sum") + lat,
+                lng_sum=F("lng_sum") + lng,
+                centroid_lat=(F("lat_sum") + lat) / (F("located_count") + 1),
+                centroid_lng=(F("lng_sum") + lng) / (F("located_count") + 1),
+            )
+        IncidentCluster.objects.filter(pk=cluster.pk).update(**changes)
+        IncidentReport.objects.filter(pk=report.pk).update(cluster=cluster)
+
+    report.cluster_id = cluster.pk
+    cluster.refresh_from_db()
+    return cluster
+
+
+def _count_by_cluster(cluster_ids: list[int | None]) -> dict[int, int]:
+    counts: dict[int, int] = {}
+    for cluster_id in cluster_ids:
+        if cluster_id:
+            counts[cluster_id] = counts.get(cluster_id, 0) + 1
+    return counts
+
+
+def recount_open_reports(cluster_id: int) -> int:
+    # Authoritative open_count for one cluster, recomputed from its reports.
+    open_count = IncidentReport.objects.filter(cluster_id=cluster_id).exclude(status="Completed").count()
+    IncidentCluster.objects.filter(pk=cluster_id).update(open_count=open_count, updated_at=timezone.now())
+    return open_count
+
+
+def reopen_reports_in_clusters(cluster_ids: list[int | None]):
+    # One entry per report moving from Completed back to an open status.
+    for cluster_id, reopened in _count_by_cluster(cluster_ids).items():
+        IncidentCluster.objects.filter(pk=cluster_id).update(
+            open_count=F("open_count") + reopened,
+            updated_at=timezone.now(),
+        )
+
+
+def close_reports_in_clusters(cluster_ids: list[int | None]):
+    # One entry per report moving to Completed. A count that would go negative has drifted from
+    # the reports, so that cluster is recounted from its rows instead of being left as it is.
+    for cluster_id, closed in _count_by_cluster(cluster_ids).items():
+        updated = IncidentCluster.objects.filter(pk=cluster_id, open_count__gte=closed).update(
+            open_count=F("open_count") - closed,
+            updated_at=timezone.now(),
+        )
+        if not updated:
+            recount_open_reports(cluster_id)
+
+
+def rebuild_clusters(batch_size: int = 2000) -> int:
+    totals: dict[tuple[str, str], dict] = {}
+    rows = IncidentReport.objects.order_by("created_at").only(
+        "report_id", "incident_type", "location_text", "barangay", "lat", "lng", "status", "created_at"
+    )
+    for report in rows.iterator(chunk_size=batch_size):
+        bucket = totals.setdefault(
+            (report.incident_type or "Fire", cluster_key_for_report(report)),
+            {
+                "report_count": 0,
+                "open_count": 0,
+                "located_count": 0,
+                "lat_sum": 0.0,
+                "lng_sum": 0.0,
+                "first_seen_at": report.created_at,
+                "last_seen_at": report.created_at,
+            },
+        )
+        bucket["report_count"] += 1
+        bucket["last_seen_at"] = report.created_at
+        if report.status != "Completed":
+            bucket["open_count"] += 1
+        if report.lat is not None and report.lng is not None:
+            bucket["located_count"] += 1
+            bucket["lat_sum"] += float(report.lat)
+            bucket["lng_sum"] += float(report.lng)
+
+    with transaction.atomic():
+        IncidentReport.objects.update(cluster=None)
+        IncidentCluster.objects.all().delete()
+        clusters = IncidentCluster.objects.bulk_create(
+            [
+                IncidentCluster(
+                    incident_type=incident_type,
+                    cluster_key=key,
+                    centroid_lat=(b["lat_sum"] / b["located_count"]) if b["located_count"] else None,
+                    centroid_lng=(b["lng_sum"] / b["located_count"]) if b["located_count"] else None,
+                    **b,
+                )
+                for (incident_type, key), b in totals.items()
+            ],
+            batch_size=batch_size,
+        )
+        cluster_ids = {(c.incident_type, c.cluster_key): c.pk for c in clusters}
+
+        batch = []
+        for report in rows.iterator(chunk_size=batch_size):
+            report.cluster_id = cluster_ids.get((report.incident_type or "Fire", cluster_key_for_report(report)))
+            batch.append(report)
+            if len(batch) >= batch_size:
+                IncidentReport.objects.bulk_update(batch, ["cluster"])
+                batch = []
+        if batch:
+            IncidentReport.objects.bulk_update(batch, ["cluster"])
+
+    return len(clusters)
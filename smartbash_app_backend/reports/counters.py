@@ -0,0 +1,108 @@
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import BarangayIncidentCounter, IncidentReport, IncidentReportArchive
+
+TYPE_COUNTER_FIELDS = {
+    "Fire": "fire_reports",
+    "Flood": "flood_reports",
+}
+STATUS_COUNTER_FIELDS = {
+    "Pending": "pending_reports",
+    "In Progress": "in_progress_reports",
+    "Completed": "resolved_reports",
+}
+SUMMARY_FIELDS = {
+    "totalReports": "total_reports",
+    "fireReports": "fire_reports",
+    "floodReports": "flood_reports",
+    "pendingReports": "pending_reports",
+    "inProgressReports": "in_progress_reports",
+    "resolvedReports": "resolved_reports",
+}
+
+
+def _counter_aggregates() -> dict:
+    aggregates = {"total_reports": Count("report_id")}
+    for incident_type, field in TYPE_COUNTER_FIELDS.items():
+        aggregates[field] = Count("report_id", filter=Q(incident_type=incident_type))
+    for status, field in STATUS_COUNTER_FIELDS.items():
+        aggregates[field] = Count("report_id", filter=Q(status=status))
+    return aggregates
+
+
+def summarize_reports(*querysets) -> dict:
+    # One conditional aggregate per queryset instead of a COUNT(*) per dashboard figure; pass the
+    # live and archive querysets together to get the same history the counters hold.
+    summary = dict.fromkeys(SUMMARY_FIELDS, 0)
+    for queryset in querysets:
+        totals = queryset.order_by().aggregate(**_counter_aggregates())
+        for label, field in SUMMARY_FIELDS.items():
+            summary[label] += totals[field] or 0
+    return summary
+
+
+def counter_summary(counter: BarangayIncidentCounter, extra: dict | None = None) -> dict:
+    return {label: getattr(counter, field) + (extra or {}).get(label, 0) for label, field in SUMMARY_FIELDS.items()}
+
+
+def _apply(barangay_id: int, deltas: dict[str, int]):
+    changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    if not changes:
+        return
+    BarangayIncidentCounter.objects.get_or_create(barangay_id=barangay_id)
+    BarangayIncidentCounter.objects.filter(pk=barangay_id).update(updated_at=timezone.now(), **changes)
+
+
+def record_report_created(report: IncidentReport):
+    if not report.barangay_ref_id:
+        return
+    deltas = {"total_reports": 1}
+    type_field = TYPE_COUNTER_FIELDS.get(report.incident_type)
+    if type_field:
+        deltas[type_field] = 1
+    status_field = STATUS_COUNTER_FIELDS.get(report.status)
+    if status_field:
+        deltas[status_field] = 1
+    _apply(report.barangay_ref_id, deltas)
+
+
+def record_status_changes(changes: list[tuple[int | None, str, str]]):
+    # changes: (barangay_id, old status, new status) for each report moved.
+    per_barangay: dict[int, dict[str, int]] = {}
+    for barangay_id, old_status, new_status in changes:
+        if not barangay_id or old_status == new_status:
+            continue
+        deltas = per_barangay.setdefault(barangay_id, {})
+        old_field = STATUS_COUNTER_FIELDS.get(old_status)
+        new_field = STATUS_COUNTER_FIELDS.get(new_status)
+        if old_field:
+            deltas[old_field] = deltas.get(old_field, 0) - 1
+        if new_field:
+            deltas[new_field] = deltas.get(new_field, 0) + 1
+    for barangay_id, deltas in per_barangay.items():
+        _apply(barangay_id, deltas)
+
+
+def rebuild_counters(report_models=(IncidentReport, IncidentReportArchive), counter_model=BarangayIncidentCounter) -> int:
+    # Counters cover the full history, so archived reports are summed in with the live ones.
+    # Data migrations pass their historical models.
+    totals = {}
+    for model in report_models:
+        rows = (
+            model.objects.filter(barangay_ref__isnull=False)
+            .order_by()
+            .values("barangay_ref")
+            .annotate(**_counter_aggregates())
+        )
+        for row in rows:
+            barangay_id = row.pop("barangay_ref")
+            current = totals.setdefault(barangay_id, dict.fromkeys(row, 0))
+            for field, value in row.items():
+                current[field] += value
+    counters = [counter_model(barangay_id=barangay_id, **row) for barangay_id, row in totals.items()]
+    with transaction.atomic():
+        counter_model.objects.all().delete()
+        counter_model.objects.bulk_create(counters)
+    return len(counters)
@@ -0,0 +1,120 @@
+import math
+import os
+from datetime import timedelta
+
+from django.db.models import F, Q
+from django.utils import timezone
+
+from residents import gazetteer
+
+from .geohash import geohash_cells_for_bbox
+from .models import IncidentReport
+
+DUPLICATE_RADIUS_METERS = float(os.environ.get("INCIDENT_DUPLICATE_RADIUS_METERS", "150"))
+DUPLICATE_WINDOW_MINUTES = int(os.environ.get("INCIDENT_DUPLICATE_WINDOW_MINUTES", "30"))
+# At most a 3x3 block of geohash cells is searched around a new report.
+DUPLICATE_MAX_CELLS = 9
+
+_EARTH_RADIUS_METERS = 6371000.0
+_METERS_PER_DEGREE_LAT = 111320.0
+
+
+def distance_meters(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * _EARTH_RADIUS_METERS * math.asin(math.sqrt(a))
+
+
+def _nearby_cells(lat: float, lng: float, radius: float) -> list[str]:
+    dlat = radius / _METERS_PER_DEGREE_LAT
+    dlng = radius / (_METERS_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 0.01))
+    cells, _ = geohash_cells_for_bbox(
+        max(lng - dlng, -180.0),
+        max(lat - dlat, -90.0),
+        min(lng + dlng, 180.0),
+        min(lat + dlat, 90.0),
+        precision=8,
+        max_cells=DUPLICATE_MAX_CELLS,
+    )
+    return cells
+
+
+def same_barangay(barangay_ref_id: int | None, barangay: str | None, other) -> bool:
+    # Reports are only duplicates within one barangay: by link when both rows have one, otherwise
+    # by the gazetteer key of their barangay text.
+    if barangay_ref_id and other.barangay_ref_id:
+        return barangay_ref_id == other.barangay_ref_id
+    return gazetteer.same_barangay(barangay, other.barangay)
+
+
+def find_duplicate_parent(
+    incident_type: str,
+    lat: float | None,
+    lng: float | None,
+    barangay_ref_id: int | None = None,
+    barangay: str | None = None,
+    seen_at=None,
+    radius: float = DUPLICATE_RADIUS_METERS,
+    window_minutes: int = DUPLICATE_WINDOW_MINUTES,
+) -> IncidentReport | None:
+    # Nearest open, non-duplicate report of the same type and barangay within radius metres and the
+    # time window.
+    # (incident_type, created_at) narrows to the last few minutes; geohash prefixes narrow to the block.
+    if lat is None or lng is None or radius <= 0 or window_minutes <= 0:
+        return None
+    cells = _nearby_cells(lat, lng, radius)
+    if not cells:
+        return None
+    cell_query = Q()
+    for cell in cells:
+        cell_query |= Q(geohash__startswith=cell)
+    # seen_at is when the new report was made (the device's time for a queued offline report);
+    # candidates are compared by their own report time, created_at only narrows the scan.
+    seen_at = seen_at or timezone.now()
+    window = timedelta(minutes=window_minutes)
+    candidates = (
+        IncidentReport.objects.filter(
+            cell_query,
+            incident_type=incident_type,
+            duplicate_of__isnull=True,
+            created_at__gte=seen_at - window,
+        )
+        .exclude(status="Completed")
+        .only("report_id", "lat", "lng", "status", "created_at", "reported_at", "barangay", "barangay_ref_id")
+    )
+    if barangay_ref_id:
+        candidates = candidates.filter(Q(barangay_ref_id=barangay_ref_id) | Q(barangay_ref__isnull=True))
+    candidates = [
+        candidate
+        for candidate in candidates
+        if abs((candidate.reported_at or candidate.created_at) - seen_at) <= window
+        and same_barangay(barangay_ref_id, barangay, candidate)
+    ]
+    return nearest_report(lat, lng, candidates, radius)
+
+
+def nearest_report(lat: float, lng: float, candidates, radius: float = DUPLICATE_RADIUS_METERS):
+    best = None
+    best_distance = radius
+    for candidate in candidates:
+        if candidate.lat is None or candidate.lng is None:
+            continue
+        distance = distance_meters(lat, lng, candidate.lat, candidate.lng)
+        if distance <= best_distance:
+            best, best_distance = candidate, distance
+    return best
+
+
+def record_duplicate(parent_id: int, count: int = 1):
+    IncidentReport.objects.filter(pk=parent_id).update(
+        duplicate_count=F("duplicate_count") + count,
+        updated_at=timezone.now(),
+    )
+
+
+def with_duplicates(queryset, report_ids):
+    # The given reports plus every report linked to them as a duplicate.
+    report_ids = list(report_ids)
+    return queryset.filter(Q(report_id__in=report_ids) | Q(duplicate_of_id__in=report_ids))
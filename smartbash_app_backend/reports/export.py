@@ -0,0 +1,112 @@
+import csv
+import heapq
+import json
+import zlib
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+EXPORT_FORMATS = ("csv", "ndjson")
+EXPORT_CHUNK_SIZE = 2000
+
+# Image blobs are deliberately left out: they dominate row size and are not part of the filings.
+EXPORT_COLUMNS = (
+    ("report_id", "id"),
+    ("created_at", "date"),
+    ("updated_at", "updatedAt"),
+    ("incident_type", "category"),
+    ("status", "status"),
+    ("barangay", "barangay"),
+    ("location_text", "location"),
+    ("lat", "lat"),
+    ("lng", "lng"),
+    ("resident_name", "residentName"),
+    ("resident_email", "residentEmail"),
+    ("description", "description"),
+)
+
+
+def parse_export_range(start: str | None, end: str | None):
+    # Inclusive YYYY-MM-DD bounds in the project timezone; raises ValueError on bad input.
+    bounds = []
+    for value in (start, end):
+        if not value:
+            bounds.append(None)
+            continue
+        day = parse_date(value)
+        if not day:
+            raise ValueError(f"Invalid date: {value}")
+        bounds.append(day)
+    start_day, end_day = bounds
+    start_at = timezone.make_aware(datetime.combine(start_day, time.min)) if start_day else None
+    end_before = timezone.make_aware(datetime.combine(end_day + timedelta(days=1), time.min)) if end_day else None
+    return start_at, end_before
+
+
+def filter_export_range(queryset, start_at, end_before):
+    if start_at:
+        queryset = queryset.filter(created_at__gte=start_at)
+    if end_before:
+        queryset = queryset.filter(created_at__lt=end_before)
+    return queryset
+
+
+def _export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def _export_rows(queryset, fields):
+    return queryset.order_by("created_at", "report_id").values_list(*fields).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def export_chunks(queryset, export_format: str = "csv", archived=None):
+    # values_list + iterator(): a server-side cursor on PostgreSQL, no model instances, no images.
+    # archived, when given, is the matching IncidentReportArchive queryset, merged in date order.
+    fields = [field for field, _ in EXPORT_COLUMNS]
+    labels = [label for _, label in EXPORT_COLUMNS]
+    rows = _export_rows(queryset, fields)
+    if archived is not None:
+        rows = heapq.merge(rows, _export_rows(archived, fields), key=lambda row: (row[1], row[0]))
+
+    if export_format == "ndjson":
+        for row in rows:
+            yield json.dumps(dict(zip(labels, map(_export_value, row)))) + "\n"
+        return
+
+    writer = csv.writer(_Echo())
+    yield writer.writerow(labels)
+    for row in rows:
+        yield writer.writerow([_export_value(value) if value is not None else "" for value in row])
+
+
+def gzip_chunks(chunks, flush_bytes: int = 64 * 1024):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    pending = 0
+    for chunk in chunks:
+        data = chunk.encode("utf-8")
+        pending += len(data)
+        out = compressor.compress(data)
+        if pending >= flush_bytes:
+            out += compressor.flush(zlib.Z_SYNC_FLUSH)
+            pending = 0
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def export_filename(export_format: str, start_at, end_before, compressed: bool) -> str:
+    parts = ["incident-reports"]
+    if start_at:
+        parts.append(timezone.localtime(start_at).date().isoformat())
+    if end_before:
+        parts.append((timezone.localtime(end_before) - timedelta(days=1)).date().isoformat())
+    name = "_".join(parts) + f".{export_format}"
+    return name + ".gz" if compressed else name
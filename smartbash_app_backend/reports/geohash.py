@@ -0,0 +1,119 @@
+import math
+
+GEOHASH_PRECISION = 8
+MAX_VIEWPORT_CELLS = 64
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def encode_geohash(lat: float | None, lng: float | None, precision: int = GEOHASH_PRECISION) -> str | None:
+    if lat is None or lng is None:
+        return None
+    try:
+        lat = float(lat)
+        lng = float(lng)
+    except (TypeError, ValueError):
+        return None
+    if not (-90.0 <= lat <= 90.0 and -180.0 <= lng <= 180.0):
+        return None
+
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bit = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        if even:
+            mid = (lng_range[0] + lng_range[1]) / 2
+            if lng >= mid:
+                value = (value << 1) | 1
+                lng_range[0] = mid
+            else:
+                value <<= 1
+                lng_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if lat >= mid:
+                value = (value << 1) | 1
+                lat_range[0] = mid
+            else:
+                value <<= 1
+                lat_range[1] = mid
+        even = not even
+        bit += 1
+        if bit == 5:
+            chars.append(_BASE32[value])
+            bit = 0
+            value = 0
+    return "".join(chars)
+
+
+def geohash_cell_size(precision: int) -> tuple[float, float]:
+    # (lat degrees, lng degrees) covered by a single cell at this precision.
+    bits = precision * 5
+    lng_bits = (bits + 1) // 2
+    lat_bits = bits // 2
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lng_bits)
+
+
+def geohash_precision_for_zoom(zoom: int | None) -> int:
+    # Leaflet zoom levels -> cell size roughly matching what one screen shows.
+    if zoom is None:
+        return 5
+    if zoom <= 9:
+        return 3
+    if zoom <= 11:
+        return 4
+    if zoom <= 13:
+        return 5
+    if zoom <= 15:
+        return 6
+    return 7
+
+
+def parse_bbox(value: str | None) -> tuple[float, float, float, float] | None:
+    # Leaflet's toBBoxString() order: west,south,east,north
+    if not value:
+        return None
+    try:
+        west, south, east, north = [float(part) for part in value.split(",")]
+    except (TypeError, ValueError):
+        return None
+    south, north = max(min(south, north), -90.0), min(max(south, north), 90.0)
+    west, east = max(min(west, east), -180.0), min(max(west, east), 180.0)
+    return west, south, east, north
+
+
+def geohash_cells_for_bbox(
+    west: float,
+    south: float,
+    east: float,
+    north: float,
+    precision: int,
+    max_cells: int = MAX_VIEWPORT_CELLS,
+) -> tuple[list[str], int]:
+    # Coarsen the precision until the viewport is covered by at most max_cells prefixes.
+    while precision > 1:
+        cell_lat, cell_lng = geohash_cell_size(precision)
+        rows = math.floor((north + 90.0) / cell_lat) - math.floor((south + 90.0) / cell_lat) + 1
+        cols = math.floor((east + 180.0) / cell_lng) - math.floor((west + 180.0) / cell_lng) + 1
+        if rows * cols <= max_cells:
+            break
+        precision -= 1
+
+    cell_lat, cell_lng = geohash_cell_size(precision)
+    first_row = math.floor((south + 90.0) / cell_lat)
+    last_row = math.floor((north + 90.0) / cell_lat)
+    first_col = math.floor((west + 180.0) / cell_lng)
+    last_col = math.floor((east + 180.0) / cell_lng)
+
+    cells = set()
+    for row in range(first_row, last_row + 1):
+        center_lat = min(-90.0 + (row + 0.5) * cell_lat, 90.0)
+        for col in range(first_col, last_col + 1):
+            center_lng = min(-180.0 + (col + 0.5) * cell_lng, 180.0)
+            cell = encode_geohash(center_lat, center_lng, precision)
+            if cell:
+                cells.add(cell)
+    return sorted(cells), precision
@@ -0,0 +1,117 @@
+import base64
+import binascii
+import os
+
+from django.core.files.storage import default_storage
+
+from auth_app import media_store
+from auth_app.models import MediaBlob
+
+from .models import IncidentReport, IncidentReportArchive
+
+INCIDENT_IMAGE_MAX_BYTES = int(os.environ.get("INCIDENT_IMAGE_MAX_BYTES", str(10 * 1024 * 1024)))
+
+_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/jpg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+    "image/gif": ".gif",
+}
+
+
+def is_data_url(value) -> bool:
+    return isinstance(value, str) and value[:5].lower() == "data:"
+
+
+def save_data_url(value: str) -> str | None:
+    # data:image/jpeg;base64,... -> content-addressed blob key (one reference taken).
+    header, _, encoded = value.partition(",")
+    parts = header[5:].lower().split(";")
+    if "base64" not in parts[1:]:
+        return None
+    extension = _EXTENSIONS.get(parts[0])
+    if not extension:
+        return None
+    if len(encoded) * 3 // 4 > INCIDENT_IMAGE_MAX_BYTES:
+        return None
+    try:
+        content = base64.b64decode(encoded, validate=False)
+    except (binascii.Error, ValueError):
+        return None
+    if not content:
+        return None
+    return media_store.store_bytes(content, extension)
+
+
+def _owned_blob_key(key: str, owner_email: str | None) -> bool:
+    # An existing blob that one of the owner's own reports (live or archived) already uses.
+    digest = media_store.blob_digest(key)
+    if not owner_email or not digest or not MediaBlob.objects.filter(pk=digest).exists():
+        return False
+    return any(
+        # JSON containment matches a whole list element, never part of one; resident_email's index
+        # narrows the rows it is checked on.
+        model.objects.filter(resident_email=owner_email, images__contains=[key]).exists()
+        for model in (IncidentReport, IncidentReportArchive)
+    )
+
+
+def store_incident_images(images, owner_email: str | None = None) -> list[str]:
+    # Data URLs become new blobs; anything else must be the key of a blob the submitter's earlier
+    # reports already use (a client re-submitting what it got back). Raises ValueError for any
+    # other entry, before a single reference is taken.
+    if not isinstance(images, list):
+        return []
+    entries = [image.strip() for image in images if isinstance(image, str) and image.strip()]
+    for image in entries:
+        if not is_data_url(image) and not _owned_blob_key(image, owner_email):
+            raise ValueError("images must be data URLs or keys of your own uploaded images")
+
+    stored = []
+    for image in entries:
+        if not is_data_url(image):
+            media_store.acquire(image)
+            stored.append(image)
+            continue
+        key = save_data_url(image)
+        if not key:
+            release_incident_images(stored)
+            raise ValueError("images must be base64 JPEG, PNG, WebP or GIF data URLs within the size limit")
+        stored.append(key)
+    return stored
+
+
+def release_incident_images(keys):
+    # Gives back the references store_incident_images took, for a report that was never saved.
+    for key in keys:
+        media_store.release(key)
+
+
+def convert_data_urls(images) -> list[str]:
+    # For rows already stored: data URLs move to blobs (one reference each); every other entry
+    # already holds whatever reference it has and is kept untouched. Unreadable data URLs are dropped.
+    if not isinstance(images, list):
+        return []
+    converted = []
+    for image in images:
+        if is_data_url(image):
+            key = save_data_url(image.strip())
+            if key:
+                converted.append(key)
+        elif image:
+            converted.append(image)
+    return converted
+
+
+def is_storage_key(value) -> bool:
+    return isinstance(value, str) and bool(value) and not is_data_url(value) and not value.startswith(
+        ("http://", "https://", "/")
+    )
+
+
+def incident_image_url(value: str) -> str:
+    if not is_storage_key(value):
+        # Rows not migrated yet still hold data URLs; external URLs pass through.
+        return value
+    return default_storage.url(value)
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from reports.archive import archivable_reports, archive_reports
+
+
+class Command(BaseCommand):
+    help = "Move Completed incident reports older than --days into incident_reports_archive, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=90)
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--limit", type=int, default=None, help="Stop after this many reports.")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        if options["dry_run"]:
+            total = archivable_reports(options["days"]).count()
+            self.stdout.write(self.style.SUCCESS(f"Would archive {total} reports."))
+            return
+
+        total = archive_reports(options["days"], batch_size=options["batch_size"], limit=options["limit"])
+        self.stdout.write(self.style.SUCCESS(f"Archived {total} reports."))
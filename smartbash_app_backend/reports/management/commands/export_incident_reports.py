@@ -0,0 +1,56 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from auth_app.views import _official_incident_queryset
+from officials.models import BrgyOfficial
+from reports.export import EXPORT_FORMATS, export_chunks, filter_export_range, gzip_chunks, parse_export_range
+from reports.models import IncidentReport, IncidentReportArchive
+
+
+class Command(BaseCommand):
+    help = "Stream incident reports (without images) as CSV or NDJSON, optionally gzipped."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--official", help="Official id or email; limits the export to their barangay.")
+        parser.add_argument("--from", dest="start", help="First day to include (YYYY-MM-DD).")
+        parser.add_argument("--to", dest="end", help="Last day to include (YYYY-MM-DD).")
+        parser.add_argument("--format", dest="export_format", choices=EXPORT_FORMATS, default="csv")
+        parser.add_argument("--gzip", action="store_true")
+        parser.add_argument("--include-archived", action="store_true", help="Also export archived reports.")
+        parser.add_argument("--output", "-o", help="File to write; defaults to stdout.")
+
+    def handle(self, *args, **options):
+        try:
+            start_at, end_before = parse_export_range(options["start"], options["end"])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        rows = IncidentReport.objects.all()
+        archived = IncidentReportArchive.objects.all()
+        official_ref = options["official"]
+        if official_ref:
+            lookup = {"official_id": official_ref} if official_ref.isdigit() else {"official_email_address": official_ref}
+            official = BrgyOfficial.objects.filter(**lookup).first()
+            if not official:
+                raise CommandError(f"Official not found: {official_ref}")
+            rows = _official_incident_queryset(official)
+            archived = _official_incident_queryset(official, IncidentReportArchive)
+        rows = filter_export_range(rows, start_at, end_before)
+        archived = filter_export_range(archived, start_at, end_before) if options["include_archived"] else None
+
+        chunks = export_chunks(rows, options["export_format"], archived)
+        if options["gzip"]:
+            chunks = gzip_chunks(chunks)
+        else:
+            chunks = (chunk.encode("utf-8") for chunk in chunks)
+
+        output = open(options["output"], "wb") if options["output"] else sys.stdout.buffer
+        try:
+            for chunk in chunks:
+                output.write(chunk)
+        finally:
+            if options["output"]:
+                output.close()
+            else:
+                output.flush()
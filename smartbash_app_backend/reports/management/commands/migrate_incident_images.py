@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reports.images import convert_data_urls, is_data_url
+from reports.models import IncidentReport
+
+
+class Command(BaseCommand):
+    help = "Move base64 data URLs out of incident_reports.images into media storage, keeping only storage keys."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=200)
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        pending = IncidentReport.objects.filter(images__icontains="data:").only("report_id", "images").order_by("report_id")
+
+        last_id = 0
+        migrated = 0
+        images_saved = 0
+        while True:
+            batch = list(pending.filter(report_id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1].report_id
+
+            changed = []
+            for report in batch:
+                images = report.images if isinstance(report.images, list) else []
+                inline = sum(1 for image in images if is_data_url(image))
+                if not inline:
+                    continue
+                images_saved += inline
+                if options["dry_run"]:
+                    changed.append(report)
+                    continue
+                report.images = convert_data_urls(images)
+                changed.append(report)
+
+            if changed and not options["dry_run"]:
+                with transaction.atomic():
+                    IncidentReport.objects.bulk_update(changed, ["images"])
+            migrated += len(changed)
+            self.stdout.write(f"... up to report {last_id}: {migrated} reports")
+
+        verb = "Would migrate" if options["dry_run"] else "Migrated"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {migrated} reports ({images_saved} images)."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from reports.counters import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = "Recompute barangay_incident_counters from incident_reports."
+
+    def handle(self, *args, **options):
+        total = rebuild_counters()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt barangay incident counters. Total: {total}"))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from reports.clusters import rebuild_clusters
+
+
+class Command(BaseCommand):
+    help = "Recompute incident_clusters from incident_reports and relink every report to its cluster."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        total = rebuild_clusters(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt incident clusters. Total: {total}"))
@@ -0,0 +1,33 @@
+from django.db import migrations, models
+
+from reports.geohash import encode_geohash
+
+
+def backfill_geohash(apps, schema_editor):
+    IncidentReport = apps.get_model("reports", "IncidentReport")
+    batch = []
+    rows = IncidentReport.objects.filter(lat__isnull=False, lng__isnull=False).only("report_id", "lat", "lng")
+    for row in rows.iterator(chunk_size=2000):
+        row.geohash = encode_geohash(row.lat, row.lng)
+        batch.append(row)
+        if len(batch) >= 2000:
+            IncidentReport.objects.bulk_update(batch, ["geohash"])
+            batch = []
+    if batch:
+        IncidentReport.objects.bulk_update(batch, ["geohash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reports", "0003_newsfeedpost_not_urgent_by"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="incidentreport",
+            name="geohash",
+            field=models.CharField(blank=True, db_index=True, max_length=12, null=True),
+        ),
+        migrations.RunPython(backfill_geohash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reports", "0004_incidentreport_geohash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IncidentCluster",
+            fields=[
+                ("cluster_id", models.AutoField(primary_key=True, serialize=False)),
+                ("cluster_key", models.CharField(max_length=500)),
+                ("incident_type", models.CharField(choices=[("Fire", "Fire"), ("Flood", "Flood")], max_length=20)),
+                ("report_count", models.IntegerField(default=0)),
+                ("open_count", models.IntegerField(default=0)),
+                ("located_count", models.IntegerField(default=0)),
+                ("lat_sum", models.FloatField(default=0)),
+                ("lng_sum", models.FloatField(default=0)),
+                ("centroid_lat", models.FloatField(blank=True, null=True)),
+                ("centroid_lng", models.FloatField(blank=True, null=True)),
+                ("first_seen_at", models.DateTimeField(blank=True, null=True)),
+                ("last_seen_at", models.DateTimeField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "incident_clusters",
+                "managed": True,
+                "unique_together": {("incident_type", "cluster_key")},
+            },
+        ),
+        migrations.AddField(
+            model_name="incidentreport",
+            name="cluster",
+            field=models.ForeignKey(
+                blank=True,
+                db_column="cluster_id",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="reports",
+                to="reports.incidentcluster",
+            ),
+        ),
+    ]
@@ -0,0 +1,41 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reports", "0006_alter_incidentreport_updated_at"),
+        ("residents", "0004_barangay_resident_barangay_ref"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="incidentreport",
+            name="barangay_ref",
+            field=models.ForeignKey(
+                blank=True,
+                db_column="barangay_id",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="incident_reports",
+                to="residents.barangay",
+            ),
+        ),
+        migrations.AddField(
+            model_name="newsfeedpost",
+            name="barangay_ref",
+            field=models.ForeignKey(
+                blank=True,
+                db_column="barangay_id",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="news_feed_posts",
+                to="residents.barangay",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="incidentreport",
+            index=models.Index(fields=["barangay_ref", "-created_at"], name="incident_brgy_created_idx"),
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("residents", "0004_barangay_resident_barangay_ref"),
+        ("reports", "0007_barangay_refs"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BarangayIncidentCounter",
+            fields=[
+                (
+                    "barangay",
+                    models.OneToOneField(
+                        db_column="barangay_id",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="incident_counter",
+                        serialize=False,
+                        to="residents.barangay",
+                    ),
+                ),
+                ("total_reports", models.IntegerField(default=0)),
+                ("fire_reports", models.IntegerField(default=0)),
+                ("flood_reports", models.IntegerField(default=0)),
+                ("pending_reports", models.IntegerField(default=0)),
+                ("in_progress_reports", models.IntegerField(default=0)),
+                ("resolved_reports", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "barangay_incident_counters",
+                "managed": True,
+            },
+        ),
+    ]
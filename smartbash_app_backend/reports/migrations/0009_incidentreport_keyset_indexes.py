@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reports", "0008_barangayincidentcounter"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="incidentreport",
+            name="incident_brgy_created_idx",
+        ),
+        migrations.AddIndex(
+            model_name="incidentreport",
+            index=models.Index(fields=["barangay_ref", "-created_at", "-report_id"], name="incident_brgy_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="incidentreport",
+            index=models.Index(fields=["-created_at", "-report_id"], name="incident_created_keyset_idx"),
+        ),
+    ]
@@ -0,0 +1,60 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("residents", "0004_barangay_resident_barangay_ref"),
+        ("reports", "0009_incidentreport_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IncidentReportArchive",
+            fields=[
+                ("report_id", models.IntegerField(primary_key=True, serialize=False)),
+                ("resident_email", models.CharField(db_index=True, max_length=255)),
+                ("resident_name", models.CharField(blank=True, max_length=255, null=True)),
+                ("barangay", models.CharField(blank=True, max_length=255, null=True)),
+                ("incident_type", models.CharField(choices=[("Fire", "Fire"), ("Flood", "Flood")], max_length=20)),
+                ("description", models.TextField(blank=True, null=True)),
+                ("location_text", models.CharField(blank=True, max_length=500, null=True)),
+                ("lat", models.FloatField(blank=True, null=True)),
+                ("lng", models.FloatField(blank=True, null=True)),
+                ("geohash", models.CharField(blank=True, max_length=12, null=True)),
+                ("cluster_id", models.IntegerField(blank=True, null=True)),
+                ("images", models.JSONField(blank=True, default=list)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("Pending", "Pending"), ("In Progress", "In Progress"), ("Completed", "Completed")],
+                        default="Completed",
+                        max_length=20,
+                    ),
+                ),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "barangay_ref",
+                    models.ForeignKey(
+                        blank=True,
+                        db_column="barangay_id",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="archived_incident_reports",
+                        to="residents.barangay",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "incident_reports_archive",
+                "managed": True,
+                "indexes": [
+                    models.Index(fields=["barangay_ref", "-created_at", "-report_id"], name="incident_arch_brgy_idx"),
+                    models.Index(fields=["-created_at", "-report_id"], name="incident_arch_keyset_idx"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reports", "0010_incidentreportarchive"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="incidentreport",
+            name="duplicate_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="incidentreport",
+            name="duplicate_of",
+            field=models.ForeignKey(
+                blank=True,
+                db_column="duplicate_of_id",
+                db_constraint=False,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="duplicates",
+                to="reports.incidentreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="incidentreportarchive",
+            name="duplicate_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="incidentreportarchive",
+            name="duplicate_of_id",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="incidentreport",
+            index=models.Index(fields=["incident_type", "-created_at"], name="incident_type_recent_idx"),
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reports", "0011_incidentreport_duplicates"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="incidentreport",
+            name="client_key",
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name="incidentreport",
+            name="reported_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="incidentreportarchive",
+            name="client_key",
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name="incidentreportarchive",
+            name="reported_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name="incidentreport",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("client_key__isnull", False)),
+                fields=("resident_email", "client_key"),
+                name="incident_client_key_uniq",
+            ),
+        ),
+    ]
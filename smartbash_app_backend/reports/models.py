@@ -1,4 +1,31 @@
 from django.db import models
+from residents.models import Barangay
+
+
+class IncidentCluster(models.Model):
+    INCIDENT_CHOICES = (
+        ("Fire", "Fire"),
+        ("Flood", "Flood"),
+    )
+
+    cluster_id = models.AutoField(primary_key=True)
+    cluster_key = models.CharField(max_length=500)
+    incident_type = models.CharField(max_length=20, choices=INCIDENT_CHOICES)
+    report_count = models.IntegerField(default=0)
+    open_count = models.IntegerField(default=0)
+    located_count = models.IntegerField(default=0)
+    lat_sum = models.FloatField(default=0)
+    lng_sum = models.FloatField(default=0)
+    centroid_lat = models.FloatField(blank=True, null=True)
+    centroid_lng = models.FloatField(blank=True, null=True)
+    first_seen_at = models.DateTimeField(blank=True, null=True)
+    last_seen_at = models.DateTimeField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "incident_clusters"
+        managed = True
+        unique_together = ("incident_type", "cluster_key")
 
 
 class IncidentReport(models.Model):
@@ -16,19 +43,125 @@ class IncidentReport(models.Model):
     resident_email = models.CharField(max_length=255, db_index=True)
     resident_name = models.CharField(max_length=255, blank=True, null=True)
     barangay = models.CharField(max_length=255, blank=True, null=True, db_index=True)
+    barangay_ref = models.ForeignKey(
+        Barangay,
+        on_delete=models.SET_NULL,
+        related_name="incident_reports",
+        db_column="barangay_id",
+        blank=True,
+        null=True,
+    )
     incident_type = models.CharField(max_length=20, choices=INCIDENT_CHOICES)
     description = models.TextField(blank=True, null=True)
     location_text = models.CharField(max_length=500, blank=True, null=True)
     lat = models.FloatField(blank=True, null=True)
     lng = models.FloatField(blank=True, null=True)
+    geohash = models.CharField(max_length=12, blank=True, null=True, db_index=True)
+    cluster = models.ForeignKey(
+        IncidentCluster,
+        on_delete=models.SET_NULL,
+        related_name="reports",
+        db_column="cluster_id",
+        blank=True,
+        null=True,
+    )
+    # Near-duplicate of an earlier report (same type, close by, minutes apart); see reports.dedup.
+    # No database constraint: the parent may already have moved to incident_reports_archive.
+    duplicate_of = models.ForeignKey(
+        "self",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="duplicates",
+        db_column="duplicate_of_id",
+        blank=True,
+        null=True,
+    )
+    duplicate_count = models.IntegerField(default=0)
+    # Idempotency key and device time for reports queued offline and replayed by the app.
+    client_key = models.CharField(max_length=64, blank=True, null=True)
+    reported_at = models.DateTimeField(blank=True, null=True)
     images = models.JSONField(default=list, blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="Pending")
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         db_table = "incident_reports"
         managed = True
+        indexes = [
+            models.Index(fields=["barangay_ref", "-created_at", "-report_id"], name="incident_brgy_created_idx"),
+            models.Index(fields=["-created_at", "-report_id"], name="incident_created_keyset_idx"),
+            models.Index(fields=["incident_type", "-created_at"], name="incident_type_recent_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["resident_email", "client_key"],
+                condition=models.Q(client_key__isnull=False),
+                name="incident_client_key_uniq",
+            ),
+        ]
+
+
+class IncidentReportArchive(models.Model):
+    # Cold copy of completed reports moved out of incident_reports by archive_incident_reports.
+    # Same column names as IncidentReport so the same row builders and filters apply.
+    report_id = models.IntegerField(primary_key=True)
+    resident_email = models.CharField(max_length=255, db_index=True)
+    resident_name = models.CharField(max_length=255, blank=True, null=True)
+    barangay = models.CharField(max_length=255, blank=True, null=True)
+    barangay_ref = models.ForeignKey(
+        Barangay,
+        on_delete=models.SET_NULL,
+        related_name="archived_incident_reports",
+        db_column="barangay_id",
+        blank=True,
+        null=True,
+    )
+    incident_type = models.CharField(max_length=20, choices=IncidentReport.INCIDENT_CHOICES)
+    description = models.TextField(blank=True, null=True)
+    location_text = models.CharField(max_length=500, blank=True, null=True)
+    lat = models.FloatField(blank=True, null=True)
+    lng = models.FloatField(blank=True, null=True)
+    geohash = models.CharField(max_length=12, blank=True, null=True)
+    cluster_id = models.IntegerField(blank=True, null=True)
+    duplicate_of_id = models.IntegerField(blank=True, null=True)
+    duplicate_count = models.IntegerField(default=0)
+    client_key = models.CharField(max_length=64, blank=True, null=True)
+    reported_at = models.DateTimeField(blank=True, null=True)
+    images = models.JSONField(default=list, blank=True)
+    status = models.CharField(max_length=20, choices=IncidentReport.STATUS_CHOICES, default="Completed")
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "incident_reports_archive"
+        managed = True
+        indexes = [
+            models.Index(fields=["barangay_ref", "-created_at", "-report_id"], name="incident_arch_brgy_idx"),
+            models.Index(fields=["-created_at", "-report_id"], name="incident_arch_keyset_idx"),
+        ]
+
+
+class BarangayIncidentCounter(models.Model):
+    barangay = models.OneToOneField(
+        Barangay,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="incident_counter",
+        db_column="barangay_id",
+    )
+    total_reports = models.IntegerField(default=0)
+    fire_reports = models.IntegerField(default=0)
+    flood_reports = models.IntegerField(default=0)
+    pending_reports = models.IntegerField(default=0)
+    in_progress_reports = models.IntegerField(default=0)
+    resolved_reports = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "barangay_incident_counters"
+        managed = True
 
 
 class NewsFeedPost(models.Model):
@@ -45,6 +178,14 @@ class NewsFeedPost(models.Model):
     author_email = models.CharField(max_length=255, db_index=True)
     author_name = models.CharField(max_length=255, blank=True, null=True)
     barangay = models.CharField(max_length=255, blank=True, null=True, db_index=True)
+    barangay_ref = models.ForeignKey(
+        Barangay,
+        on_delete=models.SET_NULL,
+        related_name="news_feed_posts",
+        db_column="barangay_id",
+        blank=True,
+        null=True,
+    )
     post_type = models.CharField(max_length=10, choices=POST_TYPE_CHOICES, default="EVENT")
     incident_type = models.CharField(max_length=20, choices=INCIDENT_CHOICES, default="Fire")
     location_text = models.CharField(max_length=500, blank=True, null=True)
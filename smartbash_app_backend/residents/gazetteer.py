@@ -0,0 +1,155 @@
+import json
+import re
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+
+from .models import Barangay
+
+GAZETTEER_PATH = Path(__file__).resolve().parent / "data" / "cebu_city_barangays.json"
+
+# Words that introduce a barangay name; they are never part of the name itself.
+_MARKERS = frozenset({"barangay", "brgy", "bgy"})
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+_END = ""
+
+_trie: dict = {}
+_names: dict[str, str] = {}
+_barangay_ids: dict[str, int] = {}
+
+
+def _tokens(value: str | None) -> list[str]:
+    text = unicodedata.normalize("NFKD", value or "").encode("ascii", "ignore").decode("ascii")
+    return _NON_WORD.sub(" ", text.lower()).split()
+
+
+def _load(path: Path = GAZETTEER_PATH):
+    with open(path, encoding="utf-8") as handle:
+        entries = json.load(handle)
+    for entry in entries:
+        key = " ".join(_tokens(entry["name"]))
+        _names[key] = entry["name"]
+        for alias in [entry["name"], *entry.get("aliases", [])]:
+            node = _trie
+            for token in _tokens(alias):
+                node = node.setdefault(token, {})
+            node[_END] = key
+
+
+_load()
+
+
+@lru_cache(maxsize=16384)
+def gazetteer_key(value: str | None) -> str | None:
+    # Longest gazetteer name in the text wins, preferring one right after "Brgy."/"Barangay";
+    # None when the text names no known barangay.
+    tokens = _tokens(value)
+    best = None
+    for start in range(len(tokens)):
+        node = _trie
+        for end in range(start, len(tokens)):
+            node = node.get(tokens[end])
+            if node is None:
+                break
+            key = node.get(_END)
+            if key:
+                rank = (start > 0 and tokens[start - 1] in _MARKERS, end - start, -start)
+                if best is None or rank > best[0]:
+                    best = (rank, key)
+    return best[1] if best else None
+
+
+@lru_cache(maxsize=16384)
+def match(value: str | None) -> str:
+    # Gazetteer key, or for free text that names no known barangay its first comma-separated part.
+    key = gazetteer_key(value)
+    if key:
+        return key
+    head = (value or "").split(",")[0]
+    return " ".join(token for token in _tokens(head) if token not in _MARKERS)
+
+
+def display_name(value: str | None) -> str:
+    key = match(value)
+    return _names.get(key) or key.title()
+
+
+@lru_cache(maxsize=16384)
+def _plain_text(value: str | None) -> str:
+    # Whole text, normalized, without "Brgy."/"Barangay", padded so containment respects word boundaries.
+    words = [token for token in _tokens(value) if token not in _MARKERS]
+    return f" {' '.join(words)} " if words else ""
+
+
+def same_barangay(left: str | None, right: str | None) -> bool:
+    # Exact gazetteer keys when both sides name a known barangay; otherwise (places outside the
+    # gazetteer, e.g. "X Purok 3, ...") one normalized text containing the other, as before it.
+    left_key = gazetteer_key(left)
+    right_key = gazetteer_key(right)
+    if left_key and right_key:
+        return left_key == right_key
+    left_text = _plain_text(left)
+    right_text = _plain_text(right)
+    if not left_text or not right_text:
+        return False
+    return left_text in right_text or right_text in left_text
+
+
+def curated_keys() -> list[str]:
+    return sorted(_names)
+
+
+def load_barangays(model=Barangay) -> int:
+    # The only place barangay rows come from: one per curated gazetteer entry, existing rows kept.
+    # Takes the model so data migrations can pass their historical one.
+    existing = set(model.objects.values_list("barangay_key", flat=True))
+    missing = [
+        model(barangay_key=key, barangay_name=name)
+        for key, name in sorted(_names.items())
+        if key not in existing
+    ]
+    model.objects.bulk_create(missing, ignore_conflicts=True)
+    return len(missing)
+
+
+def resolve(value: str | None) -> int | None:
+    # Barangay row for text that names a gazetteer barangay; None for anything else, so free
+    # text never turns into a barangay of its own.
+    key = gazetteer_key(value)
+    if not key:
+        return None
+    cached = _barangay_ids.get(key)
+    if cached:
+        return cached
+    barangay_id = Barangay.objects.filter(barangay_key=key).values_list("barangay_id", flat=True).first()
+    if barangay_id:
+        _barangay_ids[key] = barangay_id
+    return barangay_id
+
+
+def link_barangays(model, text_field: str, batch_size: int = 1000, relink: bool = False, barangay_model=Barangay) -> int:
+    # Point model.barangay_ref at the barangay its text_field names; rows whose text names no
+    # gazetteer barangay are left unlinked. Returns how many rows changed.
+    barangay_ids = dict(barangay_model.objects.values_list("barangay_key", "barangay_id"))
+    pk_name = model._meta.pk.attname
+    rows = model.objects.all()
+    if not relink:
+        rows = rows.filter(barangay_ref__isnull=True)
+    rows = rows.only(pk_name, text_field, "barangay_ref").order_by(pk_name)
+
+    updated = 0
+    batch = []
+    for row in rows.iterator(chunk_size=batch_size):
+        barangay_id = barangay_ids.get(gazetteer_key(getattr(row, text_field)))
+        if barangay_id == row.barangay_ref_id:
+            continue
+        row.barangay_ref_id = barangay_id
+        batch.append(row)
+        if len(batch) >= batch_size:
+            model.objects.bulk_update(batch, ["barangay_ref"])
+            updated += len(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_update(batch, ["barangay_ref"])
+        updated += len(batch)
+    return updated
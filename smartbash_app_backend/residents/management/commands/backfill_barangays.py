@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+
+from officials.models import BrgyOfficial
+from reports.counters import rebuild_counters
+from reports.models import IncidentReport, IncidentReportArchive, NewsFeedPost
+from residents import gazetteer
+from residents.models import Barangay, Resident
+from services.models import Service
+from services.routing import rebuild_service_routes
+
+
+class Command(BaseCommand):
+    help = "Link residents, officials, services, incident reports and news feed posts to their barangay rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--all", action="store_true", help="Re-resolve rows that are already linked.")
+        parser.add_argument(
+            "--prune",
+            action="store_true",
+            help="Delete barangay rows that are not in the gazetteer and unlink the rows pointing at them.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        self.stdout.write(f"barangays: {gazetteer.load_barangays()} loaded from the gazetteer")
+        if options["prune"]:
+            # Links to these rows are SET_NULL, so the loop below re-resolves them against the gazetteer.
+            stray = Barangay.objects.exclude(barangay_key__in=gazetteer.curated_keys())
+            self.stdout.write(f"barangays: {stray.delete()[1].get(Barangay._meta.label, 0)} pruned")
+        targets = [
+            (Resident, "res_location"),
+            (BrgyOfficial, "official_barangay"),
+            (Service, "svc_location"),
+            (IncidentReport, "barangay"),
+            (IncidentReportArchive, "barangay"),
+            (NewsFeedPost, "barangay"),
+        ]
+        relinked_reports = False
+        relinked_services = options["prune"]
+        for model, text_field in targets:
+            updated = gazetteer.link_barangays(model, text_field, batch_size=batch_size, relink=options["all"])
+            self.stdout.write(f"{model._meta.db_table}: {updated} linked")
+            relinked_reports = relinked_reports or (model in (IncidentReport, IncidentReportArchive) and updated)
+            relinked_services = relinked_services or (model is Service and updated)
+        if relinked_reports:
+            self.stdout.write(f"barangay_incident_counters: {rebuild_counters()} rebuilt")
+        if relinked_services:
+            # bulk_update sends no signals; rebuilding also makes running workers reload their routing table.
+            self.stdout.write(f"service_routes: {rebuild_service_routes()} rebuilt")
+
+        self.stdout.write(self.style.SUCCESS("Barangay backfill complete."))
@@ -0,0 +1,127 @@
+import random
+import re
+import time
+
+from django.core.management.base import BaseCommand
+
+from residents import gazetteer
+
+
+# The string matching that auth_app.views and officials.signals used before the gazetteer,
+# kept here only as the baseline for this benchmark.
+def _legacy_normalize_barangay(value: str | None) -> str:
+    text = " ".join((value or "").lower().split())
+    text = re.sub(r"\bbarangay\b", "", text)
+    text = re.sub(r"\bbrgy\.?\b", "", text)
+    text = " ".join(text.split())
+    return text
+
+
+def _legacy_canonical_barangay(value: str | None) -> str:
+    normalized = _legacy_normalize_barangay(value)
+    if "pahina" in normalized and "san nicolas" in normalized:
+        return "pahina san nicolas"
+    if "duljo" in normalized and "fatima" in normalized:
+        return "duljo fatima"
+    if "cogon" in normalized and "pardo" in normalized:
+        return "cogon pardo"
+    if "bulacao" in normalized and "pardo" in normalized:
+        return "bulacao pardo"
+    return normalized
+
+
+def _legacy_barangay_key(value: str | None) -> str:
+    normalized = _legacy_normalize_barangay(value)
+    normalized = normalized.replace("barangay ", "", 1)
+    normalized = normalized.replace("brgy. ", "", 1).replace("brgy ", "", 1)
+    return " ".join(normalized.split())
+
+
+def _legacy_matches_official_barangay(official_barangay: str | None, resident_location: str | None) -> bool:
+    official_key = _legacy_barangay_key(official_barangay)
+    if not official_key:
+        return True
+    resident_key = _legacy_barangay_key(resident_location)
+    if not resident_key:
+        return False
+    official_canonical = _legacy_canonical_barangay(official_key)
+    resident_canonical = _legacy_canonical_barangay(resident_key)
+    if official_key in resident_key or resident_key in official_key:
+        return True
+    if official_canonical == resident_canonical:
+        return True
+    if official_canonical and official_canonical in resident_canonical:
+        return True
+    if resident_canonical and resident_canonical in official_canonical:
+        return True
+    return False
+
+
+_TEMPLATES = [
+    "{name}",
+    "Brgy. {name}, Cebu City",
+    "Barangay {name}, Cebu City, Cebu",
+    "{lower}",
+    "{street} St., Brgy. {name}, Cebu City 6000",
+    "Purok {purok}, {name}, Cebu City",
+    "  {upper}  ",
+]
+_STREETS = ["Colon", "Osmeña Blvd", "Gorordo Ave", "N. Bacalso Ave", "M. J. Cuenco Ave", "Banilad Rd"]
+
+
+def _sample_locations(count: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    names = sorted(gazetteer._names.values())
+    locations = []
+    for _ in range(count):
+        name = rng.choice(names)
+        locations.append(
+            rng.choice(_TEMPLATES).format(
+                name=name,
+                lower=name.lower(),
+                upper=name.upper(),
+                street=rng.choice(_STREETS),
+                purok=rng.randint(1, 12),
+            )
+        )
+    return locations
+
+
+def _timed(fn, official: str, locations: list[str]) -> tuple[float, int]:
+    started = time.perf_counter()
+    matched = sum(1 for location in locations if fn(official, location))
+    return time.perf_counter() - started, matched
+
+
+class Command(BaseCommand):
+    help = "Compare the gazetteer matcher against the old regex barangay matching on generated location strings."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=100_000)
+        parser.add_argument("--seed", type=int, default=7)
+        parser.add_argument("--official", default="Pahina San Nicolas")
+
+    def handle(self, *args, **options):
+        locations = _sample_locations(options["count"], options["seed"])
+        official = options["official"]
+        gazetteer.match.cache_clear()
+        gazetteer.gazetteer_key.cache_clear()
+        gazetteer._plain_text.cache_clear()
+
+        legacy_seconds, legacy_matched = _timed(_legacy_matches_official_barangay, official, locations)
+        cold_seconds, matched = _timed(gazetteer.same_barangay, official, locations)
+        warm_seconds, _ = _timed(gazetteer.same_barangay, official, locations)
+        cache = gazetteer.gazetteer_key.cache_info()
+
+        self.stdout.write(f"locations: {len(locations)} ({len(set(locations))} distinct), official: {official!r}")
+        rows = [
+            ("legacy regex", legacy_seconds, legacy_matched),
+            ("gazetteer (cold cache)", cold_seconds, matched),
+            ("gazetteer (warm cache)", warm_seconds, matched),
+        ]
+        for label, seconds, count in rows:
+            per_call = seconds / max(len(locations), 1) * 1_000_000
+            self.stdout.write(f"{label:<24} {seconds * 1000:9.1f} ms  {per_call:6.2f} us/call  matched={count}")
+        self.stdout.write(f"gazetteer_key() cache: hits={cache.hits} misses={cache.misses} size={cache.currsize}")
+        if legacy_seconds and warm_seconds:
+            self.stdout.write(self.style.SUCCESS(f"Warm speedup: {legacy_seconds / warm_seconds:.1f}x"))
@@ -0,0 +1,36 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('residents', '0003_alter_resident_officials_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Barangay',
+            fields=[
+                ('barangay_id', models.AutoField(primary_key=True, serialize=False)),
+                ('barangay_name', models.CharField(max_length=255)),
+                ('barangay_key', models.CharField(max_length=255, unique=True)),
+            ],
+            options={
+                'db_table': 'barangays',
+                'managed': True,
+            },
+        ),
+        migrations.AddField(
+            model_name='resident',
+            name='barangay_ref',
+            field=models.ForeignKey(
+                blank=True,
+                db_column='barangay_id',
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name='residents',
+                to='residents.barangay',
+            ),
+        ),
+    ]
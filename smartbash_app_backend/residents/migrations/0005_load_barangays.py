@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+def load_barangays(apps, schema_editor):
+    from residents import gazetteer
+
+    gazetteer.load_barangays(apps.get_model("residents", "Barangay"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('residents', '0004_barangay_resident_barangay_ref'),
+    ]
+
+    operations = [
+        migrations.RunPython(load_barangays, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+from django.db import migrations
+
+# (app, model, text field) for every table with a barangay_ref column.
+LINKED_TABLES = [
+    ("residents", "Resident", "res_location"),
+    ("officials", "BrgyOfficial", "official_barangay"),
+    ("services", "Service", "svc_location"),
+    ("reports", "IncidentReport", "barangay"),
+    ("reports", "IncidentReportArchive", "barangay"),
+    ("reports", "NewsFeedPost", "barangay"),
+]
+
+
+def link_barangays(apps, schema_editor):
+    from reports.counters import rebuild_counters
+    from residents import gazetteer
+
+    barangay_model = apps.get_model("residents", "Barangay")
+    for app_label, model_name, text_field in LINKED_TABLES:
+        gazetteer.link_barangays(apps.get_model(app_label, model_name), text_field, barangay_model=barangay_model)
+    # Routes keep a copy of their service's link; bulk_update above fired no signals to refresh it.
+    ServiceRoute = apps.get_model("services", "ServiceRoute")
+    routes = list(ServiceRoute.objects.select_related("service"))
+    for route in routes:
+        route.barangay_ref_id = route.service.barangay_ref_id
+    ServiceRoute.objects.bulk_update(routes, ["barangay_ref"], batch_size=1000)
+    rebuild_counters(
+        report_models=(apps.get_model("reports", "IncidentReport"), apps.get_model("reports", "IncidentReportArchive")),
+        counter_model=apps.get_model("reports", "BarangayIncidentCounter"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('residents', '0005_load_barangays'),
+        ('officials', '0005_brgyofficial_barangay_ref'),
+        ('services', '0006_service_coordinates'),
+        ('reports', '0012_incidentreport_client_key'),
+    ]
+
+    operations = [
+        migrations.RunPython(link_barangays, migrations.RunPython.noop),
+    ]
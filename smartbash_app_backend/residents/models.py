@@ -15,6 +15,15 @@ class Role(models.Model):
         managed = True
         db_table = 'roles'
 
+class Barangay(models.Model):
+    barangay_id = models.AutoField(primary_key=True)
+    barangay_name = models.CharField(max_length=255)
+    barangay_key = models.CharField(max_length=255, unique=True)
+
+    class Meta:
+        managed = True
+        db_table = 'barangays'
+
 class Admin(models.Model):
     admin_id = models.AutoField(primary_key=True)
     admin_role = models.ForeignKey(Role, on_delete=models.DO_NOTHING, db_column='admin_role_id')
@@ -46,6 +55,14 @@ class Resident(models.Model):
     res_is_deleted = models.BooleanField(default=False)
     officials_id = models.IntegerField(blank=True, null=True)
     res_location = models.CharField(max_length=255, blank=True, null=True)
+    barangay_ref = models.ForeignKey(
+        Barangay,
+        on_delete=models.SET_NULL,
+        related_name='residents',
+        db_column='barangay_id',
+        blank=True,
+        null=True,
+    )
 
     class Meta:
         managed = True
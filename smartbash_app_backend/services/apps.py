@@ -3,3 +3,7 @@ from django.apps import AppConfig
 class ServicesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'services'
+
+    def ready(self):
+        # Keep the dispatch routing table in step with service edits.
+        from . import signals  # noqa: F401
@@ -0,0 +1,81 @@
+import heapq
+import math
+
+_EARTH_RADIUS_KM = 6371.0
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * _EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def _to_xyz(lat: float, lng: float) -> tuple[float, float, float]:
+    # Points on the unit sphere: straight-line (chord) order equals great-circle order, so the
+    # tree needs no projection and stays correct near the date line or the poles.
+    phi, lam = math.radians(lat), math.radians(lng)
+    return math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi)
+
+
+def _chord_for_km(km: float) -> float:
+    return 2 * math.sin(min(km / _EARTH_RADIUS_KM, math.pi) / 2)
+
+
+class KDTree:
+    # Static 3-d tree over (lat, lng, item) points, rebuilt whenever the point set changes.
+
+    def __init__(self, points):
+        entries = [(_to_xyz(lat, lng), lat, lng, item) for lat, lng, item in points]
+        self._nodes = []  # (xyz, lat, lng, item, axis, left index, right index)
+        self._root = self._build(entries, 0)
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def _build(self, entries, depth):
+        if not entries:
+            return -1
+        axis = depth % 3
+        entries.sort(key=lambda entry: entry[0][axis])
+        middle = len(entries) // 2
+        xyz, lat, lng, item = entries[middle]
+        index = len(self._nodes)
+        self._nodes.append(None)
+        left = self._build(entries[:middle], depth + 1)
+        right = self._build(entries[middle + 1:], depth + 1)
+        self._nodes[index] = (xyz, lat, lng, item, axis, left, right)
+        return index
+
+    def nearest(self, lat: float, lng: float, k: int = 1, max_km: float | None = None) -> list[tuple[float, object]]:
+        # [(distance km, item)], closest first.
+        if k <= 0 or self._root < 0:
+            return []
+        target = _to_xyz(lat, lng)
+        limit = _chord_for_km(max_km) ** 2 if max_km is not None else math.inf
+        best: list[tuple[float, int]] = []  # max-heap of (-squared chord, node index)
+
+        def visit(index):
+            if index < 0:
+                return
+            xyz, _, _, _, axis, left, right = self._nodes[index]
+            squared = (xyz[0] - target[0]) ** 2 + (xyz[1] - target[1]) ** 2 + (xyz[2] - target[2]) ** 2
+            if squared <= limit:
+                if len(best) < k:
+                    heapq.heappush(best, (-squared, index))
+                elif squared < -best[0][0]:
+                    heapq.heapreplace(best, (-squared, index))
+            delta = target[axis] - xyz[axis]
+            near, far = (left, right) if delta < 0 else (right, left)
+            visit(near)
+            bound = -best[0][0] if len(best) == k else limit
+            if delta * delta <= bound:
+                visit(far)
+
+        visit(self._root)
+        found = []
+        for _, index in sorted(best, reverse=True):
+            _, node_lat, node_lng, item, _, _, _ = self._nodes[index]
+            found.append((haversine_km(lat, lng, node_lat, node_lng), item))
+        return found
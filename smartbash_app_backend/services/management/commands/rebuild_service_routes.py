@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from services.routing import rebuild_service_routes
+
+
+class Command(BaseCommand):
+    help = "Rebuild the dispatch routing table from the services table."
+
+    def handle(self, *args, **options):
+        count = rebuild_service_routes()
+        self.stdout.write(self.style.SUCCESS(f"Wrote {count} service routes."))
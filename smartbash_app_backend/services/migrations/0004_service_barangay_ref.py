@@ -0,0 +1,38 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("services", "0003_merge_0002_alter_service_options_0002_create_services_if_missing"),
+        ("residents", "0004_barangay_resident_barangay_ref"),
+    ]
+
+    operations = [
+        # services is unmanaged, so the column is added by hand and AddField only updates state.
+        migrations.RunSQL(
+            sql="""
+                ALTER TABLE services
+                    ADD COLUMN IF NOT EXISTS barangay_id INTEGER NULL
+                    REFERENCES barangays (barangay_id) ON DELETE SET NULL DEFERRABLE INITIALLY DEFERRED;
+                CREATE INDEX IF NOT EXISTS services_barangay_id_idx ON services (barangay_id);
+            """,
+            reverse_sql="""
+                DROP INDEX IF EXISTS services_barangay_id_idx;
+                ALTER TABLE services DROP COLUMN IF EXISTS barangay_id;
+            """,
+        ),
+        migrations.AddField(
+            model_name="service",
+            name="barangay_ref",
+            field=models.ForeignKey(
+                blank=True,
+                db_column="barangay_id",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="services",
+                to="residents.barangay",
+            ),
+        ),
+    ]
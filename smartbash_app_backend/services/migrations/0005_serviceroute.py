@@ -0,0 +1,70 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_routes(apps, schema_editor):
+    from residents import gazetteer
+    from services.routing import service_capabilities
+
+    Service = apps.get_model("services", "Service")
+    ServiceRoute = apps.get_model("services", "ServiceRoute")
+    ServiceRoute.objects.bulk_create(
+        [
+            ServiceRoute(
+                service_id=service.svc_id,
+                capability=capability,
+                barangay_ref_id=service.barangay_ref_id,
+                barangay_key=gazetteer.match(service.svc_location),
+                is_active=bool(service.svc_is_active and not service.svc_is_deleted),
+            )
+            for service in Service.objects.all()
+            for capability in service_capabilities(service.svc_name, service.svc_description)
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("residents", "0004_barangay_resident_barangay_ref"),
+        ("services", "0004_service_barangay_ref"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ServiceRoute",
+            fields=[
+                ("route_id", models.AutoField(primary_key=True, serialize=False)),
+                ("capability", models.CharField(choices=[("Fire", "Fire"), ("Rescue", "Rescue")], max_length=20)),
+                ("barangay_key", models.CharField(blank=True, default="", max_length=255)),
+                ("is_active", models.BooleanField(default=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "barangay_ref",
+                    models.ForeignKey(
+                        blank=True,
+                        db_column="barangay_id",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="service_routes",
+                        to="residents.barangay",
+                    ),
+                ),
+                (
+                    "service",
+                    models.ForeignKey(
+                        db_column="svc_id",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="routes",
+                        to="services.service",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "service_routes",
+                "managed": True,
+                "unique_together": {("service", "capability")},
+            },
+        ),
+        migrations.RunPython(populate_routes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("services", "0005_serviceroute"),
+    ]
+
+    operations = [
+        # services is unmanaged, so the columns are added by hand and AddField only updates state.
+        migrations.RunSQL(
+            sql="""
+                ALTER TABLE services ADD COLUMN IF NOT EXISTS svc_lat DOUBLE PRECISION NULL;
+                ALTER TABLE services ADD COLUMN IF NOT EXISTS svc_lng DOUBLE PRECISION NULL;
+            """,
+            reverse_sql="""
+                ALTER TABLE services DROP COLUMN IF EXISTS svc_lng;
+                ALTER TABLE services DROP COLUMN IF EXISTS svc_lat;
+            """,
+        ),
+        migrations.AddField(
+            model_name="service",
+            name="svc_lat",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="service",
+            name="svc_lng",
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from residents.models import Barangay
 
 class Service(models.Model):
     svc_id = models.AutoField(primary_key=True)
@@ -8,11 +9,54 @@ class Service(models.Model):
     svc_password = models.CharField(max_length=255)
     svc_location = models.CharField(max_length=255, blank=True, null=True)
     svc_description = models.TextField(blank=True, null=True)
+    svc_lat = models.FloatField(blank=True, null=True)
+    svc_lng = models.FloatField(blank=True, null=True)
     svc_is_active = models.BooleanField(default=True)
     svc_added_on = models.DateTimeField(auto_now_add=True)
     svc_updated_on = models.DateTimeField(blank=True, null=True)
     svc_is_deleted = models.BooleanField(default=False)
+    barangay_ref = models.ForeignKey(
+        Barangay,
+        on_delete=models.SET_NULL,
+        related_name='services',
+        db_column='barangay_id',
+        blank=True,
+        null=True,
+    )
 
     class Meta:
         managed = False
-        db_table = 'services'
\ No newline at end of file
+        db_table = 'services'
+
+class ServiceRoute(models.Model):
+    # Dispatch routing table: one row per (service, capability), kept in sync by services.signals.
+    CAPABILITY_CHOICES = (
+        ('Fire', 'Fire'),
+        ('Rescue', 'Rescue'),
+    )
+
+    route_id = models.AutoField(primary_key=True)
+    service = models.ForeignKey(
+        Service,
+        on_delete=models.CASCADE,
+        related_name='routes',
+        db_column='svc_id',
+    )
+    capability = models.CharField(max_length=20, choices=CAPABILITY_CHOICES)
+    barangay_ref = models.ForeignKey(
+        Barangay,
+        on_delete=models.SET_NULL,
+        related_name='service_routes',
+        db_column='barangay_id',
+        blank=True,
+        null=True,
+    )
+    # Gazetteer key of svc_location, for services not linked to a barangay row yet.
+    barangay_key = models.CharField(max_length=255, blank=True, default='')
+    is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        managed = True
+        db_table = 'service_routes'
+        unique_together = ('service', 'capability')
@@ -0,0 +1,143 @@
+import os
+import threading
+import time
+
+from django.db import transaction
+from django.db.models import Count, Max
+
+from residents import gazetteer
+from .kdtree import KDTree
+from .models import Service, ServiceRoute
+
+# Same keywords the dispatch query used to match with icontains on svc_description / svc_name.
+CAPABILITY_KEYWORDS = {
+    'Fire': ('fire', 'bfp'),
+    'Rescue': ('rescue', 'flood', 'ambulance', 'evac'),
+}
+# Other worker processes notice route changes within this many seconds; this one immediately.
+ROUTING_CHECK_SECONDS = float(os.environ.get('SERVICE_ROUTING_CHECK_SECONDS', '5'))
+# Nearest-service dispatch: how many services to notify and how far away they may be.
+SERVICE_NEAREST_K = int(os.environ.get('SERVICE_NEAREST_K', '3'))
+SERVICE_NEAREST_MAX_KM = float(os.environ.get('SERVICE_NEAREST_MAX_KM', '10'))
+
+
+def service_capabilities(name: str | None, description: str | None) -> list[str]:
+    text = f"{(name or '').lower()}\n{(description or '').lower()}"
+    return [capability for capability, keywords in CAPABILITY_KEYWORDS.items() if any(k in text for k in keywords)]
+
+
+def capability_for_incident(incident_type: str | None) -> str:
+    return 'Fire' if (incident_type or '').strip() == 'Fire' else 'Rescue'
+
+
+def sync_service_routes(service: Service):
+    capabilities = service_capabilities(service.svc_name, service.svc_description)
+    defaults = {
+        'barangay_ref_id': service.barangay_ref_id,
+        'barangay_key': gazetteer.match(service.svc_location),
+        'is_active': bool(service.svc_is_active and not service.svc_is_deleted),
+    }
+    with transaction.atomic():
+        ServiceRoute.objects.filter(service_id=service.svc_id).exclude(capability__in=capabilities).delete()
+        for capability in capabilities:
+            ServiceRoute.objects.update_or_create(service_id=service.svc_id, capability=capability, defaults=defaults)
+    transaction.on_commit(routing_table.invalidate)
+
+
+def rebuild_service_routes() -> int:
+    routes = [
+        ServiceRoute(
+            service_id=service.svc_id,
+            capability=capability,
+            barangay_ref_id=service.barangay_ref_id,
+            barangay_key=gazetteer.match(service.svc_location),
+            is_active=bool(service.svc_is_active and not service.svc_is_deleted),
+        )
+        for service in Service.objects.all()
+        for capability in service_capabilities(service.svc_name, service.svc_description)
+    ]
+    with transaction.atomic():
+        ServiceRoute.objects.all().delete()
+        ServiceRoute.objects.bulk_create(routes)
+    transaction.on_commit(routing_table.invalidate)
+    return len(routes)
+
+
+class RoutingTable:
+    # {capability: {("id", barangay_id) | ("key", gazetteer key): [Service, ...]}} for active services,
+    # plus a KD-tree per capability over the services that have coordinates.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._table = None
+        self._version = None
+        self._checked_at = 0.0
+
+    def invalidate(self):
+        with self._lock:
+            self._table = None
+
+    def _load(self):
+        table: dict[str, dict[tuple, list[Service]]] = {}
+        points: dict[str, list[tuple[float, float, Service]]] = {}
+        routes = ServiceRoute.objects.filter(is_active=True).select_related('service').order_by('service_id')
+        for route in routes:
+            service = route.service
+            by_barangay = table.setdefault(route.capability, {})
+            # The service's own link, not the route's copy: backfills link services with bulk_update,
+            # which leaves the copy behind until the routes are rebuilt.
+            if service.barangay_ref_id:
+                by_barangay.setdefault(('id', service.barangay_ref_id), []).append(service)
+            if route.barangay_key:
+                by_barangay.setdefault(('key', route.barangay_key), []).append(service)
+            if service.svc_lat is not None and service.svc_lng is not None:
+                points.setdefault(route.capability, []).append((service.svc_lat, service.svc_lng, service))
+        trees = {capability: KDTree(located) for capability, located in points.items()}
+        return table, trees
+
+    @staticmethod
+    def _current_version():
+        state = ServiceRoute.objects.aggregate(total=Count('route_id'), latest=Max('updated_at'))
+        return state['total'], state['latest']
+
+    def _get(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._table is not None and now - self._checked_at < ROUTING_CHECK_SECONDS:
+                return self._table
+            version = self._current_version()
+            if self._table is None or version != self._version:
+                self._table = self._load()
+                self._version = version
+            self._checked_at = now
+            return self._table
+
+    def services_for(self, incident_type: str | None, barangay_ref_id: int | None, barangay: str | None) -> list[Service]:
+        # Strict dispatch rule: only services in the report's barangay. A linked report matches
+        # services linked to the same barangay plus unlinked ones whose location names it; an
+        # unlinked report falls back to the gazetteer key.
+        table, _ = self._get()
+        by_barangay = table.get(capability_for_incident(incident_type), {})
+        key = gazetteer.match(barangay)
+        by_key = by_barangay.get(('key', key), ()) if key else ()
+        if barangay_ref_id:
+            return list(by_barangay.get(('id', barangay_ref_id), ())) + [
+                service for service in by_key if not service.barangay_ref_id
+            ]
+        return list(by_key)
+
+    def nearest(
+        self,
+        incident_type: str | None,
+        lat: float,
+        lng: float,
+        k: int = SERVICE_NEAREST_K,
+        max_km: float = SERVICE_NEAREST_MAX_KM,
+    ) -> list[tuple[float, Service]]:
+        # [(distance km, Service)] for the k closest capable services, regardless of barangay lines.
+        _, trees = self._get()
+        tree = trees.get(capability_for_incident(incident_type))
+        return tree.nearest(lat, lng, k=k, max_km=max_km) if tree else []
+
+
+routing_table = RoutingTable()
@@ -0,0 +1,16 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Service
+from .routing import routing_table, sync_service_routes
+
+
+@receiver(post_save, sender=Service)
+def update_service_routes(sender, instance: Service, **kwargs):
+    sync_service_routes(instance)
+
+
+@receiver(post_delete, sender=Service)
+def drop_service_routes(sender, instance: Service, **kwargs):
+    transaction.on_commit(routing_table.invalidate)